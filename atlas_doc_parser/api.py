@@ -1,81 +1,340 @@
 # -*- coding: utf-8 -*-
 
-from .exc import ParamError
-from .type_enum import TypeEnum
-from .model import BaseMark
-from .model import T_MARK
-from .model import MarkBackGroundColorAttrs
-from .model import MarkBackGroundColor
-from .model import MarkCode
-from .model import MarkEm
-from .model import MarkIndentationAttrs
-from .model import MarkIndentation
-from .model import MarkLinkAttrs
-from .model import MarkLink
-from .model import MarkStrike
-from .model import MarkStrong
-from .model import MarkSubSupAttrs
-from .model import MarkSubSup
-from .model import MarkTextColorAttrs
-from .model import MarkTextColor
-from .model import MarkUnderLine
-from .model import parse_mark
-from .model import BaseNode
-from .model import T_NODE
-from .model import NodeBlockCardAttrs
-from .model import NodeBlockCard
-from .model import NodeBlockQuote
-from .model import NodeBulletList
-from .model import NodeCodeBlockAttrs
-from .model import NodeCodeBlock
-from .model import NodeDateAttrs
-from .model import NodeDate
-from .model import NodeDoc
-from .model import NodeEmojiAttrs
-from .model import NodeEmoji
-from .model import NodeExpandAttrs
-from .model import NodeExpand
-from .model import NodeHardBreak
-from .model import NodeHeadingAttrs
-from .model import NodeHeading
-from .model import NodeInlineCardAttrs
-from .model import NodeInlineCard
-from .model import NodeListItem
-from .model import T_NODE_MEDIA_ATTRS_TYPE
-from .model import NodeMediaAttrs
-from .model import NodeMedia
-from .model import NodeMediaGroup
-from .model import T_NODE_MEDIA_SINGLE_ATTRS_LAYOUT
-from .model import NodeMediaSingleAttrs
-from .model import NodeMediaSingle
-from .model import T_NODE_MENTION_ATTRS_USER_TYPE
-from .model import T_NODE_MENTION_ATTRS_ACCESS_LEVEL
-from .model import NodeMentionAttrs
-from .model import NodeMention
-from .model import NodeNestedExpandAttrs
-from .model import NodeNestedExpand
-from .model import NodeOrderedListAttrs
-from .model import NodeOrderedList
-from .model import T_NODE_PANEL_ATTRS_PANEL_TYPE
-from .model import NodePanelAttrs
-from .model import NodePanel
-from .model import NodeParagraphAttrs
-from .model import NodeParagraph
-from .model import NodeRule
-from .model import T_NODE_STATUS_ATTRS_COLOR
-from .model import NodeStatusAttrs
-from .model import NodeStatus
-from .model import NodeTableAttrs
-from .model import NodeTable
-from .model import NodeTableCellAttrs
-from .model import NodeTableCell
-from .model import NodeTableHeaderAttrs
-from .model import NodeTableHeader
-from .model import NodeTableRow
-from .model import NodeHeadingAttrs
-from .model import NodeTaskItemAttrs
-from .model import NodeTaskItem
-from .model import NodeTaskListAttrs
-from .model import NodeTaskList
-from .model import NodeText
-from .model import parse_node
+"""
+The public API.
+
+The names are imported on first access, with a module ``__getattr__``, so
+``import atlas_doc_parser.api`` is cheap and only the modules that are used
+are loaded, e.g. a handler that only converts documents never imports the
+profiler, the metrics server or the generator.
+"""
+
+import typing as T
+import importlib
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .exc import ParamError
+    from .exc import LimitExceededError
+    from .type_enum import TypeEnum
+    from .model import BaseMark
+    from .model import T_MARK
+    from .model import MarkBackGroundColorAttrs
+    from .model import MarkBackGroundColor
+    from .model import MarkCode
+    from .model import MarkEm
+    from .model import MarkIndentationAttrs
+    from .model import MarkIndentation
+    from .model import MarkLinkAttrs
+    from .model import MarkLink
+    from .model import MarkStrike
+    from .model import MarkStrong
+    from .model import MarkSubSupAttrs
+    from .model import MarkSubSup
+    from .model import MarkTextColorAttrs
+    from .model import MarkTextColor
+    from .model import MarkUnderLine
+    from .model import parse_mark
+    from .model import BaseNode
+    from .model import T_NODE
+    from .model import NodeBlockCardAttrs
+    from .model import NodeBlockCard
+    from .model import NodeBlockQuote
+    from .model import NodeBulletList
+    from .model import NodeCodeBlockAttrs
+    from .model import NodeCodeBlock
+    from .model import NodeDateAttrs
+    from .model import NodeDate
+    from .model import NodeDoc
+    from .model import NodeEmojiAttrs
+    from .model import NodeEmoji
+    from .model import NodeExpandAttrs
+    from .model import NodeExpand
+    from .model import NodeHardBreak
+    from .model import NodeHeadingAttrs
+    from .model import NodeHeading
+    from .model import NodeInlineCardAttrs
+    from .model import NodeInlineCard
+    from .model import NodeListItem
+    from .model import T_NODE_MEDIA_ATTRS_TYPE
+    from .model import NodeMediaAttrs
+    from .model import NodeMedia
+    from .model import NodeMediaGroup
+    from .model import T_NODE_MEDIA_SINGLE_ATTRS_LAYOUT
+    from .model import NodeMediaSingleAttrs
+    from .model import NodeMediaSingle
+    from .model import T_NODE_MENTION_ATTRS_USER_TYPE
+    from .model import T_NODE_MENTION_ATTRS_ACCESS_LEVEL
+    from .model import NodeMentionAttrs
+    from .model import NodeMention
+    from .model import NodeNestedExpandAttrs
+    from .model import NodeNestedExpand
+    from .model import NodeOrderedListAttrs
+    from .model import NodeOrderedList
+    from .model import T_NODE_PANEL_ATTRS_PANEL_TYPE
+    from .model import NodePanelAttrs
+    from .model import NodePanel
+    from .model import NodeParagraphAttrs
+    from .model import NodeParagraph
+    from .model import NodeRule
+    from .model import T_NODE_STATUS_ATTRS_COLOR
+    from .model import NodeStatusAttrs
+    from .model import NodeStatus
+    from .model import NodeTableAttrs
+    from .model import NodeTable
+    from .model import NodeTableCellAttrs
+    from .model import NodeTableCell
+    from .model import NodeTableHeaderAttrs
+    from .model import NodeTableHeader
+    from .model import NodeTableRow
+    from .model import NodeTaskItemAttrs
+    from .model import NodeTaskItem
+    from .model import NodeTaskListAttrs
+    from .model import NodeTaskList
+    from .model import NodeText
+    from .model import parse_node
+    from .model import parse_node_selective
+    from .arena import Arena
+    from .extract import FactKindEnum
+    from .extract import LinkFact
+    from .extract import CardFact
+    from .extract import MentionFact
+    from .extract import MediaFact
+    from .extract import DateFact
+    from .extract import TaskFact
+    from .extract import ExtractResult
+    from .extract import extract
+    from .walk import WalkOrderEnum
+    from .walk import walk
+    from .index import NodeIndex
+    from .outline import OutlineEntry
+    from .outline import Outline
+    from .outline import build_outline
+    from .outline import get_section
+    from .outline import render_section
+    from .chunk import Chunk
+    from .chunk import iter_chunks
+    from .html_renderer import HtmlRenderer
+    from .html_renderer import to_html
+    from .html_renderer import iter_html
+    from .multi_sink import BaseSink
+    from .multi_sink import render_multi
+    from .multi_sink import MarkdownSink
+    from .multi_sink import TextSink
+    from .multi_sink import StatsSink
+    from .multi_sink import DocStats
+    from .stats import NodeStats
+    from .stats import get_doc_stats
+    from .stats import aggregate_doc_stats
+    from .limits import Limits
+    from .preview import render_preview
+    from .resolve import Refs
+    from .resolve import Resolved
+    from .resolve import BaseResolver
+    from .resolve import DictResolver
+    from .resolve import ResolveCache
+    from .resolve import collect_refs
+    from .resolve import resolve_refs
+    from .resolve import get_resolved
+    from .resolve import use_resolved
+    from .resolve import render_resolved
+    from .resolve_cache import TTLResolveCache
+    from .generator import GeneratorConfig
+    from .generator import DocGenerator
+    from .generator import write_jsonl
+    from .profiler import TypeProfile
+    from .profiler import Profiler
+    from .memory import ClassMemory
+    from .memory import MemoryReport
+    from .memory import get_tree_memory
+    from .memory import get_memory_report
+    from .tracing import BaseTraceHook
+    from .tracing import SpanRecord
+    from .tracing import RecordHook
+    from .tracing import add_trace_hook
+    from .tracing import remove_trace_hook
+    from .tracing import clear_trace_hooks
+    from .tracing import start_span
+    from .batch import BatchResult
+    from .batch import convert_jsonl
+    from .metrics import Counter
+    from .metrics import Histogram
+    from .metrics import MetricsHook
+    from .metrics import start_metrics_server
+    from .slowlog import SlowDocReport
+    from .slowlog import SlowLog
+    from .slowlog import add_slow_log
+    from .slowlog import remove_slow_log
+    from .slowlog import clear_slow_logs
+
+# the public name -> the module that defines it
+_name_to_module = {
+    "ParamError": ".exc",
+    "LimitExceededError": ".exc",
+    "TypeEnum": ".type_enum",
+    "BaseMark": ".model",
+    "T_MARK": ".model",
+    "MarkBackGroundColorAttrs": ".model",
+    "MarkBackGroundColor": ".model",
+    "MarkCode": ".model",
+    "MarkEm": ".model",
+    "MarkIndentationAttrs": ".model",
+    "MarkIndentation": ".model",
+    "MarkLinkAttrs": ".model",
+    "MarkLink": ".model",
+    "MarkStrike": ".model",
+    "MarkStrong": ".model",
+    "MarkSubSupAttrs": ".model",
+    "MarkSubSup": ".model",
+    "MarkTextColorAttrs": ".model",
+    "MarkTextColor": ".model",
+    "MarkUnderLine": ".model",
+    "parse_mark": ".model",
+    "BaseNode": ".model",
+    "T_NODE": ".model",
+    "NodeBlockCardAttrs": ".model",
+    "NodeBlockCard": ".model",
+    "NodeBlockQuote": ".model",
+    "NodeBulletList": ".model",
+    "NodeCodeBlockAttrs": ".model",
+    "NodeCodeBlock": ".model",
+    "NodeDateAttrs": ".model",
+    "NodeDate": ".model",
+    "NodeDoc": ".model",
+    "NodeEmojiAttrs": ".model",
+    "NodeEmoji": ".model",
+    "NodeExpandAttrs": ".model",
+    "NodeExpand": ".model",
+    "NodeHardBreak": ".model",
+    "NodeHeadingAttrs": ".model",
+    "NodeHeading": ".model",
+    "NodeInlineCardAttrs": ".model",
+    "NodeInlineCard": ".model",
+    "NodeListItem": ".model",
+    "T_NODE_MEDIA_ATTRS_TYPE": ".model",
+    "NodeMediaAttrs": ".model",
+    "NodeMedia": ".model",
+    "NodeMediaGroup": ".model",
+    "T_NODE_MEDIA_SINGLE_ATTRS_LAYOUT": ".model",
+    "NodeMediaSingleAttrs": ".model",
+    "NodeMediaSingle": ".model",
+    "T_NODE_MENTION_ATTRS_USER_TYPE": ".model",
+    "T_NODE_MENTION_ATTRS_ACCESS_LEVEL": ".model",
+    "NodeMentionAttrs": ".model",
+    "NodeMention": ".model",
+    "NodeNestedExpandAttrs": ".model",
+    "NodeNestedExpand": ".model",
+    "NodeOrderedListAttrs": ".model",
+    "NodeOrderedList": ".model",
+    "T_NODE_PANEL_ATTRS_PANEL_TYPE": ".model",
+    "NodePanelAttrs": ".model",
+    "NodePanel": ".model",
+    "NodeParagraphAttrs": ".model",
+    "NodeParagraph": ".model",
+    "NodeRule": ".model",
+    "T_NODE_STATUS_ATTRS_COLOR": ".model",
+    "NodeStatusAttrs": ".model",
+    "NodeStatus": ".model",
+    "NodeTableAttrs": ".model",
+    "NodeTable": ".model",
+    "NodeTableCellAttrs": ".model",
+    "NodeTableCell": ".model",
+    "NodeTableHeaderAttrs": ".model",
+    "NodeTableHeader": ".model",
+    "NodeTableRow": ".model",
+    "NodeTaskItemAttrs": ".model",
+    "NodeTaskItem": ".model",
+    "NodeTaskListAttrs": ".model",
+    "NodeTaskList": ".model",
+    "NodeText": ".model",
+    "parse_node": ".model",
+    "parse_node_selective": ".model",
+    "Arena": ".arena",
+    "FactKindEnum": ".extract",
+    "LinkFact": ".extract",
+    "CardFact": ".extract",
+    "MentionFact": ".extract",
+    "MediaFact": ".extract",
+    "DateFact": ".extract",
+    "TaskFact": ".extract",
+    "ExtractResult": ".extract",
+    "extract": ".extract",
+    "WalkOrderEnum": ".walk",
+    "walk": ".walk",
+    "NodeIndex": ".index",
+    "OutlineEntry": ".outline",
+    "Outline": ".outline",
+    "build_outline": ".outline",
+    "get_section": ".outline",
+    "render_section": ".outline",
+    "Chunk": ".chunk",
+    "iter_chunks": ".chunk",
+    "HtmlRenderer": ".html_renderer",
+    "to_html": ".html_renderer",
+    "iter_html": ".html_renderer",
+    "BaseSink": ".multi_sink",
+    "render_multi": ".multi_sink",
+    "MarkdownSink": ".multi_sink",
+    "TextSink": ".multi_sink",
+    "StatsSink": ".multi_sink",
+    "DocStats": ".multi_sink",
+    "NodeStats": ".stats",
+    "get_doc_stats": ".stats",
+    "aggregate_doc_stats": ".stats",
+    "Limits": ".limits",
+    "render_preview": ".preview",
+    "Refs": ".resolve",
+    "Resolved": ".resolve",
+    "BaseResolver": ".resolve",
+    "DictResolver": ".resolve",
+    "ResolveCache": ".resolve",
+    "collect_refs": ".resolve",
+    "resolve_refs": ".resolve",
+    "get_resolved": ".resolve",
+    "use_resolved": ".resolve",
+    "render_resolved": ".resolve",
+    "TTLResolveCache": ".resolve_cache",
+    "GeneratorConfig": ".generator",
+    "DocGenerator": ".generator",
+    "write_jsonl": ".generator",
+    "TypeProfile": ".profiler",
+    "Profiler": ".profiler",
+    "ClassMemory": ".memory",
+    "MemoryReport": ".memory",
+    "get_tree_memory": ".memory",
+    "get_memory_report": ".memory",
+    "BaseTraceHook": ".tracing",
+    "SpanRecord": ".tracing",
+    "RecordHook": ".tracing",
+    "add_trace_hook": ".tracing",
+    "remove_trace_hook": ".tracing",
+    "clear_trace_hooks": ".tracing",
+    "start_span": ".tracing",
+    "BatchResult": ".batch",
+    "convert_jsonl": ".batch",
+    "Counter": ".metrics",
+    "Histogram": ".metrics",
+    "MetricsHook": ".metrics",
+    "start_metrics_server": ".metrics",
+    "SlowDocReport": ".slowlog",
+    "SlowLog": ".slowlog",
+    "add_slow_log": ".slowlog",
+    "remove_slow_log": ".slowlog",
+    "clear_slow_logs": ".slowlog",
+}
+
+__all__ = list(_name_to_module)
+
+
+def __getattr__(name: str) -> T.Any:
+    try:
+        module_name = _name_to_module[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __package__), name)
+    # cache it, __getattr__ is only called for the names not found
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> T.List[str]:
+    return sorted(set(globals()) | set(__all__))
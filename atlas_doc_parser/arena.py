@@ -0,0 +1,632 @@
+# -*- coding: utf-8 -*-
+
+"""
+Array-backed arena representation of an ADF tree.
+
+The object model in :mod:`atlas_doc_parser.model` creates several Python
+objects per node (the node, its attrs, its marks, the ``NA`` fields ...).
+For analytics over millions of nodes, :class:`Arena` stores the whole tree
+in a handful of flat ``array.array`` columns instead:
+
+- every node has an integer type code (the position in :class:`~atlas_doc_parser.type_enum.TypeEnum`),
+  a parent index and a ``[start, end)`` range of its children. Nodes are
+  stored in breadth-first order, so the children of a node are contiguous.
+- the text of all the text nodes lives in one shared string buffer,
+  each node only stores the ``[start, end)`` offsets.
+- marks are stored in their own columns, each node stores the ``[start, end)``
+  range of its marks.
+- attrs are plain dicts, identical attrs are stored only once.
+
+Node 0 is always the root node.
+"""
+
+import typing as T
+import array
+import dataclasses
+
+from .constants import TAB
+from .arg import NA
+from .type_enum import TypeEnum
+from .base import T_DATA
+from .model import (
+    BaseNode,
+    _node_type_to_class_mapping,
+    _mark_type_to_class_mapping,
+    _atlassian_lang_to_markdown_lang_mapping,
+    _strip_double_empty_line,
+    _indent,
+    _format_date,
+    _quote,
+    parse_node,
+)
+
+_code_to_type: T.List[str] = [type_.value for type_ in TypeEnum]
+_type_to_code: T.Dict[str, int] = {
+    type_: code for code, type_ in enumerate(_code_to_type)
+}
+
+
+def _get_types_having_field(name: str) -> T.Set[str]:
+    return {
+        type_
+        for type_, klass in _node_type_to_class_mapping.items()
+        if name in klass.get_fields()
+    }
+
+
+_types_having_content = _get_types_having_field("content")
+_types_having_marks = _get_types_having_field("marks")
+_types_having_text = _get_types_having_field("text")
+
+
+def _get_attrs_dict(node_or_mark) -> T.Optional[T_DATA]:
+    attrs = getattr(node_or_mark, "attrs", None)
+    if attrs is None or isinstance(attrs, NA):
+        return None
+    return attrs.to_dict()
+
+
+NO_VALUE = -1
+"""
+Used in the ``child_start``, ``text_start``, ``mark_start`` and ``attrs``
+columns when the node doesn't have the ``content``, ``text``, ``marks``
+or ``attrs`` field.
+"""
+
+
+@dataclasses.dataclass
+class Arena:
+    """
+    Flat, array-backed representation of an ADF document.
+
+    Use :meth:`from_node` or :meth:`from_dict` to create one.
+    """
+
+    # fmt: off
+    types: array.array = dataclasses.field(default_factory=lambda: array.array("B"))
+    parents: array.array = dataclasses.field(default_factory=lambda: array.array("i"))
+    child_start: array.array = dataclasses.field(default_factory=lambda: array.array("i"))
+    child_end: array.array = dataclasses.field(default_factory=lambda: array.array("i"))
+    text_start: array.array = dataclasses.field(default_factory=lambda: array.array("i"))
+    text_end: array.array = dataclasses.field(default_factory=lambda: array.array("i"))
+    mark_start: array.array = dataclasses.field(default_factory=lambda: array.array("i"))
+    mark_end: array.array = dataclasses.field(default_factory=lambda: array.array("i"))
+    attrs: array.array = dataclasses.field(default_factory=lambda: array.array("i"))
+    mark_types: array.array = dataclasses.field(default_factory=lambda: array.array("B"))
+    mark_attrs: array.array = dataclasses.field(default_factory=lambda: array.array("i"))
+    text: str = dataclasses.field(default="")
+    attrs_list: T.List[T_DATA] = dataclasses.field(default_factory=list)
+    version: int = dataclasses.field(default=1)
+    # fmt: on
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def type_of(self, i: int) -> str:
+        return _code_to_type[self.types[i]]
+
+    def children(self, i: int) -> range:
+        start = self.child_start[i]
+        if start == NO_VALUE:
+            return range(0)
+        return range(start, self.child_end[i])
+
+    def text_of(self, i: int) -> T.Optional[str]:
+        start = self.text_start[i]
+        if start == NO_VALUE:
+            return None
+        return self.text[start : self.text_end[i]]
+
+    def attrs_of(self, i: int) -> T.Optional[T_DATA]:
+        ind = self.attrs[i]
+        if ind == NO_VALUE:
+            return None
+        return self.attrs_list[ind]
+
+    @classmethod
+    def _from_items(
+        cls,
+        root: T.Any,
+        get_item: T.Callable,
+        version: int,
+    ) -> "Arena":
+        """
+        Build the arena with a breadth-first traversal.
+
+        :param get_item: a function that takes a node and returns a tuple of
+            ``(type, attrs, content, marks, text)``. ``attrs``, ``content``,
+            ``marks`` and ``text`` are ``None`` when the node doesn't have it.
+            ``marks`` is a list of ``(type, attrs)`` tuple.
+        """
+        arena = cls(version=version)
+        types = arena.types
+        parents = arena.parents
+        child_start = arena.child_start
+        child_end = arena.child_end
+        text_start = arena.text_start
+        text_end = arena.text_end
+        mark_start = arena.mark_start
+        mark_end = arena.mark_end
+        attrs = arena.attrs
+        mark_types = arena.mark_types
+        mark_attrs = arena.mark_attrs
+        attrs_list = arena.attrs_list
+        attrs_index: T.Dict[T.Any, int] = dict()  # for deduplication
+        texts: T.List[str] = list()
+        text_offset = 0
+
+        def add_attrs(dct: T.Optional[T_DATA]) -> int:
+            if dct is None:
+                return NO_VALUE
+            try:
+                key = tuple(dct.items())
+                return attrs_index[key]
+            except KeyError:
+                ind = len(attrs_list)
+                attrs_index[key] = ind
+                attrs_list.append(dct)
+                return ind
+            except TypeError:  # unhashable attrs value
+                attrs_list.append(dct)
+                return len(attrs_list) - 1
+
+        queue = [(root, NO_VALUE)]
+        n_node = 1
+        cursor = 0
+        while cursor < len(queue):
+            node, parent = queue[cursor]
+            type_, node_attrs, content, marks, text = get_item(node)
+            types.append(_type_to_code[type_])
+            parents.append(parent)
+            attrs.append(add_attrs(node_attrs))
+            if content is None:
+                child_start.append(NO_VALUE)
+                child_end.append(NO_VALUE)
+            else:
+                child_start.append(n_node)
+                for child in content:
+                    queue.append((child, cursor))
+                n_node += len(content)
+                child_end.append(n_node)
+            if marks is None:
+                mark_start.append(NO_VALUE)
+                mark_end.append(NO_VALUE)
+            else:
+                mark_start.append(len(mark_types))
+                for mark_type, mark_attrs_dct in marks:
+                    mark_types.append(_type_to_code[mark_type])
+                    mark_attrs.append(add_attrs(mark_attrs_dct))
+                mark_end.append(len(mark_types))
+            if text is None:
+                text_start.append(NO_VALUE)
+                text_end.append(NO_VALUE)
+            else:
+                texts.append(text)
+                text_start.append(text_offset)
+                text_offset += len(text)
+                text_end.append(text_offset)
+            cursor += 1
+
+        arena.text = "".join(texts)
+        return arena
+
+    @classmethod
+    def from_node(cls, node: "BaseNode") -> "Arena":
+        """
+        Create an arena from a parsed node, usually a
+        :class:`~atlas_doc_parser.model.NodeDoc`.
+        """
+
+        def get_item(node: "BaseNode"):
+            dct = node.__dict__
+            content = dct.get("content", None)
+            if isinstance(content, NA):
+                content = None
+            marks = dct.get("marks", None)
+            if marks is None or isinstance(marks, NA):
+                marks = None
+            else:
+                marks = [(mark.type, _get_attrs_dict(mark)) for mark in marks]
+            text = dct.get("text", None)
+            return node.type, _get_attrs_dict(node), content, marks, text
+
+        return cls._from_items(
+            root=node,
+            get_item=get_item,
+            version=getattr(node, "version", 1),
+        )
+
+    @classmethod
+    def from_dict(cls, dct: T_DATA) -> "Arena":
+        """
+        Create an arena directly from the raw ADF data, without building the
+        object model. Unknown node and mark types are dropped, the same as
+        :func:`~atlas_doc_parser.model.parse_node` does. Unlike the object
+        model, the required fields are not validated.
+        """
+
+        def get_item(dct: T_DATA):
+            type_ = dct["type"]
+            content = None
+            if type_ in _types_having_content:
+                content = dct.get("content", None)
+                if content is not None:
+                    content = [
+                        d for d in content if d["type"] in _node_type_to_class_mapping
+                    ]
+            marks = None
+            if type_ in _types_having_marks:
+                marks = dct.get("marks", None)
+                if marks is not None:
+                    marks = [
+                        (d["type"], d.get("attrs", None))
+                        for d in marks
+                        if d["type"] in _mark_type_to_class_mapping
+                    ]
+            text = dct.get("text", None) if type_ in _types_having_text else None
+            return type_, dct.get("attrs", None), content, marks, text
+
+        return cls._from_items(
+            root=dct,
+            get_item=get_item,
+            version=dct.get("version", 1),
+        )
+
+    def to_dict(self, i: int = 0) -> T_DATA:
+        """
+        Convert the sub tree at node ``i`` back to the raw ADF data.
+        """
+        type_ = _code_to_type[self.types[i]]
+        dct = {"type": type_}
+        if type_ == TypeEnum.doc.value:
+            dct["version"] = self.version
+        node_attrs = self.attrs_of(i)
+        if node_attrs is not None:
+            dct["attrs"] = dict(node_attrs)
+        text = self.text_of(i)
+        if text is not None:
+            dct["text"] = text
+        if self.child_start[i] != NO_VALUE:
+            dct["content"] = [self.to_dict(c) for c in self.children(i)]
+        start = self.mark_start[i]
+        if start != NO_VALUE:
+            marks = list()
+            for j in range(start, self.mark_end[i]):
+                mark = {"type": _code_to_type[self.mark_types[j]]}
+                ind = self.mark_attrs[j]
+                if ind != NO_VALUE:
+                    mark["attrs"] = dict(self.attrs_list[ind])
+                marks.append(mark)
+            dct["marks"] = marks
+        return dct
+
+    def to_node(self, i: int = 0) -> "BaseNode":
+        """
+        Convert the sub tree at node ``i`` back to the object model.
+        """
+        return parse_node(self.to_dict(i))
+
+    def to_markdown(
+        self,
+        ignore_error: bool = False,
+    ) -> str:
+        """
+        Render the markdown directly from the arena. The output is the same as
+        the ``to_markdown()`` method of the object model.
+        """
+        return _Renderer(self).render(0, ignore_error=ignore_error)
+
+
+class _Renderer:
+    """
+    Markdown renderer working on the arena columns. Each ``_render_xyz`` method
+    mirrors the ``to_markdown`` method of the corresponding node class.
+    """
+
+    def __init__(self, arena: Arena):
+        self.arena = arena
+        self.types = arena.types
+        self.children = arena.children
+        self.attrs = arena.attrs
+        self.attrs_list = arena.attrs_list
+        self.dispatch = [None] * len(_code_to_type)
+        for code, type_ in enumerate(_code_to_type):
+            self.dispatch[code] = getattr(
+                self, f"_render_{type_}", self._not_implemented
+            )
+
+    # --- helpers
+    def render(self, i: int, ignore_error: bool = False) -> str:
+        return self.dispatch[self.types[i]](i, ignore_error)
+
+    def _not_implemented(self, i: int, ignore_error: bool):  # pragma: no cover
+        raise NotImplementedError(
+            f"{_code_to_type[self.types[i]]} has not implemented the to_markdown"
+        )
+
+    def get_attrs(self, i: int) -> T_DATA:
+        ind = self.attrs[i]
+        if ind == NO_VALUE:
+            return {}
+        return self.attrs_list[ind]
+
+    def content(self, i: int, ignore_error: bool = False) -> str:
+        if ignore_error is False:
+            dispatch = self.dispatch
+            types = self.types
+            return "".join([dispatch[types[c]](c, False) for c in self.children(i)])
+        lst = list()
+        for c in self.children(i):
+            try:
+                lst.append(self.render(c))
+            except Exception:  # pragma: no cover
+                pass
+        return "".join(lst)
+
+    def doc_content(self, i: int, ignore_error: bool = False) -> str:
+        lst = list()
+        wrapped = _wrapped_in_doc_content
+        for c in self.children(i):
+            try:
+                if self.types[c] in wrapped:
+                    md = "\n" + self.render(c) + "\n"
+                else:
+                    md = self.render(c)
+                lst.append(md)
+            except Exception as e:  # pragma: no cover
+                if ignore_error:
+                    pass
+                else:
+                    raise e
+        return _strip_double_empty_line("\n".join(lst))
+
+    def add_style(self, md: str, i: int) -> str:
+        arena = self.arena
+        start = arena.mark_start[i]
+        if start == NO_VALUE:
+            return md
+        for j in range(start, arena.mark_end[i]):
+            mark_type = _code_to_type[arena.mark_types[j]]
+            if mark_type == "code":
+                md = f"`{md}`"
+            elif mark_type == "em":
+                md = f"*{md}*"
+            elif mark_type == "strike":
+                md = f"~~{md}~~"
+            elif mark_type == "strong":
+                md = f"**{md}**"
+            elif mark_type == "link":
+                attrs = self.attrs_list[arena.mark_attrs[j]]
+                title = attrs.get("title")
+                if not isinstance(title, str):
+                    title = md
+                md = f"[{title}]({attrs['href']})"
+            elif mark_type == "indentation":
+                attrs = self.attrs_list[arena.mark_attrs[j]]
+                md = _indent(md, TAB * attrs["level"])
+        return md
+
+    def _render_list(self, i: int, level: int, ignore_error: bool) -> str:
+        list_code = self.types[i]
+        lines = []
+        indent = "    " * level
+
+        if list_code == _code_ordered_list:
+            order = self.get_attrs(i).get("order")
+            if level == 0 and isinstance(order, int):
+                current_num = order
+            else:
+                current_num = 1
+        else:
+            current_num = None
+
+        for item in self.children(i):
+            if self.types[item] != _code_list_item:
+                continue
+            content_lines = []
+            for node in self.children(item):
+                try:
+                    if self.types[node] == list_code:
+                        content_lines.append(self._render_list(node, level + 1, False))
+                    else:
+                        content_lines.append(self.render(node).rstrip())
+                except Exception as e:  # pragma: no cover
+                    if ignore_error:
+                        pass
+                    else:
+                        raise e
+            item_lines = "\n".join(content_lines).split("\n")
+            if current_num is None:
+                lines.append(f"{indent}- {item_lines[0]}")
+            else:
+                lines.append(f"{indent}{current_num}. {item_lines[0]}")
+                current_num += 1
+            lines.extend(item_lines[1:])
+        return "\n".join(lines)
+
+    def _render_task_list(
+        self, i: int, level: int, lines: T.List[str], ignore_error: bool
+    ):
+        indent = TAB * level
+        for c in self.children(i):
+            code = self.types[c]
+            if code == _code_task_item:
+                lines.append(f"{indent}- {self._render_taskItem(c, ignore_error)}")
+            elif code == _code_task_list:
+                self._render_task_list(c, level + 1, lines, ignore_error)
+            else:  # pragma: no cover
+                raise TypeError(f"Unexpected type: {_code_to_type[code]}")
+
+    def _render_table_cell(self, i: int, ignore_error: bool) -> str:
+        md = self.content(i, ignore_error)
+        return md.replace("|", "\\|").replace("\n", "<br>")
+
+    # --- node renderers
+    def _render_blockCard(self, i: int, ignore_error: bool) -> str:
+        url = self.get_attrs(i).get("url")
+        if isinstance(url, str):
+            return f"\n[{url}]({url})\n"
+        else:
+            raise NotImplementedError
+
+    def _render_blockquote(self, i: int, ignore_error: bool) -> str:
+        return _quote(self.doc_content(i, ignore_error)) + "\n"
+
+    def _render_bulletList(self, i: int, ignore_error: bool) -> str:
+        return self._render_list(i, 0, ignore_error)
+
+    def _render_codeBlock(self, i: int, ignore_error: bool) -> str:
+        code = self.content(i, ignore_error)
+        lang = self.get_attrs(i).get("language")
+        if isinstance(lang, str):
+            lang = _atlassian_lang_to_markdown_lang_mapping.get(lang, lang)
+        else:
+            lang = ""
+        if lang == "none":
+            lang = ""
+        return f"```{lang}\n{code}\n```"
+
+    def _render_date(self, i: int, ignore_error: bool) -> str:
+        timestamp = self.get_attrs(i)["timestamp"]
+        return _format_date(timestamp)
+
+    def _render_doc(self, i: int, ignore_error: bool) -> str:
+        return self.doc_content(i, ignore_error)
+
+    def _render_emoji(self, i: int, ignore_error: bool) -> str:
+        text = self.get_attrs(i).get("text")
+        if isinstance(text, str):
+            return text
+        else:
+            raise NotImplementedError
+
+    def _render_expand(self, i: int, ignore_error: bool) -> str:
+        return self.add_style(self.doc_content(i, ignore_error), i)
+
+    def _render_hardBreak(self, i: int, ignore_error: bool) -> str:
+        return "\n"
+
+    def _render_heading(self, i: int, ignore_error: bool) -> str:
+        level = self.get_attrs(i)["level"]
+        return "\n\n{} {}\n\n".format("#" * level, self.content(i, ignore_error))
+
+    def _render_inlineCard(self, i: int, ignore_error: bool) -> str:
+        url = self.get_attrs(i).get("url")
+        if isinstance(url, str):
+            return f"[{url}]({url})"
+        else:
+            raise NotImplementedError
+
+    def _render_listItem(self, i: int, ignore_error: bool) -> str:
+        return self.content(i, ignore_error)
+
+    def _render_media(self, i: int, ignore_error: bool) -> str:
+        attrs = self.get_attrs(i)
+        alt = attrs.get("alt")
+        if not isinstance(alt, str):
+            alt = ""
+        media_type = attrs["type"]
+        if media_type == "file":
+            raise NotImplementedError
+        elif media_type == "link":
+            raise NotImplementedError
+        elif media_type == "external":
+            url = attrs.get("url")
+            if isinstance(url, str):
+                return self.add_style(f"![{alt}]({url})", i)
+            else:
+                raise NotImplementedError
+        else:  # pragma: no cover
+            raise TypeError
+
+    def _render_mediaGroup(self, i: int, ignore_error: bool) -> str:
+        return ""
+
+    def _render_mediaSingle(self, i: int, ignore_error: bool) -> str:
+        return self.content(i, ignore_error)
+
+    def _render_mention(self, i: int, ignore_error: bool) -> str:
+        attrs = self.get_attrs(i)
+        if "text" in attrs:
+            return attrs["text"]
+        else:
+            return "@Unknown"
+
+    def _render_nestedExpand(self, i: int, ignore_error: bool) -> str:
+        return self.doc_content(i, ignore_error)
+
+    def _render_orderedList(self, i: int, ignore_error: bool) -> str:
+        return self._render_list(i, 0, ignore_error)
+
+    def _render_panel(self, i: int, ignore_error: bool) -> str:
+        panel_type = self.get_attrs(i)["panelType"]
+        md = _strip_double_empty_line(
+            "\n".join(
+                [
+                    f"**{panel_type.upper()}**",
+                    "",
+                    self.doc_content(i, ignore_error),
+                ]
+            )
+        )
+        return _quote(md) + "\n"
+
+    def _render_paragraph(self, i: int, ignore_error: bool) -> str:
+        return self.add_style(self.content(i, ignore_error), i) + "\n"
+
+    def _render_rule(self, i: int, ignore_error: bool) -> str:
+        return "---"
+
+    def _render_status(self, i: int, ignore_error: bool) -> str:
+        return f"`{self.get_attrs(i)['text']}`"
+
+    def _render_table(self, i: int, ignore_error: bool) -> str:
+        lines = list()
+        for row in self.children(i):
+            try:
+                lines.append(self._render_tableRow(row, False))
+                cells = self.children(row)
+                if cells and self.types[cells[0]] == _code_table_header:
+                    lines.append("| " + " | ".join(["---"] * len(cells)) + " |")
+            except Exception as e:  # pragma: no cover
+                if ignore_error:
+                    pass
+                else:
+                    raise e
+        return "\n".join(lines)
+
+    def _render_tableCell(self, i: int, ignore_error: bool) -> str:
+        return self._render_table_cell(i, ignore_error)
+
+    def _render_tableHeader(self, i: int, ignore_error: bool) -> str:
+        return self._render_table_cell(i, ignore_error)
+
+    def _render_tableRow(self, i: int, ignore_error: bool) -> str:
+        cells = [self.render(c, ignore_error) for c in self.children(i)]
+        return "| " + " | ".join(cells) + " |"
+
+    def _render_taskItem(self, i: int, ignore_error: bool) -> str:
+        checkbox = "[x]" if self.get_attrs(i)["state"] == "DONE" else "[ ]"
+        return f"{checkbox} {self.content(i, ignore_error)}"
+
+    def _render_taskList(self, i: int, ignore_error: bool) -> str:
+        lines = list()
+        self._render_task_list(i, 0, lines, ignore_error)
+        return "\n".join(lines)
+
+    def _render_text(self, i: int, ignore_error: bool) -> str:
+        arena = self.arena
+        md = arena.text[arena.text_start[i] : arena.text_end[i]]
+        return self.add_style(md, i)
+
+
+_code_list_item = _type_to_code[TypeEnum.listItem.value]
+_code_ordered_list = _type_to_code[TypeEnum.orderedList.value]
+_code_table_header = _type_to_code[TypeEnum.tableHeader.value]
+_code_task_item = _type_to_code[TypeEnum.taskItem.value]
+_code_task_list = _type_to_code[TypeEnum.taskList.value]
+_wrapped_in_doc_content = {
+    _type_to_code[TypeEnum.bulletList.value],
+    _type_to_code[TypeEnum.orderedList.value],
+    _type_to_code[TypeEnum.codeBlock.value],
+}
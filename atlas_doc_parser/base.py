@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import sys
 import typing as T
 import enum
 import dataclasses
@@ -67,6 +68,11 @@ class Base:
                 kwargs[field_name] = dct[field_name]
             except KeyError:
                 pass
+        # intern the type value, so all the nodes of the same type share
+        # the same string object, it saves memory and pickle size
+        type_ = kwargs.get("type")
+        if type_.__class__ is str:
+            kwargs["type"] = sys.intern(type_)
         return cls(**kwargs)
 
 
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch conversion of a JSON lines corpus of ADF documents to markdown.
+
+Example::
+
+    from atlas_doc_parser.api import convert_jsonl, ResolveCache
+
+    result = convert_jsonl(
+        "docs.jsonl",
+        "docs.md.jsonl",
+        resolver=my_resolver,  # optional, see atlas_doc_parser.resolve
+        cache=ResolveCache(),
+        ignore_error=True,
+    )
+    print(result.n_doc, result.n_error)
+
+Each document is traced as a ``convert`` span with ``decode``, ``parse``,
+``resolve``, ``render`` and ``write`` spans inside, see
+:mod:`atlas_doc_parser.tracing`.
+"""
+
+import typing as T
+import json
+import dataclasses
+
+from .model import NodeDoc
+from .resolve import BaseResolver, ResolveCache, render_resolved
+from .tracing import start_span
+
+
+@dataclasses.dataclass
+class BatchResult:
+    """
+    :param n_doc: the number of documents read.
+    :param n_error: the number of documents that failed to convert.
+    """
+
+    n_doc: int = dataclasses.field(default=0)
+    n_error: int = dataclasses.field(default=0)
+
+
+def convert_jsonl(
+    input_path: str,
+    output_path: str,
+    resolver: T.Optional[BaseResolver] = None,
+    cache: T.Optional[ResolveCache] = None,
+    ignore_error: bool = False,
+) -> BatchResult:
+    """
+    Convert a JSON lines file of ADF docs to a JSON lines file of
+    ``{"index": ..., "markdown": ...}``, one document at a time.
+
+    :param resolver: resolve the mentions, media and cards in batch before
+        rendering, see :func:`~atlas_doc_parser.resolve.render_resolved`.
+    :param cache: the resolver cache shared by all the documents.
+    :param ignore_error: write ``{"index": ..., "error": ...}`` for a
+        document that fails to convert and go on, and ignore the errors of
+        the nodes inside a document. Otherwise the first error is raised.
+    """
+    if resolver is not None and cache is None:
+        cache = ResolveCache()
+    result = BatchResult()
+    # binary mode, the ``n_byte`` of the spans are the utf-8 sizes of the
+    # lines, not their number of characters
+    with open(input_path, "rb") as f_in, open(output_path, "wb") as f_out:
+        index = 0
+        for line in f_in:
+            if not line.strip():
+                continue
+            with start_span("convert", index=index, n_byte=len(line)) as span:
+                try:
+                    with start_span("decode", n_byte=len(line)):
+                        data = json.loads(line)
+                    doc = NodeDoc.from_dict(data, ignore_error=ignore_error)
+                    if resolver is None:
+                        md = doc.to_markdown(ignore_error=ignore_error)
+                    else:
+                        md = render_resolved(
+                            doc, resolver, cache=cache, ignore_error=ignore_error
+                        )
+                    record = {"index": index, "markdown": md}
+                    n_error = 0
+                except Exception as e:
+                    if ignore_error is False:
+                        raise e
+                    record = {"index": index, "error": f"{e.__class__.__name__}: {e}"}
+                    n_error = 1
+                span.set(n_error=n_error)
+                with start_span("write") as write_span:
+                    out_line = json.dumps(record, ensure_ascii=False) + "\n"
+                    out_bytes = out_line.encode("utf-8")
+                    f_out.write(out_bytes)
+                    write_span.set(n_byte=len(out_bytes))
+            result.n_doc += 1
+            result.n_error += n_error
+            index += 1
+    return result
@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+
+"""
+Split a document into size bounded markdown chunks, for example for RAG
+ingestion.
+
+The top level blocks are packed greedily. A new chunk starts at each heading,
+and a block is moved to a new chunk rather than being split. A block that is
+larger than ``max_size`` on its own is split: a code block by lines, a table
+by rows with the header rows repeated, and a list, a task list, a quote, a
+panel or an expand at its children, recursively, each piece keeps the
+container around it. Only an atomic piece, e.g. a single paragraph, heading,
+code line or table row, can exceed ``max_size``.
+
+Example::
+
+    from atlas_doc_parser.api import iter_chunks
+
+    for chunk in iter_chunks(data, max_size=1000):
+        print(" > ".join(chunk.breadcrumb), chunk.size)
+        print(chunk.text)
+"""
+
+import typing as T
+import copy
+import dataclasses
+
+from .base import T_DATA
+from .model import (
+    T_NODE,
+    NodeDoc,
+    NodeText,
+    NodeHeading,
+    NodeCodeBlock,
+    NodeTable,
+    NodeTableHeader,
+    NodeBulletList,
+    NodeOrderedList,
+    NodeOrderedListAttrs,
+    NodeListItem,
+    NodeBlockQuote,
+    NodePanel,
+    NodeExpand,
+    NodeNestedExpand,
+    NodeTaskList,
+    parse_node,
+    _content_to_markdown,
+    _strip_double_empty_line,
+)
+from .outline import _get_plain_text
+
+
+@dataclasses.dataclass
+class Chunk:
+    """
+    A chunk of the document.
+
+    :param index: the position of the chunk in the document.
+    :param text: the markdown of the chunk.
+    :param size: ``size_func(text)``.
+    :param breadcrumb: the text of the headings the chunk is under, from the
+        outermost to the innermost.
+    :param start: the index of the first top level block in the chunk.
+    :param end: the index of the last top level block in the chunk, plus one.
+    :param is_partial: True if the chunk has a piece of a split block.
+    """
+
+    index: int = dataclasses.field()
+    text: str = dataclasses.field()
+    size: int = dataclasses.field()
+    breadcrumb: T.List[str] = dataclasses.field(default_factory=list)
+    start: int = dataclasses.field(default=0)
+    end: int = dataclasses.field(default=0)
+    is_partial: bool = dataclasses.field(default=False)
+
+
+def _iter_blocks(
+    node_or_data: T.Union[NodeDoc, T_DATA],
+    ignore_error: bool,
+) -> T.Iterator[T.Tuple[int, T_NODE]]:
+    """
+    Yield the top level blocks, the raw data is parsed one block at a time.
+    """
+    if isinstance(node_or_data, dict):
+        for ind, dct in enumerate(node_or_data.get("content", [])):
+            try:
+                node = parse_node(dct, ignore_error=ignore_error)
+            except Exception as e:
+                if ignore_error:
+                    continue
+                raise e
+            if node is not None:
+                yield ind, node
+    else:
+        yield from enumerate(node_or_data.content)
+
+
+def _render_block(node: T_NODE, ignore_error: bool = False) -> str:
+    """
+    Render a top level block the same way as ``NodeDoc.to_markdown`` does.
+    """
+    if isinstance(node, (NodeBulletList, NodeOrderedList, NodeCodeBlock)):
+        return "\n" + node.to_markdown(ignore_error=ignore_error) + "\n"
+    return node.to_markdown(ignore_error=ignore_error)
+
+
+# the blocks that are split at their children
+_container_classes = (
+    NodeBulletList,
+    NodeOrderedList,
+    NodeListItem,
+    NodeTaskList,
+    NodeBlockQuote,
+    NodePanel,
+    NodeExpand,
+    NodeNestedExpand,
+)
+
+
+def _pack(
+    n_item: int,
+    make: T.Callable[[int, int], T_NODE],
+    measure: T.Callable[[T_NODE], int],
+    max_size: int,
+    sizes: T.Optional[T.List[int]] = None,
+) -> T.List[T.Tuple[T_NODE, int]]:
+    """
+    Greedily group consecutive items, ``make(start, end)`` builds the node of
+    the items in ``[start, end)``, and the size of a group is ``measure`` of
+    its node. A group has at least one item. Return the node and the size
+    of each group.
+
+    The end of a group is estimated from the size of each item alone, then
+    checked, the size may not be additive, e.g. with a tokenizer. So a group
+    is rendered a few times, not once per item.
+
+    :param sizes: the size of the group of each item alone, if known.
+    """
+    if sizes is None:
+        sizes = [measure(make(ind, ind + 1)) for ind in range(n_item)]
+    base = measure(make(0, 0))
+    groups = list()
+    start = 0
+    while start < n_item:
+        end, total = start + 1, sizes[start]
+        while end < n_item and total + sizes[end] - base <= max_size:
+            total += sizes[end] - base
+            end += 1
+        estimate = total
+        if end - start > 1:
+            size = measure(make(start, end))
+            if size > max_size:
+                # the estimate is too large, bisect, start + 1 always goes
+                good, good_size, bad = start + 1, sizes[start], end
+                while bad - good > 1:
+                    mid = (good + bad) // 2
+                    size = measure(make(start, mid))
+                    if size <= max_size:
+                        good, good_size = mid, size
+                    else:
+                        bad = mid
+                end, total = good, good_size
+            else:
+                total = size
+        # the next item may still fit if the estimate was too large
+        while end < n_item and total < estimate:
+            size = measure(make(start, end + 1))
+            if size > max_size:
+                break
+            end, total = end + 1, size
+        groups.append((make(start, end), total))
+        start = end
+    return groups
+
+
+def _copy_container(node: T_NODE, content: T.List[T_NODE], offset: int) -> T_NODE:
+    """
+    Copy the container with part of its children, ``offset`` is the index of
+    the first child, an ordered list keeps its numbering.
+    """
+    # a shallow copy, ``dataclasses.replace`` would validate all the fields
+    new_node = copy.copy(node)
+    new_node.content = content
+    if isinstance(node, NodeOrderedList) and offset:
+        order = getattr(node.attrs, "order", None)
+        if not isinstance(order, int):
+            order = 1
+        new_node.attrs = NodeOrderedListAttrs(order=order + offset)
+    return new_node
+
+
+def _split_table_rows(node: NodeTable) -> T.Tuple[T.List[T_NODE], T.List[T_NODE]]:
+    """
+    Split the rows of a table into the header rows and the other rows.
+    """
+    n_header = 0
+    for row in node.content:
+        # a row may be empty, it still parses with ignore_error=True
+        if (
+            isinstance(row.content, list)
+            and row.content
+            and isinstance(row.content[0], NodeTableHeader)
+        ):
+            n_header += 1
+        else:
+            break
+    return node.content[:n_header], node.content[n_header:]
+
+
+def _split_node(
+    node: T_NODE,
+    wrap: T.Callable[[T_NODE], T_NODE],
+    measure: T.Callable[[T_NODE], int],
+    max_size: int,
+    size: T.Optional[int] = None,
+) -> T.List[T.Tuple[T_NODE, int]]:
+    """
+    Split a node into smaller nodes of the same type, in order. Return each
+    piece and the size of its top level block.
+
+    :param wrap: put a piece of the node back into its ancestors, it returns
+        the top level block that holds only the piece.
+    :param measure: the size of a top level block.
+    :param size: the size of the node in its ancestors, if known.
+    """
+    if size is None:
+        size = measure(wrap(node))
+    if size <= max_size:
+        return [(node, size)]
+
+    def measure_wrapped(piece: T_NODE) -> int:
+        return measure(wrap(piece))
+
+    if isinstance(node, NodeCodeBlock):
+        lines = _content_to_markdown(content=node.content).split("\n")
+        return _pack(
+            len(lines),
+            lambda start, end: NodeCodeBlock(
+                attrs=node.attrs,
+                content=[NodeText(text="\n".join(lines[start:end]))],
+            ),
+            measure_wrapped,
+            max_size,
+        )
+    if isinstance(node, NodeTable):
+        header, rows = _split_table_rows(node)
+        if not rows:
+            return [(node, size)]
+        return _pack(
+            len(rows),
+            lambda start, end: NodeTable(
+                attrs=node.attrs, content=header + rows[start:end]
+            ),
+            measure_wrapped,
+            max_size,
+        )
+    if isinstance(node, _container_classes) and isinstance(node.content, list):
+        pieces = list()  # (index of the child, piece of the child, size)
+        for ind, child in enumerate(node.content):
+
+            def wrap_child(piece: T_NODE, ind: int = ind) -> T_NODE:
+                return wrap(_copy_container(node, [piece], ind))
+
+            for piece, piece_size in _split_node(child, wrap_child, measure, max_size):
+                pieces.append((ind, piece, piece_size))
+        if not pieces:
+            return [(node, size)]
+        return _pack(
+            len(pieces),
+            lambda start, end: _copy_container(
+                node,
+                [piece for _, piece, _ in pieces[start:end]],
+                pieces[start][0],
+            ),
+            measure_wrapped,
+            max_size,
+            sizes=[piece_size for _, _, piece_size in pieces],
+        )
+    return [(node, size)]
+
+
+class _Buffer:
+    """
+    The blocks of the chunk that is being built.
+    """
+
+    def __init__(self):
+        self.mds: T.List[str] = list()
+        self.size: int = 0
+        self.breadcrumb: T.List[str] = list()
+        self.start: int = 0
+        self.end: int = 0
+        self.has_body: bool = False
+        self.last_heading_level: T.Optional[int] = None
+        self.is_partial: bool = False
+
+    def add(
+        self,
+        ind: int,
+        md: str,
+        size: int,
+        breadcrumb: T.List[str],
+        is_partial: bool,
+    ):
+        if not self.mds:
+            self.breadcrumb = list(breadcrumb)
+            self.start = ind
+        self.mds.append(md)
+        self.size += size
+        self.end = ind + 1
+        self.is_partial = self.is_partial or is_partial
+
+
+def iter_chunks(
+    node_or_data: T.Union[NodeDoc, T_DATA],
+    max_size: int = 2000,
+    size_func: T.Callable[[str], int] = len,
+    split_on_heading: bool = True,
+    ignore_error: bool = False,
+) -> T.Iterator[Chunk]:
+    """
+    Yield the chunks one by one, only the blocks of the current chunk are
+    kept in memory.
+
+    :param node_or_data: a parsed ``NodeDoc`` or the raw ADF data of a doc.
+        The raw data is parsed one top level block at a time.
+    :param max_size: the max size of a chunk, measured by ``size_func``.
+    :param size_func: measure the size of a markdown string, the default is
+        the number of characters. Use a tokenizer to bound the number of tokens.
+    :param split_on_heading: if True, start a new chunk at each heading.
+    :param ignore_error: skip the blocks that failed to parse or to render,
+        and the nodes inside a block that failed to render.
+    """
+    breadcrumb: T.List[T.Tuple[int, str]] = list()  # (level, text)
+    buffer = _Buffer()
+    index = 0
+
+    def flush() -> T.Optional[Chunk]:
+        nonlocal buffer, index
+        if not buffer.mds:
+            return None
+        text = _strip_double_empty_line("\n".join(buffer.mds)).strip()
+        chunk = Chunk(
+            index=index,
+            text=text,
+            size=size_func(text),
+            breadcrumb=buffer.breadcrumb,
+            start=buffer.start,
+            end=buffer.end,
+            is_partial=buffer.is_partial,
+        )
+        buffer = _Buffer()
+        index += 1
+        return chunk
+
+    for ind, node in _iter_blocks(node_or_data, ignore_error):
+        try:
+            md = _render_block(node, ignore_error=ignore_error)
+        except Exception as e:
+            if ignore_error:
+                continue
+            raise e
+
+        is_heading = isinstance(node, NodeHeading)
+        if is_heading:
+            level = node.attrs.level
+            if split_on_heading and (
+                buffer.has_body
+                or (
+                    buffer.last_heading_level is not None
+                    and level <= buffer.last_heading_level
+                )
+            ):
+                chunk = flush()
+                if chunk is not None:
+                    yield chunk
+            while breadcrumb and breadcrumb[-1][0] >= level:
+                breadcrumb.pop()
+            breadcrumb.append((level, _get_plain_text(node)))
+
+        size = size_func(md + "\n")
+        nodes = [node]
+        if size > max_size:
+
+            def measure(block: T_NODE) -> int:
+                md = _render_block(block, ignore_error=ignore_error)
+                return size_func(md + "\n")
+
+            nodes = [
+                block
+                for block, _ in _split_node(
+                    node, lambda block: block, measure, max_size, size
+                )
+            ]
+        if len(nodes) > 1:
+            mds = [_render_block(block, ignore_error=ignore_error) for block in nodes]
+            pieces = [(md, size_func(md + "\n"), True) for md in mds]
+        else:
+            pieces = [(md, size, False)]
+
+        for md, size, is_partial in pieces:
+            if buffer.mds and buffer.size + size > max_size:
+                yield flush()
+            buffer.add(
+                ind,
+                md,
+                size,
+                [text for _, text in breadcrumb],
+                is_partial,
+            )
+            if is_heading:
+                buffer.last_heading_level = level
+            else:
+                buffer.has_body = True
+
+    chunk = flush()
+    if chunk is not None:
+        yield chunk
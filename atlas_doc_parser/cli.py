@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+"""
+The command line interface::
+
+    python -m atlas_doc_parser profile doc.json
+    python -m atlas_doc_parser profile doc.json --repeat 10 --json
+    python -m atlas_doc_parser memory corpus.jsonl --limit 10
+"""
+
+import typing as T
+import json
+import argparse
+
+from .base import T_DATA
+from .model import NodeDoc
+from .profiler import Profiler, _sort_keys
+from .memory import get_memory_report
+
+
+def iter_data(path: str) -> T.Iterator[T_DATA]:
+    """
+    Read the ADF data of the docs in a JSON file (one doc) or a JSON lines
+    file (``.jsonl``, one doc per line), lazily.
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield json.load(f)
+
+
+def profile(
+    path: str,
+    repeat: int = 1,
+    sort_by: str = "self_time",
+    limit: T.Optional[int] = None,
+    as_json: bool = False,
+    ignore_error: bool = False,
+) -> str:
+    """
+    Profile the parsing and rendering of the docs in an ADF JSON or JSON
+    lines file.
+    """
+    datas = list(iter_data(path))
+    with Profiler() as prof:
+        for _ in range(repeat):
+            for data in datas:
+                doc = NodeDoc.from_dict(data, ignore_error=ignore_error)
+                doc.to_markdown(ignore_error=ignore_error)
+    if as_json:
+        return prof.to_json(sort_by=sort_by)
+    return prof.to_table(sort_by=sort_by, limit=limit)
+
+
+def memory(
+    path: str,
+    limit: T.Optional[int] = None,
+    as_json: bool = False,
+    measure_arena: bool = True,
+    ignore_error: bool = False,
+) -> str:
+    """
+    Report the memory used by the docs in an ADF JSON or JSON lines file.
+    """
+    report = get_memory_report(
+        iter_data(path),
+        measure_arena=measure_arena,
+        ignore_error=ignore_error,
+    )
+    if as_json:
+        return report.to_json()
+    return report.to_table(limit=limit)
+
+
+def main(args: T.Optional[T.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m atlas_doc_parser")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    profile_parser = subparsers.add_parser(
+        "profile",
+        help="profile the parsing and rendering of an ADF file per node type",
+    )
+    profile_parser.add_argument("path", help="a JSON file or a JSON lines file")
+    profile_parser.add_argument("--repeat", type=int, default=1)
+    profile_parser.add_argument("--sort", choices=_sort_keys, default="self_time")
+    profile_parser.add_argument(
+        "--limit", type=int, help="the max number of node types per phase"
+    )
+    profile_parser.add_argument("--json", action="store_true", help="output JSON")
+    profile_parser.add_argument("--ignore-error", action="store_true")
+    memory_parser = subparsers.add_parser(
+        "memory",
+        help="report the memory used by the parsed docs per class",
+    )
+    memory_parser.add_argument("path", help="a JSON file or a JSON lines file")
+    memory_parser.add_argument("--limit", type=int, help="the max number of classes")
+    memory_parser.add_argument("--json", action="store_true", help="output JSON")
+    memory_parser.add_argument(
+        "--no-arena", action="store_true", help="skip the arena size"
+    )
+    memory_parser.add_argument("--ignore-error", action="store_true")
+    ns = parser.parse_args(args)
+
+    if ns.command == "profile":
+        print(
+            profile(
+                ns.path,
+                repeat=ns.repeat,
+                sort_by=ns.sort,
+                limit=ns.limit,
+                as_json=ns.json,
+                ignore_error=ns.ignore_error,
+            )
+        )
+    elif ns.command == "memory":
+        print(
+            memory(
+                ns.path,
+                limit=ns.limit,
+                as_json=ns.json,
+                measure_arena=not ns.no_arena,
+                ignore_error=ns.ignore_error,
+            )
+        )
+    return 0
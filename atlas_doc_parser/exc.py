@@ -1,4 +1,21 @@
 # -*- coding: utf-8 -*-
 
+
 class ParamError(Exception):
     pass
+
+
+class LimitExceededError(Exception):
+    """
+    Raised when a document exceeds one of the :class:`~atlas_doc_parser.limits.Limits`.
+
+    :param name: the name of the limit, for example ``"max_depth"``.
+    :param limit: the value of the limit.
+    :param value: the value that exceeds the limit.
+    """
+
+    def __init__(self, name: str, limit: int, value: int):
+        super().__init__(f"{name} = {limit} exceeded, got {value}")
+        self.name = name
+        self.limit = limit
+        self.value = value
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+
+"""
+Extract structured facts (links, cards, mentions, media, dates and tasks)
+from a document in a single traversal.
+
+It works on a parsed :class:`~atlas_doc_parser.model.NodeDoc` or directly
+on the raw ADF data without building the object model. Every fact carries a
+`JSON Pointer <https://datatracker.ietf.org/doc/html/rfc6901>`_ path back to
+the source node (or mark). For a parsed node, the path refers to its
+``to_dict()`` output.
+"""
+
+import typing as T
+import enum
+import dataclasses
+
+from .arg import NA
+from .type_enum import TypeEnum
+from .base import T_DATA
+from .model import T_NODE, _node_type_to_class_mapping
+
+
+class FactKindEnum(str, enum.Enum):
+    link = "link"
+    card = "card"
+    mention = "mention"
+    media = "media"
+    date = "date"
+    task = "task"
+
+
+@dataclasses.dataclass
+class LinkFact:
+    """
+    A :class:`~atlas_doc_parser.model.MarkLink` hyperlink.
+    """
+
+    path: str = dataclasses.field()
+    href: T.Optional[str] = dataclasses.field()
+    title: T.Optional[str] = dataclasses.field()
+
+
+@dataclasses.dataclass
+class CardFact:
+    """
+    A :class:`~atlas_doc_parser.model.NodeInlineCard` or
+    :class:`~atlas_doc_parser.model.NodeBlockCard` url.
+    """
+
+    path: str = dataclasses.field()
+    type: str = dataclasses.field()
+    url: T.Optional[str] = dataclasses.field()
+
+
+@dataclasses.dataclass
+class MentionFact:
+    path: str = dataclasses.field()
+    id: T.Optional[str] = dataclasses.field()
+    text: T.Optional[str] = dataclasses.field()
+
+
+@dataclasses.dataclass
+class MediaFact:
+    path: str = dataclasses.field()
+    id: T.Optional[str] = dataclasses.field()
+    collection: T.Optional[str] = dataclasses.field()
+    type: T.Optional[str] = dataclasses.field()
+    url: T.Optional[str] = dataclasses.field()
+
+
+@dataclasses.dataclass
+class DateFact:
+    path: str = dataclasses.field()
+    timestamp: T.Optional[str] = dataclasses.field()
+
+
+@dataclasses.dataclass
+class TaskFact:
+    path: str = dataclasses.field()
+    state: T.Optional[str] = dataclasses.field()
+    local_id: T.Optional[str] = dataclasses.field()
+
+
+@dataclasses.dataclass
+class ExtractResult:
+    links: T.List[LinkFact] = dataclasses.field(default_factory=list)
+    cards: T.List[CardFact] = dataclasses.field(default_factory=list)
+    mentions: T.List[MentionFact] = dataclasses.field(default_factory=list)
+    media: T.List[MediaFact] = dataclasses.field(default_factory=list)
+    dates: T.List[DateFact] = dataclasses.field(default_factory=list)
+    tasks: T.List[TaskFact] = dataclasses.field(default_factory=list)
+
+
+def _get(attrs: T.Any, key: str) -> T.Any:
+    """
+    Get an attribute value from either an attrs dict or an attrs object,
+    return None if it doesn't exist.
+    """
+    if attrs is None:
+        return None
+    if isinstance(attrs, dict):
+        return attrs.get(key)
+    value = getattr(attrs, key, None)
+    if isinstance(value, NA):
+        return None
+    return value
+
+
+def _read_dict(dct: T_DATA) -> T.Tuple[str, T.Any, T.Any, T.Any]:
+    return (
+        dct["type"],
+        dct.get("attrs"),
+        dct.get("marks"),
+        dct.get("content"),
+    )
+
+
+def _read_node(node: "T_NODE") -> T.Tuple[str, T.Any, T.Any, T.Any]:
+    dct = node.__dict__
+    return (
+        node.type,
+        dct.get("attrs"),
+        dct.get("marks"),
+        dct.get("content"),
+    )
+
+
+def _iter_children(path: str, content: list) -> T.Iterable[T.Tuple[str, T.Any]]:
+    for ind, child in enumerate(content):
+        yield f"{path}/content/{ind}", child
+
+
+_type_card = {TypeEnum.inlineCard.value, TypeEnum.blockCard.value}
+
+
+def extract(
+    node_or_data: T.Union["T_NODE", T_DATA],
+    kinds: T.Optional[T.Iterable[T.Union[str, FactKindEnum]]] = None,
+) -> ExtractResult:
+    """
+    Collect all the requested fact kinds in one pass.
+
+    :param node_or_data: a parsed node (usually a ``NodeDoc``) or the raw ADF data.
+        Unknown node types in the raw data are skipped, the same as the parser does.
+    :param kinds: the fact kinds to collect, default is all of them,
+        see :class:`FactKindEnum`.
+    """
+    if kinds is None:
+        kinds = set(FactKindEnum)
+    else:
+        kinds = {FactKindEnum(kind) for kind in kinds}
+    want_link = FactKindEnum.link in kinds
+    want_card = FactKindEnum.card in kinds
+    want_mention = FactKindEnum.mention in kinds
+    want_media = FactKindEnum.media in kinds
+    want_date = FactKindEnum.date in kinds
+    want_task = FactKindEnum.task in kinds
+
+    if isinstance(node_or_data, dict):
+        read = _read_dict
+    else:
+        read = _read_node
+    mapping = _node_type_to_class_mapping
+    result = ExtractResult()
+
+    stack = [iter([("", node_or_data)])]
+    while stack:
+        try:
+            path, node = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            continue
+        type_, attrs, marks, content = read(node)
+        if type_ not in mapping:
+            continue
+        if attrs.__class__ is NA:
+            attrs = None
+
+        if want_link and isinstance(marks, list):
+            for j, mark in enumerate(marks):
+                if isinstance(mark, dict):
+                    mark_type, mark_attrs = mark["type"], mark.get("attrs")
+                else:
+                    mark_type, mark_attrs = mark.type, getattr(mark, "attrs", None)
+                if mark_type == "link":
+                    result.links.append(
+                        LinkFact(
+                            path=f"{path}/marks/{j}",
+                            href=_get(mark_attrs, "href"),
+                            title=_get(mark_attrs, "title"),
+                        )
+                    )
+
+        if type_ in _type_card:
+            if want_card:
+                result.cards.append(
+                    CardFact(path=path, type=type_, url=_get(attrs, "url"))
+                )
+        elif type_ == "mention":
+            if want_mention:
+                result.mentions.append(
+                    MentionFact(
+                        path=path,
+                        id=_get(attrs, "id"),
+                        text=_get(attrs, "text"),
+                    )
+                )
+        elif type_ == "media":
+            if want_media:
+                result.media.append(
+                    MediaFact(
+                        path=path,
+                        id=_get(attrs, "id"),
+                        collection=_get(attrs, "collection"),
+                        type=_get(attrs, "type"),
+                        url=_get(attrs, "url"),
+                    )
+                )
+        elif type_ == "date":
+            if want_date:
+                result.dates.append(
+                    DateFact(path=path, timestamp=_get(attrs, "timestamp"))
+                )
+        elif type_ == "taskItem":
+            if want_task:
+                result.tasks.append(
+                    TaskFact(
+                        path=path,
+                        state=_get(attrs, "state"),
+                        local_id=_get(attrs, "localId"),
+                    )
+                )
+
+        if isinstance(content, list):
+            stack.append(_iter_children(path, content))
+    return result
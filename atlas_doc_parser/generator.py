@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+
+"""
+A seeded generator of synthetic ADF documents, for scale and stress testing.
+
+The documents use every node type of
+:data:`~atlas_doc_parser.model._node_type_to_class_mapping` and every mark type
+of :data:`~atlas_doc_parser.model._mark_type_to_class_mapping`, with valid
+attributes, so they can be parsed and rendered. The same config always
+generates the same documents.
+
+Example::
+
+    from atlas_doc_parser.api import GeneratorConfig, DocGenerator, write_jsonl
+
+    config = GeneratorConfig(seed=1, n_block=200, max_depth=6, mark_density=0.5)
+    data = DocGenerator(config).make_doc()
+
+    # one document per line, nothing is held in memory
+    write_jsonl("corpus.jsonl", n_doc=1_000_000, config=config)
+"""
+
+import typing as T
+import json
+import random
+import dataclasses
+
+from .base import T_DATA
+
+_words = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua café naïve 日本語 文档"
+).split()
+
+_languages = ["python", "java", "javascript", "sql", "bash", "none"]
+_colors = ["#ff5630", "#97a0af", "#36b37e", "#6554c0"]
+_panel_types = ["info", "note", "warning", "success", "error"]
+_status_colors = ["neutral", "purple", "blue", "red", "yellow", "green"]
+_media_layouts = ["center", "wide", "wrap-left", "full-width"]
+_emojis = [(":smile:", "😄"), (":thumbsup:", "👍"), (":warning:", "⚠️")]
+
+# the text marks, the indentation mark goes to the paragraphs
+_text_marks = [
+    "strong",
+    "em",
+    "strike",
+    "underline",
+    "code",
+    "link",
+    "subsup",
+    "textColor",
+    "backgroundColor",
+]
+
+_inline_kinds = ["mention", "emoji", "date", "status", "inlineCard", "hardBreak"]
+
+# the top level block kinds, cycled so that a document with at least this many
+# blocks has all of them
+_block_kinds = [
+    "paragraph",
+    "heading",
+    "bulletList",
+    "orderedList",
+    "taskList",
+    "codeBlock",
+    "blockquote",
+    "panel",
+    "expand",
+    "table",
+    "rule",
+    "mediaSingle",
+    "mediaGroup",
+    "blockCard",
+]
+
+# the block kinds allowed inside blockquote, panel, expand and list items
+_nested_kinds = ["paragraph", "bulletList", "orderedList", "codeBlock"]
+
+
+@dataclasses.dataclass
+class GeneratorConfig:
+    """
+    The shape of the generated documents.
+
+    :param seed: the random seed.
+    :param n_block: the number of top level blocks of a document.
+    :param max_depth: the max nesting level of the container blocks, lists,
+        quotes, panels and expands, 1 means no nesting.
+    :param fan_out: the number of children of a container block, and of items
+        of a list.
+    :param n_inline: the number of inline nodes of a paragraph.
+    :param n_word: the max number of words of a text node.
+    :param mark_density: the probability that a text node has marks.
+    :param table_rows: the number of rows of a table, the header row included.
+    :param table_cols: the number of columns of a table.
+    """
+
+    seed: int = dataclasses.field(default=0)
+    n_block: int = dataclasses.field(default=50)
+    max_depth: int = dataclasses.field(default=3)
+    fan_out: int = dataclasses.field(default=3)
+    n_inline: int = dataclasses.field(default=6)
+    n_word: int = dataclasses.field(default=8)
+    mark_density: float = dataclasses.field(default=0.3)
+    table_rows: int = dataclasses.field(default=4)
+    table_cols: int = dataclasses.field(default=3)
+
+
+class DocGenerator:
+    """
+    Generate ADF documents from a :class:`GeneratorConfig`.
+
+    The top level blocks, the non text inline nodes and the marks are cycled
+    through all their kinds, the rest (the words, the nesting, the attributes)
+    is random.
+    """
+
+    def __init__(self, config: T.Optional[GeneratorConfig] = None):
+        self.config = config or GeneratorConfig()
+        self.random = random.Random(self.config.seed)
+        self._i_block = 0
+        self._i_inline = 0
+        self._i_mark = 0
+        self._i_id = 0
+
+    def _next_id(self) -> str:
+        self._i_id += 1
+        return f"{self._i_id:08x}"
+
+    def _make_words(self) -> str:
+        n = self.random.randint(1, self.config.n_word)
+        return " ".join(self.random.choices(_words, k=n))
+
+    def make_mark(self, type_: str) -> T_DATA:
+        if type_ == "link":
+            return {"type": "link", "attrs": {"href": "https://example.com/page"}}
+        elif type_ == "subsup":
+            return {
+                "type": "subsup",
+                "attrs": {"type": self.random.choice(["sub", "sup"])},
+            }
+        elif type_ == "textColor" or type_ == "backgroundColor":
+            return {"type": type_, "attrs": {"color": self.random.choice(_colors)}}
+        else:
+            return {"type": type_}
+
+    def make_marks(self) -> T.List[T_DATA]:
+        """
+        One or two marks, the code mark is only combined with a link.
+        """
+        first = _text_marks[self._i_mark % len(_text_marks)]
+        self._i_mark += 1
+        marks = [self.make_mark(first)]
+        if self.random.random() < 0.5:
+            second = self.random.choice(_text_marks)
+            if first == "code" or second == "code":
+                second = "link"
+            if second != first:
+                marks.append(self.make_mark(second))
+        return marks
+
+    def make_text(self) -> T_DATA:
+        dct = {"type": "text", "text": self._make_words() + " "}
+        if self.random.random() < self.config.mark_density:
+            dct["marks"] = self.make_marks()
+        return dct
+
+    def make_inline(self, type_: str) -> T_DATA:
+        if type_ == "mention":
+            name = self.random.choice(_words).title()
+            return {
+                "type": "mention",
+                "attrs": {"id": self._next_id(), "text": f"@{name}"},
+            }
+        elif type_ == "emoji":
+            short_name, text = self.random.choice(_emojis)
+            return {"type": "emoji", "attrs": {"shortName": short_name, "text": text}}
+        elif type_ == "date":
+            timestamp = self.random.randrange(0, 2_000_000_000) * 1000
+            return {"type": "date", "attrs": {"timestamp": str(timestamp)}}
+        elif type_ == "status":
+            return {
+                "type": "status",
+                "attrs": {
+                    "text": self.random.choice(_words).upper(),
+                    "color": self.random.choice(_status_colors),
+                },
+            }
+        elif type_ == "inlineCard":
+            return {
+                "type": "inlineCard",
+                "attrs": {"url": f"https://example.com/card/{self._next_id()}"},
+            }
+        else:
+            return {"type": type_}
+
+    def make_inlines(self) -> T.List[T_DATA]:
+        """
+        Text nodes, with a non text inline node at every other position.
+        """
+        content = list()
+        for i in range(self.config.n_inline):
+            if i % 2:
+                type_ = _inline_kinds[self._i_inline % len(_inline_kinds)]
+                self._i_inline += 1
+                content.append(self.make_inline(type_))
+            else:
+                content.append(self.make_text())
+        return content
+
+    def make_paragraph(self) -> T_DATA:
+        dct = {"type": "paragraph", "content": self.make_inlines()}
+        if self.random.random() < self.config.mark_density / 4:
+            dct["marks"] = [
+                {"type": "indentation", "attrs": {"level": self.random.randint(1, 3)}}
+            ]
+        return dct
+
+    def make_list(self, type_: str, depth: int) -> T_DATA:
+        items = list()
+        for _ in range(self.config.fan_out):
+            content = [self.make_paragraph()]
+            if depth < self.config.max_depth and self.random.random() < 0.5:
+                content.append(
+                    self.make_block(self.random.choice(_nested_kinds), depth + 1)
+                )
+            items.append({"type": "listItem", "content": content})
+        dct = {"type": type_, "content": items}
+        if type_ == "orderedList":
+            dct["attrs"] = {"order": 1}
+        return dct
+
+    def make_children(self, depth: int) -> T.List[T_DATA]:
+        if depth >= self.config.max_depth:
+            return [self.make_paragraph() for _ in range(self.config.fan_out)]
+        return [
+            self.make_block(self.random.choice(_nested_kinds), depth + 1)
+            for _ in range(self.config.fan_out)
+        ]
+
+    def make_table(self) -> T_DATA:
+        rows = list()
+        for i in range(self.config.table_rows):
+            tag = "tableHeader" if i == 0 else "tableCell"
+            cells = [
+                {
+                    "type": tag,
+                    "attrs": {"colspan": 1, "rowspan": 1},
+                    "content": [{"type": "paragraph", "content": [self.make_text()]}],
+                }
+                for _ in range(self.config.table_cols)
+            ]
+            rows.append({"type": "tableRow", "content": cells})
+        return {"type": "table", "content": rows}
+
+    def make_media(self) -> T_DATA:
+        return {
+            "type": "media",
+            "attrs": {
+                "type": "external",
+                "url": f"https://example.com/image/{self._next_id()}.png",
+                "alt": self.random.choice(_words),
+            },
+        }
+
+    def make_block(self, type_: str, depth: int = 1) -> T_DATA:
+        """
+        Make a block of the given type at the given nesting level.
+        """
+        if type_ == "paragraph":
+            return self.make_paragraph()
+        elif type_ == "heading":
+            return {
+                "type": "heading",
+                "attrs": {"level": self.random.randint(1, 6)},
+                "content": [self.make_text()],
+            }
+        elif type_ == "bulletList" or type_ == "orderedList":
+            return self.make_list(type_, depth)
+        elif type_ == "taskList":
+            items = [
+                {
+                    "type": "taskItem",
+                    "attrs": {
+                        "localId": self._next_id(),
+                        "state": self.random.choice(["TODO", "DONE"]),
+                    },
+                    "content": self.make_inlines(),
+                }
+                for _ in range(self.config.fan_out)
+            ]
+            return {
+                "type": "taskList",
+                "attrs": {"localId": self._next_id()},
+                "content": items,
+            }
+        elif type_ == "codeBlock":
+            lines = [self._make_words() for _ in range(self.config.fan_out)]
+            return {
+                "type": "codeBlock",
+                "attrs": {"language": self.random.choice(_languages)},
+                "content": [{"type": "text", "text": "\n".join(lines)}],
+            }
+        elif type_ == "blockquote":
+            return {"type": "blockquote", "content": self.make_children(depth)}
+        elif type_ == "panel":
+            return {
+                "type": "panel",
+                "attrs": {"panelType": self.random.choice(_panel_types)},
+                "content": self.make_children(depth),
+            }
+        elif type_ == "expand":
+            content = self.make_children(depth)
+            content.append(
+                {
+                    "type": "nestedExpand",
+                    "attrs": {"title": self._make_words()},
+                    "content": [self.make_paragraph()],
+                }
+            )
+            return {
+                "type": "expand",
+                "attrs": {"title": self._make_words()},
+                "content": content,
+            }
+        elif type_ == "table":
+            return self.make_table()
+        elif type_ == "rule":
+            return {"type": "rule"}
+        elif type_ == "mediaSingle":
+            return {
+                "type": "mediaSingle",
+                "attrs": {"layout": self.random.choice(_media_layouts)},
+                "content": [self.make_media()],
+            }
+        elif type_ == "mediaGroup":
+            return {
+                "type": "mediaGroup",
+                "content": [self.make_media() for _ in range(self.config.fan_out)],
+            }
+        elif type_ == "blockCard":
+            return {
+                "type": "blockCard",
+                "attrs": {"url": f"https://example.com/card/{self._next_id()}"},
+            }
+        else:  # pragma: no cover
+            raise ValueError(f"unknown block type {type_!r}")
+
+    def make_doc(self) -> T_DATA:
+        """
+        Make the next document.
+        """
+        content = list()
+        for _ in range(self.config.n_block):
+            type_ = _block_kinds[self._i_block % len(_block_kinds)]
+            self._i_block += 1
+            content.append(self.make_block(type_))
+        return {"type": "doc", "version": 1, "content": content}
+
+    def iter_docs(self, n_doc: int) -> T.Iterator[T_DATA]:
+        """
+        Lazily make ``n_doc`` documents.
+        """
+        for _ in range(n_doc):
+            yield self.make_doc()
+
+
+def write_jsonl(
+    path: str,
+    n_doc: int,
+    config: T.Optional[GeneratorConfig] = None,
+) -> int:
+    """
+    Write ``n_doc`` generated documents to a JSON lines file, one document
+    per line. The documents are written as they are made, so the memory use
+    does not depend on ``n_doc``.
+
+    :return: the number of bytes written.
+    """
+    n_byte = 0
+    with open(path, "wb") as f:
+        for data in DocGenerator(config).iter_docs(n_doc):
+            line = (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+            f.write(line)
+            n_byte += len(line)
+    return n_byte
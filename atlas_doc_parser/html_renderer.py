@@ -0,0 +1,460 @@
+# -*- coding: utf-8 -*-
+
+"""
+Render a parsed node tree to HTML directly, without going through markdown.
+
+All the node types and mark types of :mod:`atlas_doc_parser.model` are
+supported. Panels, status lozenges, task checkboxes, mentions and so on keep
+their structure as ``adf-*`` CSS classes, so they can be styled by the page.
+
+Example::
+
+    from atlas_doc_parser.api import NodeDoc, to_html, iter_html
+
+    doc = NodeDoc.from_dict(data)
+    html = to_html(doc)
+    # or one top level block at a time
+    for html in iter_html(doc):
+        ...
+"""
+
+import re
+import typing as T
+
+from .arg import NA
+from .model import T_NODE, T_MARK
+
+
+def _make_escape_table(mapping: T.Dict[str, str]) -> T.Tuple[str, ...]:
+    """
+    Build a ``str.translate`` table indexed by the ASCII code point. A tuple is
+    much faster than a dict, the non ASCII characters are left unchanged
+    because the lookup raises ``IndexError``.
+    """
+    table = [chr(i) for i in range(128)]
+    for char, repl in mapping.items():
+        table[ord(char)] = repl
+    return tuple(table)
+
+
+# precomputed escape tables for ``str.translate``
+_text_escape_table = _make_escape_table(
+    {
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+    }
+)
+_attr_escape_table = _make_escape_table(
+    {
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+        '"': "&quot;",
+        "'": "&#x27;",
+    }
+)
+
+
+def escape_text(text: str) -> str:
+    """
+    Escape a string for an HTML text node.
+    """
+    # most text has nothing to escape, the ``in`` checks are much cheaper
+    # than a translate
+    if "&" in text or "<" in text or ">" in text:
+        return text.translate(_text_escape_table)
+    return text
+
+
+def escape_attr(value: str) -> str:
+    """
+    Escape a string for a double-quoted HTML attribute value.
+    """
+    return value.translate(_attr_escape_table)
+
+
+_safe_url_schemes = {"http", "https", "mailto"}
+# the characters that browsers drop before reading the scheme, as the WHATWG
+# URL parser does: the tabs and newlines anywhere, the C0 controls and the
+# spaces at the start
+_url_removed_chars = str.maketrans("", "", "\t\n\r")
+_url_leading_chars = "".join([chr(i) for i in range(0x21)])
+# a scheme is what comes before the first ":", if it is before any "/?#"
+_url_scheme_pattern = re.compile(r"^([^:/?#]*):")
+
+
+def safe_url(url: str) -> str:
+    """
+    Return the url if it is relative or uses an allowed scheme (``http``,
+    ``https`` and ``mailto``), otherwise ``"#"``. The url is normalized the
+    way browsers do before the check, so ``"java\\tscript:"`` is blocked too.
+    """
+    url = url.translate(_url_removed_chars).lstrip(_url_leading_chars)
+    res = _url_scheme_pattern.match(url)
+    if res is not None and res.group(1).lower() not in _safe_url_schemes:
+        return "#"
+    return url
+
+
+_css_color_pattern = re.compile(r"^#?[a-zA-Z0-9]+$")
+
+
+def _get_attr(node: T.Union[T_NODE, T_MARK], name: str) -> T.Any:
+    """
+    Get an attribute value of the node or mark, None if not available.
+    """
+    attrs = node.__dict__.get("attrs")
+    if attrs is None or attrs.__class__ is NA:
+        return None
+    value = attrs.__dict__.get(name)
+    if value.__class__ is NA:
+        return None
+    return value
+
+
+def _mark_to_tags(mark: T_MARK) -> T.Tuple[str, str]:
+    """
+    Get the open tag and the close tag of a mark, both can be empty.
+    """
+    type_ = mark.type
+    if type_ == "strong":
+        return "<strong>", "</strong>"
+    elif type_ == "em":
+        return "<em>", "</em>"
+    elif type_ == "strike":
+        return "<s>", "</s>"
+    elif type_ == "underline":
+        return "<u>", "</u>"
+    elif type_ == "code":
+        return "<code>", "</code>"
+    elif type_ == "subsup":
+        tag = "sup" if _get_attr(mark, "type") == "sup" else "sub"
+        return f"<{tag}>", f"</{tag}>"
+    elif type_ == "link":
+        href = escape_attr(safe_url(_get_attr(mark, "href") or ""))
+        title = _get_attr(mark, "title")
+        if isinstance(title, str):
+            return f'<a href="{href}" title="{escape_attr(title)}">', "</a>"
+        return f'<a href="{href}">', "</a>"
+    elif type_ in ("textColor", "backgroundColor"):
+        color = _get_attr(mark, "color")
+        if isinstance(color, str) and _css_color_pattern.match(color):
+            prop = "color" if type_ == "textColor" else "background-color"
+            return f'<span style="{prop}: {color}">', "</span>"
+        return "", ""
+    else:  # indentation is a block mark, see _get_block_style
+        return "", ""
+
+
+def _get_block_style(node: T_NODE) -> str:
+    """
+    Get the style attribute of a paragraph or a heading from its block marks.
+    """
+    marks = node.__dict__.get("marks")
+    if marks.__class__ is list:
+        for mark in marks:
+            if mark.type == "indentation":
+                level = _get_attr(mark, "level")
+                if isinstance(level, int):
+                    return f' style="margin-left: {level * 2}em"'
+    return ""
+
+
+class HtmlRenderer:
+    """
+    Write the HTML of a node tree into a single list buffer.
+    Each ``_render_xyz`` method renders the node type ``xyz``.
+
+    :param ignore_error: skip the nodes that failed to render, the partial
+        output of the failed node is discarded.
+    """
+
+    def __init__(self, ignore_error: bool = False):
+        self.ignore_error = ignore_error
+        self.out: T.List[str] = list()
+        self.write = self.out.append
+        self.dispatch: T.Dict[str, T.Callable[[T_NODE], None]] = dict()
+        for name in dir(self):
+            if name.startswith("_render_"):
+                self.dispatch[name[len("_render_") :]] = getattr(self, name)
+
+    # --- helpers
+    def render(self, node: T_NODE):
+        try:
+            func = self.dispatch[node.type]
+        except KeyError:
+            raise NotImplementedError(
+                f"{node.__class__.__name__} has not implemented the html renderer"
+            )
+        func(node)
+
+    def render_content(self, node: T_NODE):
+        content = node.__dict__.get("content")
+        if content.__class__ is not list:
+            return
+        if self.ignore_error is False:
+            dispatch = self.dispatch
+            for child in content:
+                try:
+                    func = dispatch[child.type]
+                except KeyError:
+                    self.render(child)  # raise the error
+                func(child)
+            return
+        out = self.out
+        for child in content:
+            size = len(out)
+            try:
+                self.render(child)
+            except Exception:
+                del out[size:]
+
+    def getvalue(self) -> str:
+        return "".join(self.out)
+
+    def clear(self):
+        self.out.clear()
+
+    def _wrap(self, node: T_NODE, open_tag: str, close_tag: str):
+        self.write(open_tag)
+        self.render_content(node)
+        self.write(close_tag)
+
+    # --- blocks
+    def _render_doc(self, node: T_NODE):
+        self.render_content(node)
+
+    def _render_paragraph(self, node: T_NODE):
+        self._wrap(node, f"<p{_get_block_style(node)}>", "</p>")
+
+    def _render_heading(self, node: T_NODE):
+        level = _get_attr(node, "level")
+        if not (isinstance(level, int) and 1 <= level <= 6):
+            level = 1
+        local_id = _get_attr(node, "localId")
+        if isinstance(local_id, str) and local_id:
+            open_tag = (
+                f'<h{level} id="{escape_attr(local_id)}"{_get_block_style(node)}>'
+            )
+        else:
+            open_tag = f"<h{level}{_get_block_style(node)}>"
+        self._wrap(node, open_tag, f"</h{level}>")
+
+    def _render_blockquote(self, node: T_NODE):
+        self._wrap(node, "<blockquote>", "</blockquote>")
+
+    def _render_bulletList(self, node: T_NODE):
+        self._wrap(node, "<ul>", "</ul>")
+
+    def _render_orderedList(self, node: T_NODE):
+        order = _get_attr(node, "order")
+        if isinstance(order, int) and order != 1:
+            self._wrap(node, f'<ol start="{order}">', "</ol>")
+        else:
+            self._wrap(node, "<ol>", "</ol>")
+
+    def _render_listItem(self, node: T_NODE):
+        self._wrap(node, "<li>", "</li>")
+
+    def _render_codeBlock(self, node: T_NODE):
+        language = _get_attr(node, "language")
+        if isinstance(language, str) and language and language != "none":
+            self.write(f'<pre><code class="language-{escape_attr(language)}">')
+        else:
+            self.write("<pre><code>")
+        content = node.__dict__.get("content")
+        if content.__class__ is list:
+            for child in content:
+                text = child.__dict__.get("text")
+                if text.__class__ is str:
+                    self.write(escape_text(text))
+        self.write("</code></pre>")
+
+    def _render_rule(self, node: T_NODE):
+        self.write("<hr>")
+
+    def _render_panel(self, node: T_NODE):
+        panel_type = escape_attr(str(_get_attr(node, "panelType") or "info"))
+        self._wrap(
+            node,
+            f'<div class="adf-panel adf-panel-{panel_type}">',
+            "</div>",
+        )
+
+    def _render_expand(self, node: T_NODE):
+        title = _get_attr(node, "title")
+        self.write('<details class="adf-expand"><summary>')
+        if isinstance(title, str):
+            self.write(escape_text(title))
+        self.write("</summary>")
+        self.render_content(node)
+        self.write("</details>")
+
+    _render_nestedExpand = _render_expand
+
+    def _render_blockCard(self, node: T_NODE):
+        url = _get_attr(node, "url")
+        if isinstance(url, str):
+            self.write(
+                f'<div class="adf-block-card"><a href="{escape_attr(safe_url(url))}">'
+                f"{escape_text(url)}</a></div>"
+            )
+
+    def _render_mediaSingle(self, node: T_NODE):
+        self._wrap(node, '<figure class="adf-media-single">', "</figure>")
+
+    def _render_mediaGroup(self, node: T_NODE):
+        self._wrap(node, '<div class="adf-media-group">', "</div>")
+
+    def _render_media(self, node: T_NODE):
+        url = _get_attr(node, "url")
+        alt = _get_attr(node, "alt")
+        alt = alt if isinstance(alt, str) else ""
+        if isinstance(url, str):
+            html = f'<img src="{escape_attr(safe_url(url))}" alt="{escape_attr(alt)}">'
+        else:
+            # the media lives in the Atlassian media store, we only know its id
+            media_id = escape_attr(str(_get_attr(node, "id") or ""))
+            collection = escape_attr(str(_get_attr(node, "collection") or ""))
+            html = (
+                f'<span class="adf-media" data-id="{media_id}" '
+                f'data-collection="{collection}">{escape_text(alt)}</span>'
+            )
+        marks = node.__dict__.get("marks")
+        if marks.__class__ is list:
+            for mark in marks:
+                open_tag, close_tag = _mark_to_tags(mark)
+                html = open_tag + html + close_tag
+        self.write(html)
+
+    def _render_table(self, node: T_NODE):
+        self._wrap(node, "<table><tbody>", "</tbody></table>")
+
+    def _render_tableRow(self, node: T_NODE):
+        self._wrap(node, "<tr>", "</tr>")
+
+    def _render_cell(self, node: T_NODE, tag: str):
+        span = list()
+        for name in ("colspan", "rowspan"):
+            value = _get_attr(node, name)
+            if value is not None and str(value).isdigit() and int(value) > 1:
+                span.append(f' {name}="{value}"')
+        self._wrap(node, f"<{tag}{''.join(span)}>", f"</{tag}>")
+
+    def _render_tableCell(self, node: T_NODE):
+        self._render_cell(node, "td")
+
+    def _render_tableHeader(self, node: T_NODE):
+        self._render_cell(node, "th")
+
+    def _render_taskList(self, node: T_NODE):
+        self.write('<ul class="adf-task-list">')
+        content = node.__dict__.get("content")
+        if content.__class__ is list:
+            for child in content:
+                if child.type == "taskList":
+                    # a nested task list must be in a list item to be valid html
+                    self.write("<li>")
+                    self._render_taskList(child)
+                    self.write("</li>")
+                else:
+                    self.render(child)
+        self.write("</ul>")
+
+    def _render_taskItem(self, node: T_NODE):
+        if _get_attr(node, "state") == "DONE":
+            self.write(
+                '<li class="adf-task-item"><input type="checkbox" disabled checked> '
+            )
+        else:
+            self.write('<li class="adf-task-item"><input type="checkbox" disabled> ')
+        self.render_content(node)
+        self.write("</li>")
+
+    # --- inline
+    def _render_text(self, node: T_NODE):
+        text = escape_text(node.text)
+        marks = node.__dict__.get("marks")
+        if marks.__class__ is list and marks:
+            closes = list()
+            for mark in marks:
+                open_tag, close_tag = _mark_to_tags(mark)
+                self.write(open_tag)
+                closes.append(close_tag)
+            self.write(text)
+            self.write("".join(reversed(closes)))
+        else:
+            self.write(text)
+
+    def _render_hardBreak(self, node: T_NODE):
+        self.write("<br>")
+
+    def _render_mention(self, node: T_NODE):
+        mention_id = escape_attr(str(_get_attr(node, "id") or ""))
+        text = _get_attr(node, "text")
+        text = escape_text(text) if isinstance(text, str) else ""
+        self.write(f'<span class="adf-mention" data-id="{mention_id}">{text}</span>')
+
+    def _render_emoji(self, node: T_NODE):
+        text = _get_attr(node, "text") or _get_attr(node, "shortName") or ""
+        self.write(f'<span class="adf-emoji">{escape_text(text)}</span>')
+
+    def _render_status(self, node: T_NODE):
+        color = escape_attr(str(_get_attr(node, "color") or "neutral"))
+        text = escape_text(str(_get_attr(node, "text") or ""))
+        self.write(f'<span class="adf-status adf-status-{color}">{text}</span>')
+
+    def _render_date(self, node: T_NODE):
+        date = node.to_markdown()
+        self.write(f'<time datetime="{date}">{date}</time>')
+
+    def _render_inlineCard(self, node: T_NODE):
+        url = _get_attr(node, "url")
+        if isinstance(url, str):
+            self.write(
+                f'<a class="adf-inline-card" href="{escape_attr(safe_url(url))}">'
+                f"{escape_text(url)}</a>"
+            )
+
+
+def to_html(
+    node: T_NODE,
+    ignore_error: bool = False,
+) -> str:
+    """
+    Render the node, usually a ``NodeDoc``, to HTML.
+
+    :param ignore_error: skip the nodes that failed to render.
+    """
+    renderer = HtmlRenderer(ignore_error=ignore_error)
+    renderer.render(node)
+    return renderer.getvalue()
+
+
+def iter_html(
+    node: T_NODE,
+    ignore_error: bool = False,
+) -> T.Iterator[str]:
+    """
+    Yield the HTML of each top level block of a ``NodeDoc``, or the HTML of
+    the node itself for the other node types. The buffer is reused, so memory
+    doesn't grow with the doc.
+
+    :param ignore_error: skip the blocks that failed to render.
+    """
+    renderer = HtmlRenderer(ignore_error=ignore_error)
+    if node.type == "doc":
+        content = node.content
+    else:
+        content = [node]
+    for child in content:
+        try:
+            renderer.render(child)
+        except Exception as e:
+            renderer.clear()
+            if ignore_error:
+                continue
+            raise e
+        yield renderer.getvalue()
+        renderer.clear()
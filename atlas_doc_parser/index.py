@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+"""
+Type index and ``localId`` index of a :class:`~atlas_doc_parser.model.NodeDoc`.
+
+The index can be built in the same pass as parsing::
+
+    doc = NodeDoc.from_dict(data, build_index=True)
+    headings = doc.get_nodes_by_type(TypeEnum.heading)
+    node = doc.get_node_by_local_id("abc")
+    path = doc.get_node_path(node)  # JSON Pointer, e.g. "/content/3/content/0"
+
+Or lazily on the first lookup. See :class:`NodeIndex` for how mutation
+is handled.
+"""
+
+import typing as T
+
+from .arg import NA
+from .type_enum import TypeEnum
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .model import T_NODE
+
+
+def _get_local_id(node: "T_NODE") -> T.Optional[str]:
+    attrs = node.__dict__.get("attrs")
+    if attrs is None or attrs.__class__ is NA:
+        return None
+    local_id = attrs.__dict__.get("localId")
+    if isinstance(local_id, str):
+        return local_id
+    return None
+
+
+class NodeIndex:
+    """
+    Index from node type to nodes and from ``localId`` to node, plus the
+    parent of every node so that the path of a node can be computed in
+    ``O(depth)``.
+
+    **Mutation**
+
+    The index does not track changes to the tree, call
+    :meth:`~atlas_doc_parser.model.NodeDoc.invalidate_index` after any
+    mutation, it is rebuilt on the next lookup.
+
+    As a safety net, lookups verify that the returned nodes are still
+    attached to the tree at the recorded position and still carry the
+    requested ``localId``, and rebuild the index if not. This only catches
+    the nodes the index already knows. A node that is added, or that
+    replaces another one, and a ``localId`` changed to a new value, are
+    not found until the index is invalidated.
+    """
+
+    def __init__(self):
+        self.root: T.Optional["T_NODE"] = None
+        self.is_valid: bool = False
+        self._seq: int = 0
+        self._by_type: T.Dict[str, T.List[T.Tuple[int, "T_NODE"]]] = dict()
+        self._unsorted_types: T.Set[str] = set()
+        self._by_local_id: T.Dict[str, T.Tuple[int, "T_NODE"]] = dict()
+        # id(node) -> (parent, index of the node in parent.content)
+        self._parent: T.Dict[int, T.Tuple["T_NODE", int]] = dict()
+        self._has_error: bool = False
+
+    def __reduce__(self):
+        # node ids are meaningless in another process, the index is rebuilt
+        # lazily after unpickling
+        return (NodeIndex, ())
+
+    # --- used by the parser
+    def _next_seq(self) -> int:
+        """
+        Reserve a document order sequence number for a node before its
+        children are parsed.
+        """
+        seq = self._seq
+        self._seq += 1
+        return seq
+
+    def _add(self, node: "T_NODE", seq: int):
+        try:
+            self._by_type[node.type].append((seq, node))
+        except KeyError:
+            self._by_type[node.type] = [(seq, node)]
+        self._unsorted_types.add(node.type)
+        local_id = _get_local_id(node)
+        if local_id is not None:
+            existing = self._by_local_id.get(local_id)
+            if existing is None or existing[0] > seq:
+                self._by_local_id[local_id] = (seq, node)
+        content = node.__dict__.get("content")
+        if isinstance(content, list):
+            parent = self._parent
+            for ind, child in enumerate(content):
+                parent[id(child)] = (node, ind)
+
+    def _finish(self, root: "T_NODE"):
+        self.root = root
+        self.is_valid = not self._has_error
+
+    # --- public API
+    def build(self, root: "T_NODE") -> "NodeIndex":
+        """
+        (Re)build the index from an already parsed tree.
+        """
+        self.__init__()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            self._add(node, self._next_seq())
+            content = node.__dict__.get("content")
+            if isinstance(content, list):
+                stack.extend(reversed(content))
+        self._unsorted_types.clear()
+        self._finish(root)
+        return self
+
+    def invalidate(self):
+        self.is_valid = False
+
+    def is_attached(self, node: "T_NODE") -> bool:
+        """
+        Check if the node is still at the recorded position in the tree.
+        """
+        root = self.root
+        while node is not root:
+            try:
+                parent, ind = self._parent[id(node)]
+                if parent.content[ind] is not node:
+                    return False
+            except (KeyError, IndexError, AttributeError, TypeError):
+                return False
+            node = parent
+        return True
+
+    def get_nodes_by_type(
+        self,
+        type_: T.Union[str, TypeEnum],
+    ) -> T.List["T_NODE"]:
+        """
+        Get all the nodes of the given type in document order, ``O(k)``.
+        """
+        if isinstance(type_, TypeEnum):
+            type_ = type_.value
+        lst = self._by_type.get(type_)
+        if lst is None:
+            return []
+        if type_ in self._unsorted_types:
+            lst.sort(key=lambda x: x[0])
+            self._unsorted_types.discard(type_)
+        return [node for _, node in lst]
+
+    def get_node_by_local_id(self, local_id: str) -> T.Optional["T_NODE"]:
+        try:
+            return self._by_local_id[local_id][1]
+        except KeyError:
+            return None
+
+    def get_parent(
+        self,
+        node: "T_NODE",
+    ) -> T.Tuple[T.Optional["T_NODE"], T.Optional[int]]:
+        """
+        Get the parent of the node and the index of the node in ``parent.content``.
+        """
+        try:
+            return self._parent[id(node)]
+        except KeyError:
+            return None, None
+
+    def get_path(self, node: "T_NODE") -> T.Optional[str]:
+        """
+        Get the JSON Pointer of the node, ``O(depth)``. Return None if the
+        node is not in the tree.
+        """
+        parts = list()
+        root = self.root
+        while node is not root:
+            try:
+                parent, ind = self._parent[id(node)]
+            except KeyError:
+                return None
+            parts.append(f"/content/{ind}")
+            node = parent
+        return "".join(reversed(parts))
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""
+Resource limits that guard against pathological documents, for example a
+huge depth, millions of text nodes or a multi-MB single text.
+
+Example::
+
+    from atlas_doc_parser.api import NodeDoc, Limits, LimitExceededError
+
+    limits = Limits(max_depth=50, max_node=100_000)
+    try:
+        doc = NodeDoc.from_dict(data, limits=limits)
+        md = doc.to_markdown(limits=limits)
+    except LimitExceededError as e:
+        print(f"skip the document: {e}")
+
+With ``ignore_error=True`` the document is truncated to the limits instead.
+"""
+
+import typing as T
+import dataclasses
+
+from .base import T_DATA
+from .exc import LimitExceededError
+
+
+@dataclasses.dataclass
+class Limits:
+    """
+    The limits of a document, None means no limit.
+
+    :param max_depth: the max depth of the tree, the root is at depth 1.
+    :param max_node: the max number of nodes, the root included.
+    :param max_text_bytes: the max total utf-8 size of the text nodes.
+    :param max_output_size: the max number of characters of the rendered output.
+    """
+
+    max_depth: T.Optional[int] = dataclasses.field(default=100)
+    max_node: T.Optional[int] = dataclasses.field(default=1_000_000)
+    max_text_bytes: T.Optional[int] = dataclasses.field(default=64 * 1024 * 1024)
+    max_output_size: T.Optional[int] = dataclasses.field(default=256 * 1024 * 1024)
+
+    def check_data(
+        self,
+        data: T_DATA,
+        truncate: bool = False,
+    ) -> T_DATA:
+        """
+        Check the raw ADF data in one iterative pass, before it is parsed.
+        The pass stops at the first violation, so a hostile payload costs
+        at most ``max_node`` steps.
+
+        :param truncate: if False, raise :class:`LimitExceededError` on the
+            first violation. If True, return a copy of the data without the
+            nodes that are too deep or beyond ``max_node``, the text beyond
+            ``max_text_bytes`` is cut.
+
+        :return: the data itself if ``truncate`` is False, otherwise the
+            truncated copy.
+        """
+        max_depth = self.max_depth
+        max_node = self.max_node
+        max_text_bytes = self.max_text_bytes
+        n_node = 0
+        text_bytes = 0
+
+        root = data
+        # (node, depth, the content list of the parent's copy), the nodes are
+        # visited in document order, so the truncated copy keeps a prefix
+        stack = [(data, 1, None)]
+        while stack:
+            dct, depth, parent_content = stack.pop()
+            n_node += 1
+            if max_node is not None and n_node > max_node:
+                if truncate:
+                    break
+                raise LimitExceededError("max_node", max_node, n_node)
+            if truncate:
+                dct = dict(dct)
+                if parent_content is None:
+                    root = dct
+                else:
+                    parent_content.append(dct)
+
+            text = dct.get("text")
+            if max_text_bytes is not None and isinstance(text, str):
+                size = len(text) if text.isascii() else len(text.encode("utf-8"))
+                if text_bytes + size > max_text_bytes:
+                    if not truncate:
+                        raise LimitExceededError(
+                            "max_text_bytes", max_text_bytes, text_bytes + size
+                        )
+                    size = max_text_bytes - text_bytes
+                    dct["text"] = text.encode("utf-8")[:size].decode(
+                        "utf-8", errors="ignore"
+                    )
+                text_bytes += size
+
+            content = dct.get("content")
+            if content.__class__ is list and content:
+                if max_depth is not None and depth >= max_depth:
+                    if not truncate:
+                        raise LimitExceededError("max_depth", max_depth, depth + 1)
+                    dct["content"] = []
+                    continue
+                if max_node is not None and n_node + len(content) > max_node:
+                    # fail before the children are pushed, a node can have
+                    # millions of children
+                    if not truncate:
+                        raise LimitExceededError(
+                            "max_node", max_node, n_node + len(content)
+                        )
+                    content = content[: max_node - n_node]
+                new_content = None
+                if truncate:
+                    new_content = list()
+                    dct["content"] = new_content
+                depth += 1
+                # a child that is not a dict is left to the parser, it raises
+                # or drops it with ignore_error=True, the copy drops it
+                stack.extend(
+                    [
+                        (child, depth, new_content)
+                        for child in reversed(content)
+                        if isinstance(child, dict)
+                    ]
+                )
+        return root
+
+    def check_output(
+        self,
+        md: str,
+        truncate: bool = False,
+    ) -> str:
+        """
+        Check the size of a rendered output.
+
+        :param truncate: if False, raise :class:`LimitExceededError`,
+            otherwise cut the output to ``max_output_size``.
+        """
+        max_output_size = self.max_output_size
+        if max_output_size is not None and len(md) > max_output_size:
+            if truncate:
+                return md[:max_output_size]
+            raise LimitExceededError("max_output_size", max_output_size, len(md))
+        return md
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+
+"""
+Memory accounting of parsed documents, to size the workers.
+
+For each ``Node*``, ``Mark*`` and ``*Attrs`` class, the report has the
+number of instances, the shallow size (the object and its ``__dict__``) and
+the deep size (plus the strings, lists and dicts it owns, the other model
+objects excluded), and the peak ``tracemalloc`` usage of ``from_dict`` and
+``to_markdown``. The size of the raw data and of the
+:class:`~atlas_doc_parser.arena.Arena` of the same documents are reported
+too, to compare the object model with the array-backed one.
+
+Example::
+
+    from atlas_doc_parser.api import get_memory_report
+
+    report = get_memory_report(corpus)  # an iterable of ADF doc data
+    print(report.to_table(limit=10))
+
+Or from the command line, with a JSON file of a doc or a JSON lines file of
+docs::
+
+    python -m atlas_doc_parser memory corpus.jsonl
+"""
+
+import typing as T
+import sys
+import json
+import tracemalloc
+import dataclasses
+
+from .arg import NA
+from .base import Base, T_DATA
+from .model import T_NODE, NodeDoc
+from .arena import Arena
+
+
+@dataclasses.dataclass
+class ClassMemory:
+    """
+    The memory used by the instances of one class.
+
+    :param name: the class name.
+    :param n_instance: the number of instances.
+    :param shallow_size: the bytes of the instances and their ``__dict__``.
+    :param deep_size: the shallow size plus the bytes of the strings, lists,
+        dicts ... that the instances own, the other model objects and the
+        shared ``NA`` sentinel excluded, each object is counted once.
+    """
+
+    name: str = dataclasses.field()
+    n_instance: int = dataclasses.field(default=0)
+    shallow_size: int = dataclasses.field(default=0)
+    deep_size: int = dataclasses.field(default=0)
+
+    def merge(self, other: "ClassMemory"):
+        self.n_instance += other.n_instance
+        self.shallow_size += other.shallow_size
+        self.deep_size += other.deep_size
+
+
+def _get_size(
+    obj: T.Any,
+    seen: T.Set[int],
+    bases: T.Optional[T.List[Base]] = None,
+) -> int:
+    """
+    Get the deep size of an object that is not seen yet. If ``bases`` is
+    given, the model objects are not followed but appended to it.
+    """
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or obj.__class__ is NA:
+            continue
+        if bases is not None and isinstance(obj, Base):
+            bases.append(obj)
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(obj.__dict__)
+    return size
+
+
+def get_tree_memory(
+    node: T_NODE,
+    seen: T.Optional[T.Set[int]] = None,
+) -> T.Dict[str, ClassMemory]:
+    """
+    Get the memory used by a parsed tree, per class.
+
+    :param seen: the ids of the objects that are already counted, to share
+        between documents.
+    """
+    if seen is None:
+        seen = set()
+    classes: T.Dict[str, ClassMemory] = dict()
+    bases = [node]
+    while bases:
+        obj = bases.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        name = obj.__class__.__name__
+        try:
+            memory = classes[name]
+        except KeyError:
+            memory = classes[name] = ClassMemory(name=name)
+        dct = obj.__dict__
+        shallow_size = sys.getsizeof(obj) + sys.getsizeof(dct)
+        seen.add(id(dct))
+        deep_size = shallow_size
+        for value in dct.values():
+            deep_size += _get_size(value, seen, bases)
+        memory.n_instance += 1
+        memory.shallow_size += shallow_size
+        memory.deep_size += deep_size
+    return classes
+
+
+def _measure_peak(func: T.Callable) -> T.Tuple[T.Any, int]:
+    """
+    :return: the result of ``func()``, and the peak bytes allocated during
+        the call, above the memory in use before the call.
+    """
+    is_tracing = tracemalloc.is_tracing()
+    if is_tracing is False:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if is_tracing is False:
+            tracemalloc.stop()
+    return result, peak - current
+
+
+@dataclasses.dataclass
+class MemoryReport:
+    """
+    The memory report of a corpus.
+
+    :param n_doc: the number of documents.
+    :param classes: the class name to :class:`ClassMemory`, all documents.
+    :param tree_size: the deep size of all the parsed trees.
+    :param max_tree_size: the deep size of the largest parsed tree.
+    :param data_size: the deep size of the raw ADF data.
+    :param arena_size: the deep size of the :class:`~atlas_doc_parser.arena.Arena`
+        of the documents, 0 if not measured.
+    :param parse_peak: the max peak bytes of ``from_dict`` of one document.
+    :param render_peak: the max peak bytes of ``to_markdown`` of one document.
+    """
+
+    n_doc: int = dataclasses.field(default=0)
+    classes: T.Dict[str, ClassMemory] = dataclasses.field(default_factory=dict)
+    tree_size: int = dataclasses.field(default=0)
+    max_tree_size: int = dataclasses.field(default=0)
+    data_size: int = dataclasses.field(default=0)
+    arena_size: int = dataclasses.field(default=0)
+    parse_peak: int = dataclasses.field(default=0)
+    render_peak: int = dataclasses.field(default=0)
+
+    def get_top(self, n: T.Optional[int] = None) -> T.List[ClassMemory]:
+        """
+        Get the classes that use the most memory, by deep size.
+        """
+        classes = sorted(self.classes.values(), key=lambda c: c.deep_size, reverse=True)
+        return classes[:n]
+
+    def to_dict(self) -> T.Dict[str, T.Any]:
+        dct = dataclasses.asdict(self)
+        dct["classes"] = [dataclasses.asdict(c) for c in self.get_top()]
+        return dct
+
+    def to_json(self, indent: int = 4) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_table(self, limit: T.Optional[int] = None) -> str:
+        """
+        Format the report as text, the summary then the classes that use the
+        most memory first.
+
+        :param limit: the max number of classes.
+        """
+        kib = 1024
+        total = self.tree_size or 1
+        lines = [
+            f"documents       : {self.n_doc}",
+            f"parsed trees    : {self.tree_size / kib:.1f} KiB"
+            f" (largest {self.max_tree_size / kib:.1f} KiB)",
+            f"raw data        : {self.data_size / kib:.1f} KiB",
+        ]
+        if self.arena_size:
+            lines.append(f"arena           : {self.arena_size / kib:.1f} KiB")
+        lines.extend(
+            [
+                f"from_dict peak  : {self.parse_peak / kib:.1f} KiB",
+                f"to_markdown peak: {self.render_peak / kib:.1f} KiB",
+                "",
+                f"{'class':<28} {'instances':>10} {'shallow KiB':>12} "
+                f"{'deep KiB':>10} {'share':>7} {'B/inst':>7}",
+            ]
+        )
+        for c in self.get_top(limit):
+            lines.append(
+                f"{c.name:<28} {c.n_instance:>10} {c.shallow_size / kib:>12.1f} "
+                f"{c.deep_size / kib:>10.1f} {c.deep_size / total * 100:>6.1f}% "
+                f"{c.deep_size // max(c.n_instance, 1):>7}"
+            )
+        return "\n".join(lines)
+
+
+def get_memory_report(
+    items: T.Union[T_DATA, T.Iterable[T_DATA]],
+    measure_peak: bool = True,
+    measure_arena: bool = True,
+    ignore_error: bool = False,
+) -> MemoryReport:
+    """
+    Parse and render the documents one by one and account for their memory.
+    Only one document is held at a time, so a large corpus can be streamed.
+
+    :param items: the ADF data of a doc, or an iterable of them.
+    :param measure_peak: measure the peaks with ``tracemalloc``, it makes
+        the parsing several times slower.
+    :param measure_arena: measure the size of the ``Arena`` too.
+    """
+    if isinstance(items, dict):
+        items = [items]
+    report = MemoryReport()
+    for data in items:
+        if measure_peak:
+            doc, parse_peak = _measure_peak(
+                lambda: NodeDoc.from_dict(data, ignore_error=ignore_error)
+            )
+            _, render_peak = _measure_peak(
+                lambda: doc.to_markdown(ignore_error=ignore_error)
+            )
+            report.parse_peak = max(report.parse_peak, parse_peak)
+            report.render_peak = max(report.render_peak, render_peak)
+        else:
+            doc = NodeDoc.from_dict(data, ignore_error=ignore_error)
+
+        classes = get_tree_memory(doc)
+        tree_size = 0
+        for name, memory in classes.items():
+            tree_size += memory.deep_size
+            try:
+                report.classes[name].merge(memory)
+            except KeyError:
+                report.classes[name] = memory
+        report.n_doc += 1
+        report.tree_size += tree_size
+        report.max_tree_size = max(report.max_tree_size, tree_size)
+        report.data_size += _get_size(data, set())
+        if measure_arena:
+            report.arena_size += _get_size(Arena.from_dict(data), set())
+    return report
@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+
+"""
+Counters and histograms of a long-running converter, in the Prometheus text
+format.
+
+:class:`MetricsHook` is a tracing hook (see :mod:`atlas_doc_parser.tracing`)
+that turns the spans and the swallowed node errors into metrics:
+
+- ``atlas_doc_documents_converted_total``: the documents rendered to markdown.
+- ``atlas_doc_input_bytes_total`` and ``atlas_doc_output_bytes_total``: the
+  utf-8 size of the JSON lines read and written by
+  :func:`~atlas_doc_parser.batch.convert_jsonl`.
+- ``atlas_doc_output_chars_total``: the characters of the rendered markdown.
+- ``atlas_doc_node_errors_total{stage, node_type}``: the node errors that
+  ``ignore_error=True`` swallows in the ``parse`` and ``render`` stages.
+- ``atlas_doc_errors_total{stage}``: the stages that failed with an error.
+- ``atlas_doc_stage_duration_seconds{stage}``: the latency histogram of
+  ``parse``, ``render``, ``resolve`` and ``convert``.
+
+Example::
+
+    from atlas_doc_parser.api import MetricsHook, add_trace_hook, start_metrics_server
+
+    hook = add_trace_hook(MetricsHook())
+    print(hook.to_prometheus())  # from a function call
+    server = start_metrics_server(hook, port=9464)  # or GET /metrics
+    ...
+    server.shutdown()
+
+Each thread updates its own shard of a metric, without a lock, the shards
+are only summed when the metrics are exported.
+"""
+
+import typing as T
+import time
+import bisect
+import threading
+
+from .tracing import BaseTraceHook, T_ATTRS
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    import http.server
+
+T_LABELS = T.Tuple[str, ...]
+
+# the latency buckets in seconds, from 100 us to 10 s
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_value(value: T.Union[int, float]) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value.__class__ is int:
+        return str(value)
+    return repr(float(value))
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape(value: str) -> str:
+    return _escape_help(value).replace('"', '\\"')
+
+
+def _format_labels(
+    names: T.Sequence[str],
+    values: T.Sequence[str],
+) -> str:
+    if not names:
+        return ""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}"
+
+
+class BaseMetric:
+    """
+    A metric with per thread shards. A shard is only written by its own
+    thread, and it is registered once per thread, under a lock.
+
+    :param name: the metric name.
+    :param documentation: the ``# HELP`` text.
+    :param label_names: the label names, the label values are given as a
+        tuple in the same order.
+    """
+
+    type: str = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: T.Sequence[str] = (),
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._local = threading.local()
+        self._shards: T.List[dict] = list()
+        self._lock = threading.Lock()
+
+    def _get_shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = dict()
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def _iter_shard_items(self) -> T.Iterable[T.Tuple[T_LABELS, T.Any]]:
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # list() copies the items in one step, the owner thread may add
+            # a key at any time
+            yield from list(shard.items())
+
+    def to_prometheus(self) -> str:
+        raise NotImplementedError
+
+
+class Counter(BaseMetric):
+    """
+    A monotonic counter::
+
+        counter = Counter("n_error_total", "errors", label_names=("stage",))
+        counter.inc(labels=("parse",))
+    """
+
+    type = "counter"
+
+    def inc(self, amount: T.Union[int, float] = 1, labels: T_LABELS = ()):
+        shard = self._get_shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def collect(self) -> T.Dict[T_LABELS, T.Union[int, float]]:
+        """
+        Sum the shards, label values to total.
+        """
+        values = dict()
+        for labels, value in self._iter_shard_items():
+            values[labels] = values.get(labels, 0) + value
+        return values
+
+    def get(self, labels: T_LABELS = ()) -> T.Union[int, float]:
+        return self.collect().get(labels, 0)
+
+    def to_prometheus(self) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for labels, value in sorted(self.collect().items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.label_names, labels)} "
+                f"{_format_value(value)}"
+            )
+        return "\n".join(lines)
+
+
+class Histogram(BaseMetric):
+    """
+    A histogram of observed values, with cumulative buckets in the output.
+
+    :param buckets: the sorted upper bounds of the buckets, ``+Inf`` is
+        always added.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: T.Sequence[str] = (),
+        buckets: T.Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: T_LABELS = ()):
+        shard = self._get_shard()
+        try:
+            state = shard[labels]
+        except KeyError:
+            # the count per bucket (not cumulative), the sum, the count
+            state = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        # a value equal to an upper bound belongs to that bucket
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def collect(self) -> T.Dict[T_LABELS, T.Tuple[T.List[int], float, int]]:
+        """
+        Sum the shards, label values to the cumulative bucket counts (the
+        last one is ``+Inf``), the sum and the count.
+        """
+        values = dict()
+        for labels, (counts, sum_, count) in self._iter_shard_items():
+            try:
+                total = values[labels]
+            except KeyError:
+                total = values[labels] = [[0] * len(counts), 0.0, 0]
+            for i, n in enumerate(counts):
+                total[0][i] += n
+            total[1] += sum_
+            total[2] += count
+        results = dict()
+        for labels, (counts, sum_, count) in values.items():
+            cumulative = list()
+            n = 0
+            for c in counts:
+                n += c
+                cumulative.append(n)
+            results[labels] = (cumulative, sum_, count)
+        return results
+
+    def to_prometheus(self) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        label_names = self.label_names + ("le",)
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        for labels, (counts, sum_, count) in sorted(self.collect().items()):
+            for bound, n in zip(bounds, counts):
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_format_labels(label_names, labels + (bound,))} {n}"
+                )
+            suffix = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(sum_)}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return "\n".join(lines)
+
+
+# the spans with a latency histogram
+_timed_stages = ("parse", "render", "resolve", "convert")
+
+
+class MetricsHook(BaseTraceHook):
+    """
+    A tracing hook that keeps the built-in conversion metrics, register it
+    with :func:`~atlas_doc_parser.tracing.add_trace_hook`.
+
+    :param prefix: the prefix of the metric names.
+    :param buckets: the latency buckets in seconds.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "atlas_doc",
+        buckets: T.Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.documents_converted = Counter(
+            f"{prefix}_documents_converted_total",
+            "The documents rendered to markdown.",
+        )
+        self.input_bytes = Counter(
+            f"{prefix}_input_bytes_total",
+            "The size of the JSON lines read.",
+        )
+        self.output_bytes = Counter(
+            f"{prefix}_output_bytes_total",
+            "The size of the JSON lines written.",
+        )
+        self.output_chars = Counter(
+            f"{prefix}_output_chars_total",
+            "The characters of the rendered markdown.",
+        )
+        self.node_errors = Counter(
+            f"{prefix}_node_errors_total",
+            "The node errors ignored because of ignore_error.",
+            label_names=("stage", "node_type"),
+        )
+        self.errors = Counter(
+            f"{prefix}_errors_total",
+            "The stages that failed with an error.",
+            label_names=("stage",),
+        )
+        self.stage_duration = Histogram(
+            f"{prefix}_stage_duration_seconds",
+            "The duration of the conversion stages of a document.",
+            label_names=("stage",),
+            buckets=buckets,
+        )
+        self.metrics: T.List[BaseMetric] = [
+            self.documents_converted,
+            self.input_bytes,
+            self.output_bytes,
+            self.output_chars,
+            self.node_errors,
+            self.errors,
+            self.stage_duration,
+        ]
+
+    def start_span(self, name: str, attrs: T_ATTRS) -> float:
+        return time.perf_counter()
+
+    def end_span(
+        self,
+        handle: float,
+        name: str,
+        attrs: T_ATTRS,
+        error: T.Optional[BaseException],
+    ):
+        if name in _timed_stages:
+            self.stage_duration.observe(time.perf_counter() - handle, (name,))
+        if error is not None:
+            self.errors.inc(labels=(name,))
+            return
+        if name == "convert":
+            # a document error that ignore_error turned into an error line
+            if attrs.get("n_error"):
+                self.errors.inc(labels=(name,))
+        elif name == "render":
+            self.documents_converted.inc()
+            self.output_chars.inc(attrs.get("n_char", 0))
+        elif name == "decode":
+            self.input_bytes.inc(attrs.get("n_byte", 0))
+        elif name == "write":
+            self.output_bytes.inc(attrs.get("n_byte", 0))
+
+    def on_error(
+        self,
+        stage: str,
+        node_type: T.Optional[str],
+        error: BaseException,
+    ):
+        self.node_errors.inc(labels=(stage, node_type or "unknown"))
+
+    def to_prometheus(self) -> str:
+        """
+        Export the metrics in the Prometheus text format.
+        """
+        return "\n".join([metric.to_prometheus() for metric in self.metrics]) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def start_metrics_server(
+    hook: MetricsHook,
+    port: int = 9464,
+    addr: str = "127.0.0.1",
+) -> "http.server.ThreadingHTTPServer":
+    """
+    Serve ``GET /metrics`` from a daemon thread, call ``shutdown()`` on the
+    returned server to stop it.
+
+    :param port: the port, 0 for any free port, see ``server.server_port``.
+    :param addr: the address to bind, local only by default.
+    """
+    # imported on first use, it is the largest import of the module
+    import http.server
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = hook.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer((addr, port), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -6,14 +6,19 @@ Data model for Atlassian Document Format (ADF).
 
 import typing as T
 import copy
-import textwrap
+import time
 import dataclasses
-from datetime import datetime
 
 from .constants import TAB
 from .arg import REQ, NA, rm_na
 from .type_enum import TypeEnum
 from .base import Base, T_DATA, T_DATA_LIKE
+from .exc import LimitExceededError
+from .index import NodeIndex
+from .limits import Limits
+from .resolve import get_resolved
+from .tracing import _hooks, Span, report_error
+from .slowlog import _slow_logs, report_slow
 
 
 @dataclasses.dataclass
@@ -149,10 +154,7 @@ class MarkIndentation(BaseMark):
     attrs: MarkIndentationAttrs = dataclasses.field(default_factory=REQ)
 
     def to_markdown(self, text: str) -> str:
-        return textwrap.indent(
-            text=text,
-            prefix=TAB * self.attrs.level,
-        )
+        return _indent(text, TAB * self.attrs.level)
 
 
 _mark_type_to_class_mapping = {
@@ -189,14 +191,21 @@ class BaseNode(Base):
         cls: T.Type["T_NODE"],
         dct: T_DATA,
         ignore_error: bool = False,
+        _index: T.Optional["NodeIndex"] = None,
     ) -> "T_NODE":
         # print(f"{dct = }")  # for debug only
-        dct = copy.deepcopy(dct)
+        # a shallow copy is enough, the content and the marks are rebuilt below
+        # and only the attrs are copied, a deepcopy of the whole subtree at
+        # every level would be O(n * depth)
+        dct = dict(dct)
+        if _index is not None:
+            # reserve the document order before the children are parsed
+            seq = _index._next_seq()
 
         if "attrs" in dct:
             fields = cls.get_fields()
             attrs_field = fields["attrs"]
-            dct["attrs"] = attrs_field.type.from_dict(dct["attrs"])
+            dct["attrs"] = attrs_field.type.from_dict(copy.deepcopy(dct["attrs"]))
 
         if "content" in dct:
             if isinstance(dct["content"], list):
@@ -205,14 +214,20 @@ class BaseNode(Base):
                     # print(f"{d = }")  # for debug only
                     # --- impl 1. use try except
                     try:
-                        content = parse_node(d, ignore_error=ignore_error)
+                        content = parse_node(
+                            d, ignore_error=ignore_error, _index=_index
+                        )
                         if content is None:
                             continue
 
                         new_content.append(content)
                     except Exception as e:
                         if ignore_error:
-                            pass
+                            if _index is not None:
+                                # the index may hold nodes of the dropped subtree
+                                _index._has_error = True
+                            if _hooks:
+                                report_error("parse", _get_data_type(d), e)
                         else:
                             raise e
                     # --- impl 2. no try except, for debug only
@@ -234,21 +249,25 @@ class BaseNode(Base):
                 dct["marks"] = new_marks
 
         # print(f"{dct = }")  # for debug only
-        return super().from_dict(dct)
+        node = super().from_dict(dct)
+        if _index is not None:
+            _index._add(node, seq)
+        return node
 
     def to_dict(self) -> T_DATA:
-        inst = copy.copy(self)
-        if hasattr(inst, "attrs"):
-            if isinstance(inst.attrs, NA) is False:
-                inst.attrs = inst.attrs.to_dict()
-        if hasattr(inst, "content"):
-            if isinstance(inst.content, NA) is False:
-                inst.content = [c.to_dict() for c in inst.content]
-        if hasattr(inst, "marks"):
-            if isinstance(inst.marks, NA) is False:
-                inst.marks = [m.to_dict() for m in inst.marks]
-        data = dataclasses.asdict(inst)
-        return rm_na(**data)
+        # build the dict field by field, ``dataclasses.asdict`` would copy
+        # the dicts of the children again at every level
+        data = dict()
+        for name in self.get_fields():
+            value = getattr(self, name)
+            if isinstance(value, NA):
+                continue
+            if name == "attrs":
+                value = value.to_dict()
+            elif name == "content" or name == "marks":
+                value = [c.to_dict() for c in value]
+            data[name] = value
+        return data
 
     def to_markdown(
         self,
@@ -258,6 +277,30 @@ class BaseNode(Base):
             f"{self.__class__.__name__} has not implemented the ``def to_markdown(self):`` method"
         )
 
+    def iter_text(
+        self,
+        ignore_error: bool = False,
+    ) -> T.Iterator[str]:
+        """
+        Yield the plain text of each block, for full-text indexing. Marks,
+        table pipes and list markers are skipped, the whitespace is collapsed
+        to a single space and empty blocks are skipped.
+        """
+        return _iter_text(self, ignore_error=ignore_error)
+
+    def to_text(
+        self,
+        sep: str = "\n",
+        ignore_error: bool = False,
+    ) -> str:
+        """
+        Convert to plain text, it is faster than :meth:`to_markdown`.
+        See :meth:`iter_text` for details.
+
+        :param sep: the separator between blocks.
+        """
+        return sep.join(_iter_text(self, ignore_error=ignore_error))
+
 
 T_NODE = T.TypeVar("T_NODE", bound=BaseNode)
 
@@ -289,7 +332,8 @@ def _content_to_markdown(
                 lst.append(md)
             except Exception as e:  # pragma: no cover
                 if ignore_error:
-                    pass
+                    if _hooks:
+                        report_error("render", node.type, e)
                 else:
                     raise e
         return concat.join(lst)
@@ -299,12 +343,22 @@ def _doc_content_to_markdown(
     content: T.Union[T.List["T_NODE"], NA],
     concat: str = "\n",
     ignore_error: bool = False,
+    limits: T.Optional[Limits] = None,
 ) -> str:
     if isinstance(content, NA):
         return ""
     else:
         lst = list()
+        size = 0
+        if limits is None:
+            max_output_size = None
+        else:
+            max_output_size = limits.max_output_size
         for node in content:
+            if max_output_size is not None and size > max_output_size:
+                if ignore_error:
+                    break
+                raise LimitExceededError("max_output_size", max_output_size, size)
             # print("----- Work on a new node -----")
             try:
                 if isinstance(node, (NodeBulletList, NodeOrderedList, NodeCodeBlock)):
@@ -314,16 +368,91 @@ def _doc_content_to_markdown(
                 # print(f"{node = }")
                 # print(f"{md = }")
                 lst.append(md)
+                size += len(md) + len(concat)
             except Exception as e:  # pragma: no cover
                 if ignore_error:
-                    pass
+                    if _hooks:
+                        report_error("render", node.type, e)
                 else:
                     raise e
 
     md = _strip_double_empty_line(concat.join(lst))
+    if limits is not None:
+        md = limits.check_output(md, truncate=ignore_error)
     return md
 
 
+def _indent(text: str, prefix: str) -> str:
+    """
+    Prefix the lines that are not blank, the same as ``textwrap.indent(text,
+    prefix)``, ``textwrap`` is not imported to keep the import time low.
+    """
+    return "".join(
+        [prefix + line if line.strip() else line for line in text.splitlines(True)]
+    )
+
+
+def _format_date(timestamp: T.Union[str, int]) -> str:
+    """
+    Format a unix timestamp in milliseconds as an ISO date, in UTC.
+    """
+    # imported on first use, few documents have a date
+    from datetime import datetime
+
+    return str(datetime.utcfromtimestamp(int(timestamp) / 1000).date())
+
+
+def _quote(md: str, prefix: str = "> ") -> str:
+    """
+    Prefix every line, the empty lines included. It is the same as
+    ``textwrap.indent(md, prefix, predicate=lambda line: True)``, without
+    a Python function call per line, nested quotes prefix the same lines
+    once per level.
+    """
+    return "".join([prefix + line for line in md.splitlines(True)])
+
+
+def _count_nodes(node: "T_NODE") -> int:
+    """
+    Count the nodes of a parsed tree, the root included.
+    """
+    n_node = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        n_node += 1
+        content = node.__dict__.get("content")
+        if content.__class__ is list:
+            stack.extend(content)
+    return n_node
+
+
+def _count_data_nodes(dct: T_DATA) -> int:
+    """
+    Count the nodes of the raw data, the root included.
+    """
+    n_node = 0
+    stack = [dct]
+    while stack:
+        dct = stack.pop()
+        n_node += 1
+        content = dct.get("content")
+        if content.__class__ is list:
+            stack.extend([d for d in content if isinstance(d, dict)])
+    return n_node
+
+
+def _get_data_type(dct: T.Any) -> T.Optional[str]:
+    """
+    Get the type of the raw node data, None if it is not a dict with a type.
+    """
+    if isinstance(dct, dict):
+        type_ = dct.get("type")
+        if type_.__class__ is str:
+            return type_
+    return None
+
+
 def _add_style_to_markdown(md: str, node: "T_NODE") -> str:
     if isinstance(node.marks, list):
         for mark in node.marks:
@@ -331,6 +460,18 @@ def _add_style_to_markdown(md: str, node: "T_NODE") -> str:
     return md
 
 
+def _get_card_title(url: str) -> str:
+    """
+    Get the resolved title of a card, or the url itself.
+    """
+    resolved = get_resolved()
+    if resolved is not None:
+        title = resolved.cards.get(url)
+        if title:
+            return title
+    return url
+
+
 @dataclasses.dataclass
 class NodeBlockCardAttrs(Base):
     url: str = dataclasses.field(default_factory=NA)
@@ -347,7 +488,8 @@ class NodeBlockCard(BaseNode):
         ignore_error: bool = False,
     ) -> str:
         if isinstance(self.attrs.url, str):
-            return f"\n[{self.attrs.url}]({self.attrs.url})\n"
+            title = _get_card_title(self.attrs.url)
+            return f"\n[{title}]({self.attrs.url})\n"
         else:
             raise NotImplementedError
 
@@ -362,13 +504,11 @@ class NodeBlockQuote(BaseNode):
         ignore_error: bool = False,
     ) -> str:
         return (
-            textwrap.indent(
+            _quote(
                 _doc_content_to_markdown(
                     content=self.content,
                     ignore_error=ignore_error,
-                ),
-                prefix="> ",
-                predicate=lambda line: True,
+                )
             )
             + "\n"
         )
@@ -399,7 +539,8 @@ class NodeBulletList(BaseNode):
                             content_lines.append(md)
                         except Exception as e:
                             if ignore_error:
-                                pass
+                                if _hooks:
+                                    report_error("render", node.type, e)
                             else:
                                 raise e
                     else:
@@ -409,7 +550,8 @@ class NodeBulletList(BaseNode):
                             content_lines.append(md)
                         except Exception as e:
                             if ignore_error:
-                                pass
+                                if _hooks:
+                                    report_error("render", node.type, e)
                             else:
                                 raise e
 
@@ -477,7 +619,7 @@ class NodeDate(BaseNode):
         self,
         ignore_error: bool = False,
     ) -> str:
-        return str(datetime.utcfromtimestamp(int(self.attrs.timestamp) / 1000).date())
+        return _format_date(self.attrs.timestamp)
 
 
 @dataclasses.dataclass
@@ -492,12 +634,184 @@ class NodeDoc(BaseNode):
     type: str = dataclasses.field(default=TypeEnum.doc.value)
     content: list["T_NODE"] = dataclasses.field(default_factory=REQ)
 
+    @classmethod
+    def from_dict(
+        cls,
+        dct: T_DATA,
+        ignore_error: bool = False,
+        build_index: bool = False,
+        limits: T.Optional[Limits] = None,
+        _index: T.Optional["NodeIndex"] = None,
+    ) -> "NodeDoc":
+        """
+        :param build_index: if True, build the :class:`~atlas_doc_parser.index.NodeIndex`
+            in the same pass as parsing, otherwise it is built on the first lookup.
+        :param limits: the :class:`~atlas_doc_parser.limits.Limits` of the
+            raw data, checked before parsing. A document that exceeds them
+            raises :class:`~atlas_doc_parser.exc.LimitExceededError`, or is
+            truncated if ``ignore_error`` is True.
+        """
+        if limits is not None:
+            dct = limits.check_data(dct, truncate=ignore_error)
+        if _hooks:
+            content = dct.get("content")
+            n_block = len(content) if isinstance(content, list) else 0
+            with Span("parse", {"n_block": n_block}) as span:
+                doc = cls._from_dict(dct, ignore_error, build_index, _index)
+                n_node = _count_nodes(doc)
+                span.set(n_node=n_node, n_dropped=_count_data_nodes(dct) - n_node)
+                return doc
+        return cls._from_dict(dct, ignore_error, build_index, _index)
+
+    @classmethod
+    def _from_dict(
+        cls,
+        dct: T_DATA,
+        ignore_error: bool,
+        build_index: bool,
+        _index: T.Optional["NodeIndex"],
+    ) -> "NodeDoc":
+        if _slow_logs:
+            start = time.perf_counter()
+            doc = cls._parse(dct, ignore_error, build_index, _index)
+            report_slow(
+                "parse",
+                time.perf_counter() - start,
+                lambda: dct,
+                lambda: cls._parse(dct, ignore_error, False, None),
+            )
+            return doc
+        return cls._parse(dct, ignore_error, build_index, _index)
+
+    @classmethod
+    def _parse(
+        cls,
+        dct: T_DATA,
+        ignore_error: bool,
+        build_index: bool,
+        _index: T.Optional["NodeIndex"],
+    ) -> "NodeDoc":
+        if build_index is False or _index is not None:
+            return super().from_dict(dct, ignore_error=ignore_error, _index=_index)
+        index = NodeIndex()
+        doc = super().from_dict(dct, ignore_error=ignore_error, _index=index)
+        index._finish(doc)
+        doc._index = index
+        return doc
+
+    def get_index(self) -> NodeIndex:
+        """
+        Get the up-to-date :class:`~atlas_doc_parser.index.NodeIndex`,
+        build it if it doesn't exist or has been invalidated.
+        """
+        index = self.__dict__.get("_index")
+        if index is None:
+            index = NodeIndex()
+            self._index = index
+        if index.is_valid is False or index.root is not self:
+            index.build(self)
+        return index
+
+    def invalidate_index(self):
+        """
+        Mark the index as stale, call it after any change to the tree.
+        The index is rebuilt on the next lookup.
+        """
+        index = self.__dict__.get("_index")
+        if index is not None:
+            index.invalidate()
+
+    def get_nodes_by_type(
+        self,
+        type_: T.Union[str, TypeEnum],
+    ) -> T.List["T_NODE"]:
+        """
+        Get all the nodes of the given type in document order.
+        """
+        # the index is keyed by the type string
+        type_ = type_.value if isinstance(type_, TypeEnum) else type_
+        index = self.get_index()
+        nodes = index.get_nodes_by_type(type_)
+        for node in nodes:
+            if node.type != type_ or index.is_attached(node) is False:
+                return index.build(self).get_nodes_by_type(type_)
+        return nodes
+
+    def get_node_by_local_id(self, local_id: str) -> T.Optional["T_NODE"]:
+        """
+        Get the node that has the given ``attrs.localId``, the first one in
+        document order if there are duplicates. Return None if not found.
+        """
+        index = self.get_index()
+        node = index.get_node_by_local_id(local_id)
+        if node is not None:
+            if (
+                getattr(node.attrs, "localId", None) != local_id
+                or index.is_attached(node) is False
+            ):
+                return index.build(self).get_node_by_local_id(local_id)
+        return node
+
+    def get_node_path(self, node: "T_NODE") -> T.Optional[str]:
+        """
+        Get the JSON Pointer of the node in this document,
+        e.g. ``"/content/3/content/0"``. Return None if the node is not in
+        this document.
+        """
+        index = self.get_index()
+        if index.is_attached(node) is False:
+            # the node was known but has been moved or removed
+            if index.get_parent(node)[0] is not None:
+                index.build(self)
+            else:
+                return None
+        return index.get_path(node)
+
     def to_markdown(
         self,
         ignore_error: bool = False,
+        limits: T.Optional[Limits] = None,
     ) -> str:
-        md = _doc_content_to_markdown(self.content, ignore_error=ignore_error)
-        return md
+        """
+        :param limits: the :class:`~atlas_doc_parser.limits.Limits` of the
+            output, checked after each top level block. The output that
+            exceeds ``max_output_size`` raises
+            :class:`~atlas_doc_parser.exc.LimitExceededError`, or is truncated
+            if ``ignore_error`` is True.
+        """
+        if _hooks:
+            with Span("render", {}) as span:
+                md = self._to_markdown(ignore_error, limits)
+                span.set(n_char=len(md))
+                return md
+        return self._to_markdown(ignore_error, limits)
+
+    def _to_markdown(
+        self,
+        ignore_error: bool,
+        limits: T.Optional[Limits],
+    ) -> str:
+        if _slow_logs:
+            start = time.perf_counter()
+            md = _doc_content_to_markdown(
+                self.content,
+                ignore_error=ignore_error,
+                limits=limits,
+            )
+            report_slow(
+                "render",
+                time.perf_counter() - start,
+                self.to_dict,
+                lambda: _doc_content_to_markdown(
+                    self.content, ignore_error=ignore_error, limits=limits
+                ),
+            )
+            return md
+        return _doc_content_to_markdown(
+            self.content,
+            ignore_error=ignore_error,
+            limits=limits,
+        )
 
 
 @dataclasses.dataclass
@@ -600,7 +914,8 @@ class NodeInlineCard(BaseNode):
         ignore_error: bool = False,
     ) -> str:
         if isinstance(self.attrs.url, str):
-            return f"[{self.attrs.url}]({self.attrs.url})"
+            title = _get_card_title(self.attrs.url)
+            return f"[{title}]({self.attrs.url})"
         else:
             raise NotImplementedError
 
@@ -660,10 +975,19 @@ class NodeMedia(BaseNode):
         else:
             alt = ""
 
-        if self.attrs.is_file_type():
-            raise NotImplementedError
-        elif self.attrs.is_link_type():
-            raise NotImplementedError
+        if self.attrs.is_file_type() or self.attrs.is_link_type():
+            resolved = get_resolved()
+            url = None
+            if resolved is not None and isinstance(self.attrs.id, str):
+                collection = self.attrs.collection
+                if not isinstance(collection, str):
+                    collection = ""
+                url = resolved.media.get((self.attrs.id, collection))
+            if url:
+                md = f"![{alt}]({url})"
+                return _add_style_to_markdown(md, self)
+            else:
+                raise NotImplementedError
         elif self.attrs.is_external_type():
             if isinstance(self.attrs.url, str):
                 md = f"![{alt}]({self.attrs.url})"
@@ -683,7 +1007,20 @@ class NodeMediaGroup(BaseNode):
         self,
         ignore_error: bool = False,
     ) -> str:
-        return ""
+        """
+        A media group is only rendered with resolved references, see
+        :mod:`atlas_doc_parser.resolve`. The media that can't be rendered
+        are skipped.
+        """
+        if get_resolved() is None:
+            return ""
+        lst = list()
+        for node in self.content:
+            try:
+                lst.append(node.to_markdown())
+            except NotImplementedError:
+                pass
+        return "\n".join(lst)
 
 
 T_NODE_MEDIA_SINGLE_ATTRS_LAYOUT = T.Literal[
@@ -743,6 +1080,11 @@ class NodeMention(BaseNode):
         ignore_error: bool = False,
     ) -> str:
         if isinstance(self.attrs.text, NA):
+            resolved = get_resolved()
+            if resolved is not None:
+                name = resolved.mentions.get(self.attrs.id)
+                if name:
+                    return name if name.startswith("@") else f"@{name}"
             return "@Unknown"
         else:
             return self.attrs.text
@@ -803,7 +1145,8 @@ class NodeOrderedList(BaseNode):
                             content_lines.append(md)
                         except Exception as e:  # pragma: no cover
                             if ignore_error:
-                                pass
+                                if _hooks:
+                                    report_error("render", node.type, e)
                             else:
                                 raise e
                     else:
@@ -813,7 +1156,8 @@ class NodeOrderedList(BaseNode):
                             content_lines.append(md)
                         except Exception as e:  # pragma: no cover
                             if ignore_error:
-                                pass
+                                if _hooks:
+                                    report_error("render", node.type, e)
                             else:
                                 raise e
 
@@ -854,7 +1198,7 @@ class NodePanel(BaseNode):
         ignore_error: bool = False,
     ) -> str:
         return (
-            textwrap.indent(
+            _quote(
                 _strip_double_empty_line(
                     "\n".join(
                         [
@@ -866,9 +1210,7 @@ class NodePanel(BaseNode):
                             ),
                         ]
                     )
-                ),
-                prefix="> ",
-                predicate=lambda line: True,
+                )
             )
             + "\n"
         )
@@ -956,11 +1298,12 @@ class NodeTable(BaseNode):
             try:
                 md = row.to_markdown()
                 lines.append(md)
-                if isinstance(row.content[0], NodeTableHeader):
+                if row.content and isinstance(row.content[0], NodeTableHeader):
                     lines.append("| " + " | ".join(["---"] * len(row.content)) + " |")
             except Exception as e:  # pragma: no cover
                 if ignore_error:
-                    pass
+                    if _hooks:
+                        report_error("render", row.type, e)
                 else:
                     raise e
         return "\n".join(lines)
@@ -1151,7 +1494,11 @@ _node_type_to_class_mapping = {
 }
 
 
-def parse_node(dct: T_DATA, ignore_error: bool = False) -> T.Optional["T_NODE"]:
+def parse_node(
+    dct: T_DATA,
+    ignore_error: bool = False,
+    _index: T.Optional["NodeIndex"] = None,
+) -> T.Optional["T_NODE"]:
     # print(f"{dct = }")  # for debug only
     type_ = dct["type"]
     klass = _node_type_to_class_mapping.get(type_)
@@ -1159,4 +1506,259 @@ def parse_node(dct: T_DATA, ignore_error: bool = False) -> T.Optional["T_NODE"]:
     if klass is None:
         return None
 
-    return klass.from_dict(dct, ignore_error=ignore_error)
+    if _index is None:
+        return klass.from_dict(dct, ignore_error=ignore_error)
+    return klass.from_dict(dct, ignore_error=ignore_error, _index=_index)
+
+
+def _get_attr_str(node: "T_NODE", name: str) -> str:
+    value = node.attrs.__dict__.get(name)
+    if value.__class__ is str:
+        return value
+    return ""
+
+
+def _get_emoji_text(node: "NodeEmoji") -> str:
+    return _get_attr_str(node, "text") or _get_attr_str(node, "shortName")
+
+
+# the text of each inline node type, the inline nodes don't have children
+_inline_text_getters: T.Dict[str, T.Callable[["T_NODE"], str]] = {
+    TypeEnum.text.value: lambda node: node.text,
+    TypeEnum.hardBreak.value: lambda node: " ",
+    TypeEnum.mention.value: lambda node: _get_attr_str(node, "text"),
+    TypeEnum.emoji.value: _get_emoji_text,
+    TypeEnum.status.value: lambda node: _get_attr_str(node, "text"),
+    TypeEnum.date.value: lambda node: node.to_markdown(),
+    TypeEnum.inlineCard.value: lambda node: _get_attr_str(node, "url"),
+}
+
+# the text of the block node itself, emitted before its children
+_block_text_getters: T.Dict[str, T.Callable[["T_NODE"], str]] = {
+    TypeEnum.blockCard.value: lambda node: _get_attr_str(node, "url"),
+    TypeEnum.expand.value: lambda node: _get_attr_str(node, "title"),
+    TypeEnum.nestedExpand.value: lambda node: _get_attr_str(node, "title"),
+}
+
+
+def _iter_text(
+    root: "T_NODE",
+    ignore_error: bool = False,
+) -> T.Iterator[str]:
+    """
+    Implementation of :meth:`BaseNode.iter_text`, an iterative traversal
+    that only looks at the text, it doesn't build any markdown.
+
+    In ADF, the children of a node are either all inline or all blocks,
+    so a node with inline children is joined into one block of text directly.
+    """
+    inline_getters = _inline_text_getters
+    block_getters = _block_text_getters
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        type_ = node.type
+        getter = inline_getters.get(type_)
+        if getter is not None:
+            # an inline node that is not in an inline container, e.g. the root
+            try:
+                text = " ".join(getter(node).split())
+            except Exception as e:
+                if ignore_error is False:
+                    raise e
+                continue
+            if text:
+                yield text
+            continue
+
+        getter = block_getters.get(type_)
+        if getter is not None:
+            text = " ".join(getter(node).split())
+            if text:
+                yield text
+
+        content = node.__dict__.get("content")
+        if content.__class__ is not list or not content:
+            continue
+        if content[0].type not in inline_getters:
+            stack.extend(reversed(content))
+            continue
+
+        parts = list()
+        for ind, child in enumerate(content):
+            type_ = child.type
+            if type_ == "text":
+                parts.append(child.text)
+                continue
+            getter = inline_getters.get(type_)
+            if getter is None:  # pragma: no cover
+                # a block node among the inline nodes, it is not valid ADF
+                stack.extend(reversed(content[ind:]))
+                break
+            try:
+                parts.append(getter(child))
+            except Exception as e:
+                if ignore_error is False:
+                    raise e
+        text = " ".join("".join(parts).split())
+        if text:
+            yield text
+
+
+def _normalize_types(
+    types: T.Iterable[T.Union[str, TypeEnum]],
+) -> T.Tuple[T.Set[str], T.Set[str]]:
+    """
+    Split the given types into node types and mark types.
+    """
+    node_types = set()
+    mark_types = set()
+    for type_ in types:
+        if isinstance(type_, TypeEnum):
+            type_ = type_.value
+        if type_ in _mark_type_to_class_mapping:
+            mark_types.add(type_)
+        else:
+            node_types.add(type_)
+    return node_types, mark_types
+
+
+def _is_selected(
+    dct: T_DATA,
+    node_types: T.Set[str],
+    mark_types: T.Set[str],
+) -> bool:
+    if dct["type"] in node_types:
+        return True
+    if mark_types:
+        marks = dct.get("marks")
+        if isinstance(marks, list):
+            for mark in marks:
+                if mark["type"] in mark_types:
+                    return True
+    return False
+
+
+def _iter_selected_descendants(
+    node: "T_NODE",
+    node_types: T.Set[str],
+    mark_types: T.Set[str],
+) -> T.Iterable["T_NODE"]:
+    """
+    Yield the selected nodes in the subtree of an already parsed node, in
+    document order, the node itself excluded.
+    """
+    content = getattr(node, "content", None)
+    if not isinstance(content, list):
+        return
+    stack = [iter(content)]
+    while stack:
+        try:
+            child = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            continue
+        if child.type in node_types:
+            yield child
+        elif mark_types:
+            marks = getattr(child, "marks", None)
+            if isinstance(marks, list):
+                if any(mark.type in mark_types for mark in marks):
+                    yield child
+        content = getattr(child, "content", None)
+        if isinstance(content, list):
+            stack.append(iter(content))
+
+
+def _prune_node(
+    dct: T_DATA,
+    node_types: T.Set[str],
+    mark_types: T.Set[str],
+    ignore_error: bool,
+) -> T.Optional["T_NODE"]:
+    klass = _node_type_to_class_mapping.get(dct["type"])
+    if klass is None:
+        return None
+    if _is_selected(dct, node_types, mark_types):
+        return klass.from_dict(dct, ignore_error=ignore_error)
+
+    content = dct.get("content")
+    if not isinstance(content, list):
+        return None
+    new_content = list()
+    for d in content:
+        try:
+            node = _prune_node(d, node_types, mark_types, ignore_error)
+        except Exception as e:
+            if ignore_error:
+                continue
+            else:
+                raise e
+        if node is not None:
+            new_content.append(node)
+    if len(new_content) == 0:
+        return None
+
+    # only build the ancestor itself, the kept children are attached later
+    new_dct = {k: v for k, v in dct.items() if k != "content"}
+    new_dct["content"] = []
+    node = klass.from_dict(new_dct, ignore_error=ignore_error)
+    node.content = new_content
+    return node
+
+
+def parse_node_selective(
+    dct: T_DATA,
+    types: T.Iterable[T.Union[str, TypeEnum]],
+    keep_ancestors: bool = False,
+    ignore_error: bool = False,
+) -> T.Union[T.List["T_NODE"], T.Optional["T_NODE"]]:
+    """
+    Only materialize the nodes the caller cares about.
+
+    The raw data is walked without building the unrelated nodes, only the
+    selected nodes (with their full subtree) are parsed. It is much faster
+    than ``NodeDoc.from_dict(dct)`` followed by a filter.
+
+    :param dct: the raw ADF data, usually a doc.
+    :param types: the node types to select, for example
+        ``{TypeEnum.heading, TypeEnum.mention}``. A mark type selects the
+        nodes that carry this mark, for example ``TypeEnum.link`` selects
+        the text nodes with a hyperlink.
+    :param keep_ancestors: if False, return the list of the selected nodes in
+        document order, the selected nodes nested in another selected node
+        are also included. If True, return a pruned tree that only keeps the
+        selected nodes and their ancestors, or None if nothing is selected.
+    :param ignore_error: skip the selected nodes that failed to parse.
+    """
+    node_types, mark_types = _normalize_types(types)
+    if keep_ancestors:
+        return _prune_node(dct, node_types, mark_types, ignore_error)
+
+    nodes = list()
+    stack = [iter((dct,))]
+    while stack:
+        try:
+            d = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            continue
+        type_ = d["type"]
+        klass = _node_type_to_class_mapping.get(type_)
+        if klass is None:
+            continue
+        if _is_selected(d, node_types, mark_types):
+            try:
+                node = klass.from_dict(d, ignore_error=ignore_error)
+            except Exception as e:
+                if ignore_error:
+                    continue
+                else:
+                    raise e
+            nodes.append(node)
+            nodes.extend(_iter_selected_descendants(node, node_types, mark_types))
+        else:
+            content = d.get("content")
+            if isinstance(content, list):
+                stack.append(iter(content))
+    return nodes
@@ -0,0 +1,657 @@
+# -*- coding: utf-8 -*-
+
+"""
+Visit a node tree once and feed several output sinks at the same time,
+for example markdown for storage, plain text for search and statistics for
+analytics.
+
+Example::
+
+    from atlas_doc_parser.api import (
+        NodeDoc, render_multi, MarkdownSink, TextSink, StatsSink,
+    )
+
+    doc = NodeDoc.from_dict(data)
+    md, text, stats = render_multi(doc, [MarkdownSink(), TextSink(), StatsSink()])
+
+:func:`render_multi` walks the tree once, without recursion, and sends the
+events of each node to every sink: enter and leave around the children of
+a block node, one inline event for a node with inline children, e.g. a
+paragraph, and one leaf event for a node without children. No sink walks
+the tree on its own: the :class:`MarkdownSink` builds the markdown of a node
+from the markdown of its children when the node is left, instead of calling
+``to_markdown``, which would render the whole subtree again. A custom sink
+subclasses :class:`BaseSink`.
+
+The walk itself is cheap, most of the time goes to the work of the sinks,
+which is the same as in separate passes. So the throughput is not the one
+of a single render, it is 10 to 20% lower than ``to_markdown()``,
+``to_text()`` and a stats pass in a row, see ``benchmark/bench_multi_sink.py``.
+"""
+
+import typing as T
+import dataclasses
+
+from .constants import TAB
+from .type_enum import TypeEnum
+from .tracing import _hooks, report_error
+from .resolve import get_resolved
+from .model import (
+    T_NODE,
+    NodeCodeBlockAttrs,
+    _inline_text_getters,
+    _block_text_getters,
+    _atlassian_lang_to_markdown_lang_mapping,
+    _strip_double_empty_line,
+    _add_style_to_markdown,
+    _quote,
+)
+
+
+class BaseSink:
+    """
+    The base class of the sinks.
+
+    :func:`render_multi` calls :meth:`enter` and :meth:`leave` before and after
+    the children of a node that has block children, :meth:`inline` once for
+    a node that has inline children, for example a paragraph, and
+    :meth:`leaf` once for a node without children, for example a rule.
+    """
+
+    def enter(self, node: T_NODE):
+        pass
+
+    def leave(self, node: T_NODE):
+        pass
+
+    def leaf(self, node: T_NODE):
+        pass
+
+    def inline(self, node: T_NODE):
+        """
+        The inline nodes don't have children, by default they are sent to
+        :meth:`leaf` one by one, between :meth:`enter` and :meth:`leave`.
+        A sink overrides it to handle them in one call.
+        """
+        self.enter(node)
+        for child in node.content:
+            self.leaf(child)
+        self.leave(node)
+
+    def result(self) -> T.Any:  # pragma: no cover
+        """
+        The output of the sink, called once after the traversal.
+        """
+        raise NotImplementedError
+
+
+def render_multi(
+    root: T_NODE,
+    sinks: T.Sequence[BaseSink],
+) -> T.List[T.Any]:
+    """
+    Visit the tree once, without recursion, and feed all the sinks.
+
+    :return: the result of each sink, in the same order.
+    """
+    # the methods that are not overridden do nothing, they are not called
+    enters = [s.enter for s in sinks if type(s).enter is not BaseSink.enter]
+    leaves = [s.leave for s in sinks if type(s).leave is not BaseSink.leave]
+    leafs = [s.leaf for s in sinks if type(s).leaf is not BaseSink.leaf]
+    inlines = [s.inline for s in sinks]
+    inline_types = _inline_text_getters
+    content = root.__dict__.get("content")
+    if content.__class__ is not list:
+        for leaf in leafs:
+            leaf(root)
+        return [sink.result() for sink in sinks]
+    if content and content[0].type in inline_types:
+        for inline in inlines:
+            inline(root)
+        return [sink.result() for sink in sinks]
+    for enter in enters:
+        enter(root)
+    stack = [(root, iter(content))]
+    while stack:
+        node, it = stack[-1]
+        for child in it:
+            content = child.__dict__.get("content")
+            if content.__class__ is list:
+                if content and content[0].type in inline_types:
+                    for inline in inlines:
+                        inline(child)
+                    continue
+                for enter in enters:
+                    enter(child)
+                stack.append((child, iter(content)))
+                break
+            for leaf in leafs:
+                leaf(child)
+        else:
+            stack.pop()
+            for leave in leaves:
+                leave(node)
+    return [sink.result() for sink in sinks]
+
+
+# ------------------------------------------------------------------------------
+# Markdown
+# ------------------------------------------------------------------------------
+# each renderer builds the markdown of a node from the markdown of its
+# children, ``parts`` is aligned with ``node.content``. It matches the
+# ``to_markdown`` method of the node class, see ``tests/test_multi_sink.py``.
+# A part is None only for a child that a list or a media group skips, or
+# for a failed block that is skipped as a whole.
+T_RENDERER = T.Callable[[T_NODE, T.List[T.Optional[str]], int], str]
+
+_wrapped_in_doc_content = {
+    TypeEnum.bulletList.value,
+    TypeEnum.orderedList.value,
+    TypeEnum.codeBlock.value,
+}
+
+
+def _join_doc_content(node: T_NODE, parts: T.List[T.Optional[str]]) -> str:
+    """
+    The same as ``_doc_content_to_markdown`` without limits.
+    """
+    wrapped = _wrapped_in_doc_content
+    lst = list()
+    for child, md in zip(node.content, parts):
+        if md is None:
+            continue
+        if child.type in wrapped:
+            md = "\n" + md + "\n"
+        lst.append(md)
+    return _strip_double_empty_line("\n".join(lst))
+
+
+def _render_doc(node, parts, level):
+    return _join_doc_content(node, parts)
+
+
+def _render_paragraph(node, parts, level):
+    return _add_style_to_markdown("".join(parts), node) + "\n"
+
+
+def _render_heading(node, parts, level):
+    return "\n\n" + "{} {}".format("#" * node.attrs.level, "".join(parts)) + "\n\n"
+
+
+def _render_code_block(node, parts, level):
+    code = "".join(parts)
+    lang = ""
+    if isinstance(node.attrs, NodeCodeBlockAttrs):
+        if isinstance(node.attrs.language, str):
+            lang = _atlassian_lang_to_markdown_lang_mapping.get(
+                node.attrs.language,
+                node.attrs.language,
+            )
+    if lang == "none":
+        lang = ""
+    return f"```{lang}\n{code}\n```"
+
+
+def _render_blockquote(node, parts, level):
+    return _quote(_join_doc_content(node, parts)) + "\n"
+
+
+def _render_panel(node, parts, level):
+    md = "\n".join(
+        [
+            f"**{node.attrs.panelType.upper()}**",
+            "",
+            _join_doc_content(node, parts),
+        ]
+    )
+    return _quote(_strip_double_empty_line(md)) + "\n"
+
+
+def _render_expand(node, parts, level):
+    return _add_style_to_markdown(_join_doc_content(node, parts), node)
+
+
+def _render_nested_expand(node, parts, level):
+    return _join_doc_content(node, parts)
+
+
+def _render_list(node, parts, level):
+    lines = []
+    indent = "    " * level  # 4 spaces per level
+    num = None
+    if node.type == "orderedList":
+        order = getattr(node.attrs, "order", None)
+        if level == 0 and isinstance(order, int):
+            num = order
+        else:
+            num = 1
+    for item, item_content in zip(node.content, parts):
+        if item.type != "listItem":
+            continue
+        item_lines = item_content.split("\n")
+        if num is None:
+            lines.append(f"{indent}- {item_lines[0]}")
+        else:
+            lines.append(f"{indent}{num}. {item_lines[0]}")
+            num += 1
+        lines.extend(item_lines[1:])
+    return "\n".join(lines)
+
+
+def _render_list_item(node, parts, level):
+    # ``level`` is 1 in a bullet or an ordered list, the list splits the
+    # lines of the children
+    if level:
+        return "\n".join(parts)
+    return "".join(parts)
+
+
+def _render_task_list(node, parts, level):
+    indent = TAB * level
+    lines = list()
+    for child, md in zip(node.content, parts):
+        type_ = child.type
+        if type_ == "taskItem":
+            lines.append(f"{indent}- {md}")
+        elif type_ == "taskList":
+            if md:
+                lines.append(md)
+        else:
+            raise TypeError(f"Unexpected type: {type(child)}")
+    return "\n".join(lines)
+
+
+def _render_task_item(node, parts, level):
+    checkbox = "[x]" if node.attrs.state == "DONE" else "[ ]"
+    return f"{checkbox} {''.join(parts)}"
+
+
+def _render_table(node, parts, level):
+    lines = list()
+    for row, md in zip(node.content, parts):
+        lines.append(md)
+        if row.content and row.content[0].type == "tableHeader":
+            lines.append("| " + " | ".join(["---"] * len(row.content)) + " |")
+    return "\n".join(lines)
+
+
+def _render_table_row(node, parts, level):
+    return "| " + " | ".join(parts) + " |"
+
+
+def _render_table_cell(node, parts, level):
+    return "".join(parts).replace("|", "\\|").replace("\n", "<br>")
+
+
+def _render_media_group(node, parts, level):
+    if get_resolved() is None:
+        return ""
+    return "\n".join([md for md in parts if md is not None])
+
+
+_renderers: T.Dict[str, T_RENDERER] = {
+    TypeEnum.doc.value: _render_doc,
+    TypeEnum.paragraph.value: _render_paragraph,
+    TypeEnum.heading.value: _render_heading,
+    TypeEnum.codeBlock.value: _render_code_block,
+    TypeEnum.blockquote.value: _render_blockquote,
+    TypeEnum.panel.value: _render_panel,
+    TypeEnum.expand.value: _render_expand,
+    TypeEnum.nestedExpand.value: _render_nested_expand,
+    TypeEnum.bulletList.value: _render_list,
+    TypeEnum.orderedList.value: _render_list,
+    TypeEnum.listItem.value: _render_list_item,
+    TypeEnum.taskList.value: _render_task_list,
+    TypeEnum.taskItem.value: _render_task_item,
+    TypeEnum.table.value: _render_table,
+    TypeEnum.tableRow.value: _render_table_row,
+    TypeEnum.tableCell.value: _render_table_cell,
+    TypeEnum.tableHeader.value: _render_table_cell,
+    TypeEnum.mediaSingle.value: lambda node, parts, level: "".join(parts),
+    TypeEnum.mediaGroup.value: _render_media_group,
+}
+
+_list_types = {"bulletList", "orderedList"}
+
+# the context of a child node: level, muted, right strip. A muted node is not
+# rendered, its parent doesn't use it, e.g. a paragraph directly in a list.
+T_CONTEXT = T.Tuple[int, bool, bool]
+_plain: T_CONTEXT = (0, False, False)
+_muted: T_CONTEXT = (0, True, False)
+_strip: T_CONTEXT = (0, False, True)
+_list_item_context: T.Dict[str, T_CONTEXT] = {"listItem": (1, False, False)}
+
+# the children of these nodes don't have a plain context
+_special_types = {"bulletList", "orderedList", "listItem", "taskList", "mediaGroup"}
+
+
+class MarkdownSink(BaseSink):
+    """
+    Build the same markdown as ``to_markdown()``, from the markdown of the
+    children of each node, the tree is not walked again.
+
+    :param ignore_error: for a doc, skip the top level blocks that failed to
+        render, the same as ``NodeDoc.to_markdown(ignore_error=True)``.
+    """
+
+    def __init__(self, ignore_error: bool = False):
+        self.ignore_error = ignore_error
+        # the entered nodes, (node, the markdown of the children, level,
+        # muted, right strip, the context of the children by type, the
+        # default context of the children). The context of the children
+        # of most nodes is plain, then both are None.
+        self.frames: T.List[tuple] = list()
+        # the error of the current top level block of a doc, the rest of
+        # the block is skipped
+        self.error: T.Optional[Exception] = None
+        self.md: T.Optional[str] = None
+
+    def _get_child_context(
+        self,
+        node: T_NODE,
+        level: int,
+    ) -> T.Tuple[T.Optional[T.Dict[str, T_CONTEXT]], T.Optional[T_CONTEXT]]:
+        """
+        Get the context of the children of a node that is about to be
+        entered, the current node is its parent.
+        """
+        type_ = node.type
+        if type_ in _list_types:
+            # a list only renders its list items
+            return _list_item_context, _muted
+        if type_ == "listItem":
+            if level:
+                # the lines of a list item in a list are right stripped,
+                # except a nested list of the same kind, which is indented
+                parent = self.frames[-1]
+                return {parent[0].type: (parent[2] + 1, False, False)}, _strip
+            return None, None
+        if type_ == "taskList":
+            return {type_: (level + 1, False, False)}, _plain
+        if get_resolved() is None:  # a media group
+            return {}, _muted
+        return None, None
+
+    def _on_error(self, e: Exception) -> None:
+        """
+        Handle the error of a node, it returns None or raises.
+        """
+        frames = self.frames
+        if frames:
+            if frames[-1][0].type == "mediaGroup" and isinstance(
+                e, NotImplementedError
+            ):
+                return None  # a media group skips the media it can't render
+            if self.ignore_error and frames[0][0].type == "doc":
+                self.error = e
+                return None
+        raise e
+
+    def _skip(self, node: T_NODE):
+        """
+        Skip a top level block that failed to render.
+        """
+        if _hooks:
+            report_error("render", node.type, self.error)
+        self.error = None
+
+    # the lookup of the context is inlined, it runs for every node
+
+    def enter(self, node: T_NODE):
+        frames = self.frames
+        level = 0
+        muted = strip = False
+        if frames:
+            parent = frames[-1]
+            if parent[5] is not None:
+                level, muted, strip = parent[5].get(node.type, parent[6])
+        if muted:
+            context, default = {}, _muted
+        elif node.type in _special_types:
+            context, default = self._get_child_context(node, level)
+        else:
+            context = default = None
+        frames.append((node, [], level, muted, strip, context, default))
+
+    def leave(self, node: T_NODE):
+        frames = self.frames
+        _, parts, level, muted, strip, _, _ = frames.pop()
+        md = None
+        if not muted and self.error is None:
+            try:
+                md = _renderers[node.type](node, parts, level)
+            except Exception as e:
+                md = self._on_error(e)
+        if not frames:
+            self.md = md
+            return
+        if len(frames) == 1 and self.error is not None:
+            self._skip(node)
+        elif strip and md is not None:
+            md = md.rstrip()
+        frames[-1][1].append(md)
+
+    def inline(self, node: T_NODE):
+        frames = self.frames
+        level = 0
+        muted = strip = False
+        if frames:
+            parent = frames[-1]
+            if parent[5] is not None:
+                level, muted, strip = parent[5].get(node.type, parent[6])
+        md = None
+        if not muted and self.error is None:
+            try:
+                parts = list()
+                for child in node.content:
+                    # the same as NodeText.to_markdown, without the call
+                    if child.type == "text":
+                        child_md = child.text
+                        marks = child.marks
+                        if marks.__class__ is list:
+                            for mark in marks:
+                                child_md = mark.to_markdown(child_md)
+                        parts.append(child_md)
+                    else:
+                        parts.append(child.to_markdown())
+                md = _renderers[node.type](node, parts, level)
+            except Exception as e:
+                md = self._on_error(e)
+        if not frames:
+            self.md = md
+            return
+        if len(frames) == 1 and self.error is not None:
+            self._skip(node)
+        elif strip and md is not None:
+            md = md.rstrip()
+        frames[-1][1].append(md)
+
+    def leaf(self, node: T_NODE):
+        frames = self.frames
+        muted = strip = False
+        if frames:
+            parent = frames[-1]
+            if parent[5] is not None:
+                _, muted, strip = parent[5].get(node.type, parent[6])
+        md = None
+        if not muted and self.error is None:
+            try:
+                md = node.to_markdown()
+            except Exception as e:
+                md = self._on_error(e)
+        if not frames:
+            self.md = md
+            return
+        if len(frames) == 1 and self.error is not None:
+            self._skip(node)
+        elif strip and md is not None:
+            md = md.rstrip()
+        frames[-1][1].append(md)
+
+    def result(self) -> T.Optional[str]:
+        return self.md
+
+
+# ------------------------------------------------------------------------------
+# Plain text
+# ------------------------------------------------------------------------------
+class TextSink(BaseSink):
+    """
+    Build the same plain text as ``to_text()``.
+
+    :param sep: the separator between blocks.
+    :param ignore_error: skip the inline nodes that failed to render.
+    """
+
+    def __init__(self, sep: str = "\n", ignore_error: bool = False):
+        self.sep = sep
+        self.ignore_error = ignore_error
+        self.blocks: T.List[str] = list()
+
+    def enter(self, node: T_NODE):
+        getter = _block_text_getters.get(node.type)
+        if getter is not None:
+            text = " ".join(getter(node).split())
+            if text:
+                self.blocks.append(text)
+
+    def inline(self, node: T_NODE):
+        # the inline containers don't have a block text of their own
+        inline_getters = _inline_text_getters
+        parts = list()
+        content = node.content
+        for ind, child in enumerate(content):
+            type_ = child.type
+            if type_ == "text":
+                parts.append(child.text)
+                continue
+            getter = inline_getters.get(type_)
+            if getter is None:  # pragma: no cover
+                # a block node among the inline nodes, it is not valid ADF,
+                # the nodes after it are visited on their own, as in to_text
+                self._add(parts)
+                parts = list()
+                for rest in content[ind:]:
+                    render_multi(rest, [self])
+                break
+            try:
+                parts.append(getter(child))
+            except Exception as e:
+                if self.ignore_error is False:
+                    raise e
+        text = " ".join("".join(parts).split())
+        if text:
+            self.blocks.append(text)
+
+    def leaf(self, node: T_NODE):
+        getter = _inline_text_getters.get(node.type)
+        if getter is None:
+            self.enter(node)
+            return
+        # an inline node that is not in an inline container, e.g. the root
+        try:
+            text = getter(node)
+        except Exception as e:
+            if self.ignore_error is False:
+                raise e
+            return
+        self._add([text])
+
+    def _add(self, parts: T.List[str]):
+        text = " ".join("".join(parts).split())
+        if text:
+            self.blocks.append(text)
+
+    def result(self) -> str:
+        return self.sep.join(self.blocks)
+
+
+# ------------------------------------------------------------------------------
+# Statistics
+# ------------------------------------------------------------------------------
+@dataclasses.dataclass
+class DocStats:
+    """
+    :param n_node: the number of nodes, the root included.
+    :param n_word: the number of whitespace separated words in the text nodes.
+    :param n_char: the number of characters in the text nodes.
+    :param n_link: the number of link marks, inline cards and block cards.
+    :param type_counts: the number of nodes of each type.
+    """
+
+    n_node: int = dataclasses.field(default=0)
+    n_word: int = dataclasses.field(default=0)
+    n_char: int = dataclasses.field(default=0)
+    n_link: int = dataclasses.field(default=0)
+    type_counts: T.Dict[str, int] = dataclasses.field(default_factory=dict)
+
+
+_card_types = {TypeEnum.inlineCard.value, TypeEnum.blockCard.value}
+
+
+class StatsSink(BaseSink):
+    """
+    Count the nodes, words, characters and links.
+    """
+
+    def __init__(self):
+        self.stats = DocStats()
+
+    def enter(self, node: T_NODE):
+        stats = self.stats
+        type_ = node.type
+        stats.n_node += 1
+        counts = stats.type_counts
+        counts[type_] = counts.get(type_, 0) + 1
+
+    def inline(self, node: T_NODE):
+        stats = self.stats
+        counts = stats.type_counts
+        type_ = node.type
+        counts[type_] = counts.get(type_, 0) + 1
+        n_node = 1
+        n_word = n_char = n_link = 0
+        for child in node.content:
+            type_ = child.type
+            if type_ == "text":
+                text = child.text
+                n_word += len(text.split())
+                n_char += len(text)
+                marks = child.__dict__.get("marks")
+                if marks.__class__ is list:
+                    for mark in marks:
+                        if mark.type == "link":
+                            n_link += 1
+            elif child.__dict__.get("content").__class__ is list:  # pragma: no cover
+                # a block node among the inline nodes, it is not valid ADF
+                render_multi(child, [self])
+                continue
+            elif type_ in _card_types:
+                n_link += 1
+            n_node += 1
+            counts[type_] = counts.get(type_, 0) + 1
+        stats.n_node += n_node
+        stats.n_word += n_word
+        stats.n_char += n_char
+        stats.n_link += n_link
+
+    def leaf(self, node: T_NODE):
+        stats = self.stats
+        type_ = node.type
+        stats.n_node += 1
+        counts = stats.type_counts
+        counts[type_] = counts.get(type_, 0) + 1
+        if type_ == "text":
+            text = node.text
+            stats.n_word += len(text.split())
+            stats.n_char += len(text)
+            marks = node.__dict__.get("marks")
+            if marks.__class__ is list:
+                for mark in marks:
+                    if mark.type == "link":
+                        stats.n_link += 1
+        elif type_ in _card_types:
+            stats.n_link += 1
+
+    def result(self) -> DocStats:
+        return self.stats
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+"""
+Outline of a document and on-demand rendering of a single section.
+
+A section starts at a top level heading and ends before the next top level
+heading with the same or a higher level (a smaller ``level`` number).
+
+Example::
+
+    from atlas_doc_parser.api import build_outline, render_section
+
+    outline = build_outline(data)  # the raw ADF data, nothing is parsed
+    for entry in outline.entries:
+        print("  " * (entry.level - 1) + entry.text)
+    # only the blocks of this section are parsed and rendered
+    md = render_section(data, "Installation", outline=outline)
+"""
+
+import typing as T
+import dataclasses
+
+from .arg import NA
+from .base import T_DATA
+from .model import T_NODE, NodeDoc
+
+
+@dataclasses.dataclass
+class OutlineEntry:
+    """
+    A top level heading of the document.
+
+    :param index: the position of this entry in :attr:`Outline.entries`.
+    :param level: the heading level, 1 - 6.
+    :param text: the plain text of the heading.
+    :param start: the index of the heading block in the doc content.
+    :param end: the index of the first block after the section, exclusive,
+        subsections included.
+    :param local_id: the ``attrs.localId`` of the heading, if any.
+    :param parent: the index of the parent entry, None for a top level section.
+    """
+
+    index: int = dataclasses.field()
+    level: int = dataclasses.field()
+    text: str = dataclasses.field()
+    start: int = dataclasses.field()
+    end: int = dataclasses.field()
+    local_id: T.Optional[str] = dataclasses.field(default=None)
+    parent: T.Optional[int] = dataclasses.field(default=None)
+
+
+@dataclasses.dataclass
+class Outline:
+    """
+    All the top level headings of a document, in document order.
+
+    :param entries: the headings.
+    :param n_block: the number of top level blocks in the document.
+    """
+
+    entries: T.List[OutlineEntry] = dataclasses.field(default_factory=list)
+    n_block: int = dataclasses.field(default=0)
+
+    def find(
+        self,
+        text: T.Optional[str] = None,
+        local_id: T.Optional[str] = None,
+    ) -> T.Optional[OutlineEntry]:
+        """
+        Find the first entry that has the given heading text or ``localId``.
+        """
+        for entry in self.entries:
+            if text is not None and entry.text == text:
+                return entry
+            if local_id is not None and entry.local_id == local_id:
+                return entry
+        return None
+
+    def get_children(self, entry: OutlineEntry) -> T.List[OutlineEntry]:
+        """
+        Get the direct subsections of the entry.
+        """
+        children = list()
+        for other in self.entries[entry.index + 1 :]:
+            if other.start >= entry.end:
+                break
+            if other.parent == entry.index:
+                children.append(other)
+        return children
+
+    def get_body_end(self, entry: OutlineEntry) -> int:
+        """
+        Get the index of the first block after the section, subsections excluded.
+        """
+        try:
+            return self.entries[entry.index + 1].start
+        except IndexError:
+            return self.n_block
+
+
+def _get_item(node_or_data: T.Union[T_NODE, T_DATA], key: str) -> T.Any:
+    if isinstance(node_or_data, dict):
+        return node_or_data.get(key)
+    value = node_or_data.__dict__.get(key)
+    if value is None or value.__class__ is NA:
+        return None
+    if key == "attrs":
+        return {k: v for k, v in value.__dict__.items() if v.__class__ is not NA}
+    return value
+
+
+_text_attr_types = {"emoji", "mention", "status"}
+
+
+def _get_plain_text(node_or_data: T.Union[T_NODE, T_DATA]) -> str:
+    """
+    Concatenate the text of the inline nodes, without any markup.
+    """
+    parts = list()
+    stack = [node_or_data]
+    while stack:
+        item = stack.pop()
+        type_ = _get_item(item, "type")
+        if type_ == "text":
+            parts.append(_get_item(item, "text") or "")
+        elif type_ == "hardBreak":
+            parts.append(" ")
+        elif type_ in _text_attr_types:
+            attrs = _get_item(item, "attrs") or {}
+            parts.append(attrs.get("text") or "")
+        content = _get_item(item, "content")
+        if isinstance(content, list):
+            stack.extend(reversed(content))
+    return "".join(parts).strip()
+
+
+def _get_blocks(node_or_data: T.Union[T_NODE, T_DATA]) -> list:
+    content = _get_item(node_or_data, "content")
+    if isinstance(content, list):
+        return content
+    return []
+
+
+def build_outline(node_or_data: T.Union[NodeDoc, T_DATA]) -> Outline:
+    """
+    Build the outline in one pass over the top level blocks.
+
+    :param node_or_data: a parsed ``NodeDoc`` or the raw ADF data of a doc.
+        The raw data is not parsed.
+    """
+    blocks = _get_blocks(node_or_data)
+    outline = Outline(n_block=len(blocks))
+    stack: T.List[OutlineEntry] = list()  # the open sections
+    for ind, block in enumerate(blocks):
+        if _get_item(block, "type") != "heading":
+            continue
+        attrs = _get_item(block, "attrs") or {}
+        level = attrs.get("level") or 1
+        while stack and stack[-1].level >= level:
+            stack.pop().end = ind
+        entry = OutlineEntry(
+            index=len(outline.entries),
+            level=level,
+            text=_get_plain_text(block),
+            start=ind,
+            end=len(blocks),
+            local_id=attrs.get("localId"),
+            parent=stack[-1].index if stack else None,
+        )
+        outline.entries.append(entry)
+        stack.append(entry)
+    return outline
+
+
+def get_section(
+    node_or_data: T.Union[NodeDoc, T_DATA],
+    heading: T.Union[int, str, OutlineEntry],
+    outline: T.Optional[Outline] = None,
+    include_subsections: bool = True,
+    ignore_error: bool = False,
+) -> NodeDoc:
+    """
+    Get a ``NodeDoc`` that only contains the blocks of a section,
+    the heading block included.
+
+    :param node_or_data: a parsed ``NodeDoc`` or the raw ADF data of a doc.
+        For the raw data, only the blocks of the section are parsed.
+    :param heading: the index of the entry in the outline, the heading text,
+        or the :class:`OutlineEntry`.
+    :param outline: the outline of this document, it is built if not given.
+        Reuse it when serving many sections of the same document.
+    :param include_subsections: if False, stop at the first subsection.
+    :param ignore_error: skip the blocks that failed to parse.
+    """
+    if outline is None:
+        outline = build_outline(node_or_data)
+    if isinstance(heading, OutlineEntry):
+        entry = heading
+    elif isinstance(heading, int):
+        entry = outline.entries[heading]
+    else:
+        entry = outline.find(text=heading)
+        if entry is None:
+            raise KeyError(f"heading {heading!r} not found")
+    if include_subsections:
+        end = entry.end
+    else:
+        end = outline.get_body_end(entry)
+
+    blocks = _get_blocks(node_or_data)[entry.start : end]
+    if isinstance(node_or_data, dict):
+        return NodeDoc.from_dict(
+            {
+                "type": "doc",
+                "version": node_or_data.get("version", 1),
+                "content": blocks,
+            },
+            ignore_error=ignore_error,
+        )
+    return NodeDoc(version=node_or_data.version, content=blocks)
+
+
+def render_section(
+    node_or_data: T.Union[NodeDoc, T_DATA],
+    heading: T.Union[int, str, OutlineEntry],
+    outline: T.Optional[Outline] = None,
+    include_subsections: bool = True,
+    ignore_error: bool = False,
+) -> str:
+    """
+    Render the markdown of a section, see :func:`get_section` for the arguments.
+    The result is the same as rendering a doc that only contains the blocks
+    of the section.
+    """
+    doc = get_section(
+        node_or_data,
+        heading,
+        outline=outline,
+        include_subsections=include_subsections,
+        ignore_error=ignore_error,
+    )
+    return doc.to_markdown(ignore_error=ignore_error)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+"""
+Render a short markdown preview of a document, for example for list views.
+
+The top level blocks are parsed and rendered one by one, and the rendering
+stops as soon as the preview is long enough. For the raw ADF data, only a
+prefix of a large block (a long list, a big table or code block) is parsed,
+so the cost is proportional to the preview size, not the document size.
+
+Example::
+
+    from atlas_doc_parser.api import render_preview
+
+    preview = render_preview(data, max_chars=300)
+"""
+
+import typing as T
+
+from .base import T_DATA
+from .exc import LimitExceededError
+from .limits import Limits
+from .model import (
+    T_NODE,
+    NodeDoc,
+    NodeCodeBlock,
+    NodeTable,
+    parse_node,
+    _strip_double_empty_line,
+)
+from .outline import _get_blocks
+from .chunk import _render_block
+
+
+def _cut_line(line: str, budget: int) -> str:
+    """
+    Cut a line at the last word boundary that fits the budget.
+    """
+    line = line[:budget]
+    head, sep, _ = line.rpartition(" ")
+    if sep and head.strip():
+        return head.rstrip()
+    return line
+
+
+def _truncate_block(
+    node: T_NODE,
+    md: str,
+    budget: int,
+) -> T.Tuple[str, bool]:
+    """
+    Truncate the markdown of a block to the budget, at a line boundary, and
+    keep the construct valid: a code block keeps its closing fence and a
+    table keeps its header rows.
+
+    :return: the truncated markdown, and True if the last line was cut
+        in the middle.
+    """
+    lines = md.strip("\n").split("\n")
+    if isinstance(node, NodeCodeBlock):
+        head, body, tail = lines[:1], lines[1:-1], lines[-1:]
+    elif isinstance(node, NodeTable):
+        n_head = 2 if len(lines) >= 2 and lines[1].startswith("| ---") else 0
+        head, body, tail = lines[:n_head], lines[n_head:], []
+    else:
+        head, body, tail = [], lines, []
+
+    size = sum([len(line) + 1 for line in head + tail])
+    if size > budget:
+        return "", False
+    kept = list()
+    is_cut = False
+    for line in body:
+        if size + len(line) + 1 > budget:
+            # the first line of a paragraph or a code block can be cut
+            if not kept and not isinstance(node, NodeTable):
+                line = _cut_line(line, budget - size - 1)
+                if line:
+                    kept.append(line)
+                    is_cut = not isinstance(node, NodeCodeBlock)
+            break
+        kept.append(line)
+        size += len(line) + 1
+    if not kept and not isinstance(node, NodeCodeBlock):
+        return "", False
+    return "\n".join(head + kept + tail), is_cut
+
+
+def _parse_prefix(
+    dct: T_DATA,
+    budget: int,
+    ignore_error: bool,
+) -> T.Tuple[T.Optional[T_NODE], bool]:
+    """
+    Parse a top level block, only the prefix that may fit the budget is
+    parsed if the block is large.
+
+    :return: the node, and True if the block was cut.
+    """
+    # a text character is at most 4 bytes, a node renders at least 0 characters
+    limits = Limits(
+        max_depth=None,
+        max_node=2 * budget + 16,
+        max_text_bytes=4 * budget,
+        max_output_size=None,
+    )
+    try:
+        limits.check_data(dct)
+        is_pruned = False
+    except LimitExceededError:
+        dct = limits.check_data(dct, truncate=True)
+        is_pruned = True
+    return parse_node(dct, ignore_error=ignore_error), is_pruned
+
+
+def render_preview(
+    node_or_data: T.Union[NodeDoc, T_DATA],
+    max_chars: int = 300,
+    max_blocks: T.Optional[int] = None,
+    marker: str = "…",
+    ignore_error: bool = False,
+) -> str:
+    """
+    Render the beginning of a document as markdown.
+
+    The preview has at most ``max_chars`` characters and ``max_blocks`` top
+    level blocks, plus the ``marker`` if the document is truncated. The last
+    block is cut at a line boundary, or at a word boundary for a single long
+    line, and code fences and table headers are kept so the markdown stays
+    valid.
+
+    :param node_or_data: a parsed ``NodeDoc`` or the raw ADF data of a doc.
+        For the raw data, only the blocks in the preview are parsed, and only
+        a prefix of a large block. A parsed block is rendered in full.
+    :param max_chars: the max number of characters, the marker excluded.
+    :param max_blocks: the max number of top level blocks, None for no limit.
+    :param marker: added at the end if the document is truncated.
+    :param ignore_error: skip the blocks that failed to parse or to render.
+    """
+    mds = list()
+    size = 0
+    is_truncated = False
+    is_cut = False
+    n_block = 0
+    for block in _get_blocks(node_or_data):
+        budget = max_chars - size
+        if (max_blocks is not None and n_block >= max_blocks) or budget <= 0:
+            is_truncated = True
+            break
+        try:
+            if isinstance(block, dict):
+                node, is_pruned = _parse_prefix(block, budget, ignore_error)
+                if node is None:
+                    continue
+            else:
+                node, is_pruned = block, False
+            md = _render_block(node)
+        except Exception as e:
+            if ignore_error:
+                continue
+            raise e
+
+        n_block += 1
+        if size + len(md) + 1 > max_chars or is_pruned:
+            md, is_cut = _truncate_block(node, md, budget - 1)
+            if md:
+                mds.append(md)
+            is_truncated = True
+            break
+        mds.append(md)
+        size += len(md) + 1
+
+    md = _strip_double_empty_line("\n".join(mds)).strip()
+    if is_truncated:
+        if is_cut:
+            md = md + marker
+        elif md:
+            md = md + "\n\n" + marker
+        else:
+            md = marker
+    return md
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+"""
+Per node type profiling of parsing and rendering.
+
+The profiler wraps the ``from_dict`` and ``to_markdown`` methods of the node
+classes while it is active, and puts the original methods back when it
+stops, so there is no cost at all when it is not used.
+
+Example::
+
+    from atlas_doc_parser.api import NodeDoc, Profiler
+
+    with Profiler() as prof:
+        doc = NodeDoc.from_dict(data)
+        md = doc.to_markdown()
+    print(prof.to_table())
+
+Or from the command line::
+
+    python -m atlas_doc_parser profile doc.json
+
+The methods are patched on the classes, so the calls of all the threads are
+recorded while a profiler is active, and only one profiler can be active at
+a time.
+"""
+
+import typing as T
+import json
+import time
+import threading
+import dataclasses
+
+from .model import _node_type_to_class_mapping
+
+_phases = ("parse", "render")
+_sort_keys = ("n_call", "cum_time", "self_time", "n_byte")
+
+
+@dataclasses.dataclass
+class TypeProfile:
+    """
+    The profile of one node type in one phase.
+
+    :param type: the node type.
+    :param n_call: the number of calls.
+    :param cum_time: the time in seconds spent in the calls, the children
+        included, the recursive calls are counted once.
+    :param self_time: the time in seconds spent in the calls, the children
+        excluded.
+    :param n_byte: the utf-8 size of the markdown returned by the calls, the
+        children included, always 0 for parsing.
+    """
+
+    type: str = dataclasses.field()
+    n_call: int = dataclasses.field(default=0)
+    cum_time: float = dataclasses.field(default=0.0)
+    self_time: float = dataclasses.field(default=0.0)
+    n_byte: int = dataclasses.field(default=0)
+    _n_active: int = dataclasses.field(default=0, repr=False)
+
+    def to_dict(self) -> T.Dict[str, T.Any]:
+        return {
+            "type": self.type,
+            "n_call": self.n_call,
+            "cum_time": self.cum_time,
+            "self_time": self.self_time,
+            "n_byte": self.n_byte,
+        }
+
+
+_lock = threading.Lock()
+_active_profiler: T.Optional["Profiler"] = None
+
+
+class Profiler:
+    """
+    Record the call count, the cumulative and self time, and the output size
+    per node type, for ``from_dict`` (the ``parse`` phase) and
+    ``to_markdown`` (the ``render`` phase). Use it as a context manager,
+    or call :meth:`start` and :meth:`stop`.
+    """
+
+    def __init__(self):
+        # phase -> node type -> profile
+        self.profiles: T.Dict[str, T.Dict[str, TypeProfile]] = {
+            phase: dict() for phase in _phases
+        }
+        self._local = threading.local()
+        # (class, method name, the attribute in the class dict or None)
+        self._patches: T.List[T.Tuple[type, str, T.Any]] = list()
+
+    def _get_stack(self) -> T.List[float]:
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = list()
+            return self._local.stack
+
+    def _wrap(self, phase: str, type_: str, func: T.Callable) -> T.Callable:
+        profile = TypeProfile(type=type_)
+        self.profiles[phase][type_] = profile
+        get_stack = self._get_stack
+        perf_counter = time.perf_counter
+        is_render = phase == "render"
+
+        def wrapper(*args, **kwargs):
+            stack = get_stack()
+            stack.append(0.0)  # the time of the children
+            profile._n_active += 1
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                profile._n_active -= 1
+                child_time = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                profile.n_call += 1
+                profile.self_time += elapsed - child_time
+                if profile._n_active == 0:
+                    profile.cum_time += elapsed
+            if is_render and result.__class__ is str:
+                profile.n_byte += len(result.encode("utf-8"))
+            return result
+
+        return wrapper
+
+    def start(self) -> "Profiler":
+        global _active_profiler
+        with _lock:
+            if _active_profiler is not None:
+                raise RuntimeError("another profiler is already active")
+            _active_profiler = self
+        for type_, klass in _node_type_to_class_mapping.items():
+            from_dict = klass.from_dict  # bound to the class
+            to_markdown = klass.to_markdown
+            for name in ("from_dict", "to_markdown"):
+                self._patches.append((klass, name, klass.__dict__.get(name)))
+            wrapper = self._wrap("parse", type_, from_dict)
+            klass.from_dict = classmethod(
+                lambda cls, *args, _wrapper=wrapper, **kwargs: _wrapper(*args, **kwargs)
+            )
+            klass.to_markdown = self._wrap("render", type_, to_markdown)
+        return self
+
+    def stop(self) -> "Profiler":
+        global _active_profiler
+        for klass, name, attr in reversed(self._patches):
+            if attr is None:
+                delattr(klass, name)
+            else:
+                setattr(klass, name, attr)
+        self._patches.clear()
+        with _lock:
+            _active_profiler = None
+        return self
+
+    def __enter__(self) -> "Profiler":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def get_profiles(
+        self,
+        phase: str,
+        sort_by: str = "self_time",
+    ) -> T.List[TypeProfile]:
+        """
+        Get the profiles of the node types that were called, in one phase,
+        the most expensive first.
+        """
+        profiles = [p for p in self.profiles[phase].values() if p.n_call]
+        profiles.sort(key=lambda p: getattr(p, sort_by), reverse=True)
+        return profiles
+
+    def to_dict(self, sort_by: str = "self_time") -> T.Dict[str, T.Any]:
+        return {
+            phase: [p.to_dict() for p in self.get_profiles(phase, sort_by)]
+            for phase in _phases
+        }
+
+    def to_json(self, sort_by: str = "self_time", indent: int = 4) -> str:
+        return json.dumps(self.to_dict(sort_by), indent=indent)
+
+    def to_table(
+        self,
+        sort_by: str = "self_time",
+        limit: T.Optional[int] = None,
+    ) -> str:
+        """
+        Format the profiles as a text table, one section per phase.
+
+        :param limit: the max number of node types per phase.
+        """
+        lines = list()
+        header = (
+            f"{'type':<16} {'calls':>8} {'cum ms':>10} {'self ms':>10} "
+            f"{'self %':>7} {'bytes':>10}"
+        )
+        for phase in _phases:
+            profiles = self.get_profiles(phase, sort_by)
+            total = sum([p.self_time for p in profiles]) or 1.0
+            lines.append(f"--- {phase}")
+            lines.append(header)
+            for p in profiles[:limit]:
+                lines.append(
+                    f"{p.type:<16} {p.n_call:>8} {p.cum_time * 1000:>10.3f} "
+                    f"{p.self_time * 1000:>10.3f} "
+                    f"{p.self_time / total * 100:>6.1f}% {p.n_byte:>10}"
+                )
+        return "\n".join(lines)
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+"""
+Two-phase rendering with batched reference resolution.
+
+A mention without ``attrs.text``, a ``file`` or ``link`` media and a card only
+carry an id or a url. Rendering them one by one against a user directory or
+an attachment store is an N+1 problem. Instead:
+
+1. :func:`collect_refs` walks the tree once and collects the unresolved
+   mention ids, media ``(id, collection)`` keys and card urls.
+2. :func:`resolve_refs` calls the user supplied resolver once per kind,
+   with only the keys that are not in the cache.
+3. The tree is rendered inside :func:`use_resolved`, the ``to_markdown``
+   methods of the mention, media, media group and card nodes look up the
+   resolved values.
+
+Example::
+
+    from atlas_doc_parser.api import BaseResolver, ResolveCache, render_resolved
+
+    class MyResolver(BaseResolver):
+        def resolve_mentions(self, ids):
+            return {user.id: user.name for user in directory.get_users(ids)}
+
+    cache = ResolveCache()  # share it between documents
+    md = render_resolved(doc, MyResolver(), cache=cache)
+
+The resolved values are stored in a :class:`contextvars.ContextVar`, so
+concurrent renders in threads or asyncio tasks do not see each other's values.
+"""
+
+import typing as T
+import contextlib
+import contextvars
+import dataclasses
+
+from .arg import NA
+from .tracing import _hooks, Span
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .model import T_NODE
+
+T_MEDIA_KEY = T.Tuple[str, str]  # (id, collection)
+
+
+@dataclasses.dataclass
+class Refs:
+    """
+    The unresolved references of a document, in document order, no duplicates.
+
+    :param mention_ids: the ids of the mentions without ``attrs.text``.
+    :param media_keys: the ``(id, collection)`` of the ``file`` and ``link``
+        media, the collection is ``""`` if missing.
+    :param card_urls: the urls of the inline cards and block cards.
+    """
+
+    mention_ids: T.List[str] = dataclasses.field(default_factory=list)
+    media_keys: T.List[T_MEDIA_KEY] = dataclasses.field(default_factory=list)
+    card_urls: T.List[str] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class Resolved:
+    """
+    The resolved references, a key that could not be resolved is missing
+    or has a None value.
+
+    :param mentions: mention id to display name.
+    :param media: media ``(id, collection)`` to url.
+    :param cards: card url to title.
+    """
+
+    mentions: T.Dict[str, T.Optional[str]] = dataclasses.field(default_factory=dict)
+    media: T.Dict[T_MEDIA_KEY, T.Optional[str]] = dataclasses.field(
+        default_factory=dict
+    )
+    cards: T.Dict[str, T.Optional[str]] = dataclasses.field(default_factory=dict)
+
+
+class BaseResolver:
+    """
+    The base class of the batch resolvers, override the methods of the kinds
+    you can resolve. Each method is called at most once per document, with
+    all the keys of that kind, and returns a dict of the keys it could resolve.
+    """
+
+    def resolve_mentions(self, ids: T.List[str]) -> T.Dict[str, str]:
+        """
+        :return: mention id to display name, for example ``"Alice"``, the ``@``
+            is added when rendering.
+        """
+        return {}
+
+    def resolve_media(self, keys: T.List[T_MEDIA_KEY]) -> T.Dict[T_MEDIA_KEY, str]:
+        """
+        :return: media ``(id, collection)`` to url.
+        """
+        return {}
+
+    def resolve_cards(self, urls: T.List[str]) -> T.Dict[str, str]:
+        """
+        :return: card url to title.
+        """
+        return {}
+
+
+class DictResolver(BaseResolver):
+    """
+    An in-memory resolver, for tests and for data that is already loaded.
+    Each call is recorded in :attr:`calls` as ``(kind, keys)``.
+    """
+
+    def __init__(
+        self,
+        mentions: T.Optional[T.Dict[str, str]] = None,
+        media: T.Optional[T.Dict[T_MEDIA_KEY, str]] = None,
+        cards: T.Optional[T.Dict[str, str]] = None,
+    ):
+        self.mentions = mentions or {}
+        self.media = media or {}
+        self.cards = cards or {}
+        self.calls: T.List[T.Tuple[str, list]] = list()
+
+    def resolve_mentions(self, ids: T.List[str]) -> T.Dict[str, str]:
+        self.calls.append(("mention", ids))
+        return {id_: self.mentions[id_] for id_ in ids if id_ in self.mentions}
+
+    def resolve_media(self, keys: T.List[T_MEDIA_KEY]) -> T.Dict[T_MEDIA_KEY, str]:
+        self.calls.append(("media", keys))
+        return {key: self.media[key] for key in keys if key in self.media}
+
+    def resolve_cards(self, urls: T.List[str]) -> T.Dict[str, str]:
+        self.calls.append(("card", urls))
+        return {url: self.cards[url] for url in urls if url in self.cards}
+
+
+class ResolveCache:
+    """
+    An in-memory cache of the resolved values, shared between documents.
+    The keys that could not be resolved are cached as None, so they are not
+    asked again.
+    """
+
+    def __init__(self):
+        self.data: T.Dict[str, T.Dict[T.Any, T.Optional[str]]] = {
+            "mention": dict(),
+            "media": dict(),
+            "card": dict(),
+        }
+
+    def get_many(
+        self,
+        kind: str,
+        keys: T.List[T.Any],
+    ) -> T.Tuple[T.Dict[T.Any, T.Optional[str]], T.List[T.Any]]:
+        """
+        :return: the cached values, and the keys that are not cached.
+        """
+        data = self.data[kind]
+        hits, misses = dict(), list()
+        for key in keys:
+            if key in data:
+                hits[key] = data[key]
+            else:
+                misses.append(key)
+        return hits, misses
+
+    def set_many(self, kind: str, values: T.Dict[T.Any, T.Optional[str]]):
+        self.data[kind].update(values)
+
+    def fetch_many(
+        self,
+        kind: str,
+        keys: T.List[T.Any],
+        fetch: T.Callable[[T.List[T.Any]], T.Dict[T.Any, str]],
+    ) -> T.Dict[T.Any, T.Optional[str]]:
+        """
+        Get the values of the keys, the keys that are not cached are fetched
+        with one ``fetch`` call, and not at all if there is none.
+        """
+        values, misses = self.get_many(kind, keys)
+        if misses:
+            result = fetch(misses)
+            new_values = {key: result.get(key) for key in misses}
+            self.set_many(kind, new_values)
+            values.update(new_values)
+        return values
+
+
+def _get_attr(node: "T_NODE", name: str) -> T.Optional[str]:
+    attrs = node.__dict__.get("attrs")
+    if attrs is None or attrs.__class__ is NA:
+        return None
+    value = attrs.__dict__.get(name)
+    if isinstance(value, str):
+        return value
+    return None
+
+
+def collect_refs(node: "T_NODE") -> Refs:
+    """
+    Collect the unresolved references in one iterative pass.
+    """
+    mention_ids, media_keys, card_urls = dict(), dict(), dict()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        type_ = node.type
+        if type_ == "mention":
+            if _get_attr(node, "text") is None:
+                id_ = _get_attr(node, "id")
+                if id_ is not None:
+                    mention_ids[id_] = None
+        elif type_ == "media":
+            if _get_attr(node, "type") in ("file", "link"):
+                id_ = _get_attr(node, "id")
+                if id_ is not None:
+                    media_keys[(id_, _get_attr(node, "collection") or "")] = None
+        elif type_ == "inlineCard" or type_ == "blockCard":
+            url = _get_attr(node, "url")
+            if url is not None:
+                card_urls[url] = None
+        content = node.__dict__.get("content")
+        if isinstance(content, list):
+            stack.extend(reversed(content))
+    return Refs(
+        mention_ids=list(mention_ids),
+        media_keys=list(media_keys),
+        card_urls=list(card_urls),
+    )
+
+
+def resolve_refs(
+    refs: Refs,
+    resolver: BaseResolver,
+    cache: T.Optional[ResolveCache] = None,
+) -> Resolved:
+    """
+    Resolve the references, the resolver is called once per kind, only with
+    the keys that are not in the cache, and not at all if there is none.
+    """
+    if cache is None:
+        cache = ResolveCache()
+    resolved = Resolved()
+    for kind, keys, method, values in [
+        ("mention", refs.mention_ids, resolver.resolve_mentions, resolved.mentions),
+        ("media", refs.media_keys, resolver.resolve_media, resolved.media),
+        ("card", refs.card_urls, resolver.resolve_cards, resolved.cards),
+    ]:
+        if keys:
+            values.update(cache.fetch_many(kind, keys, method))
+    return resolved
+
+
+_resolved_var: contextvars.ContextVar[T.Optional[Resolved]] = contextvars.ContextVar(
+    "atlas_doc_parser_resolved", default=None
+)
+
+
+def get_resolved() -> T.Optional[Resolved]:
+    """
+    Get the resolved references of the current render, None outside of
+    :func:`use_resolved`.
+    """
+    return _resolved_var.get()
+
+
+@contextlib.contextmanager
+def use_resolved(resolved: Resolved):
+    """
+    Render with the resolved references inside the ``with`` block.
+    """
+    token = _resolved_var.set(resolved)
+    try:
+        yield resolved
+    finally:
+        _resolved_var.reset(token)
+
+
+def render_resolved(
+    node: "T_NODE",
+    resolver: BaseResolver,
+    cache: T.Optional[ResolveCache] = None,
+    ignore_error: bool = False,
+) -> str:
+    """
+    Collect the references, resolve them in batch, then render the markdown.
+
+    :param cache: reuse the same cache between documents to skip the
+        references that are already resolved.
+    """
+    refs = collect_refs(node)
+    if _hooks:
+        n_ref = len(refs.mention_ids) + len(refs.media_keys) + len(refs.card_urls)
+        with Span("resolve", {"n_ref": n_ref}):
+            resolved = resolve_refs(refs, resolver, cache=cache)
+    else:
+        resolved = resolve_refs(refs, resolver, cache=cache)
+    with use_resolved(resolved):
+        return node.to_markdown(ignore_error=ignore_error)
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+"""
+A resolver cache for long batch runs, shared across documents and threads.
+
+Example::
+
+    from atlas_doc_parser.api import TTLResolveCache, render_resolved
+
+    cache = TTLResolveCache(
+        ttl={"mention": 86400, "media": 3600, "card": 3600},
+        negative_ttl=600,
+        max_size=100_000,
+        path="resolve_cache.json",  # loaded if it exists
+    )
+    for doc in docs:  # or in a thread pool
+        md = render_resolved(doc, resolver, cache=cache)
+    cache.save()  # the next run skips the lookups that are still fresh
+"""
+
+import typing as T
+import os
+import json
+import time
+import threading
+import collections
+
+from .resolve import ResolveCache
+
+_kinds = ("mention", "media", "card")
+
+
+class TTLResolveCache(ResolveCache):
+    """
+    A thread safe :class:`~atlas_doc_parser.resolve.ResolveCache` with:
+
+    - a time to live per kind, and a separate one for the keys that could not
+      be resolved (negative caching).
+    - a max number of entries per kind, the least recently used entries are
+      evicted first.
+    - single-flight: if several threads look up the same key at the same
+      time, only one of them calls the resolver, the others wait for its
+      result.
+    - optional persistence to a local JSON file between runs.
+
+    :param ttl: the time to live in seconds, one value for all the kinds or
+        a dict of kind to value, None means no expiry.
+    :param negative_ttl: the time to live in seconds of the unresolved keys.
+    :param max_size: the max number of entries per kind, None means no limit.
+    :param path: the JSON file used by :meth:`save`, it is loaded if it exists.
+    :param clock: returns the current time in seconds, it has to be the wall
+        clock for the persistence to work.
+    """
+
+    def __init__(
+        self,
+        ttl: T.Union[None, float, T.Dict[str, T.Optional[float]]] = 3600,
+        negative_ttl: T.Optional[float] = 300,
+        max_size: T.Optional[int] = 100_000,
+        path: T.Optional[str] = None,
+        clock: T.Callable[[], float] = time.time,
+    ):
+        if isinstance(ttl, dict):
+            self.ttl = {kind: ttl.get(kind) for kind in _kinds}
+        else:
+            self.ttl = {kind: ttl for kind in _kinds}
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self.path = path
+        self.clock = clock
+        # kind -> key -> (value, expire at or None), in least recently used order
+        self.data: T.Dict[str, T.OrderedDict] = {
+            kind: collections.OrderedDict() for kind in _kinds
+        }
+        # kind -> key -> the event set when the lookup in flight is done
+        self._in_flight: T.Dict[str, T.Dict[T.Any, threading.Event]] = {
+            kind: dict() for kind in _kinds
+        }
+        self._lock = threading.Lock()
+        self.n_hit = 0
+        self.n_miss = 0
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def _get(
+        self,
+        data: T.OrderedDict,
+        key: T.Any,
+        now: float,
+    ) -> T.Tuple[bool, T.Optional[str]]:
+        """
+        Get a value, the caller holds the lock.
+
+        :return: True and the value if it is cached and fresh.
+        """
+        try:
+            value, expire_at = data[key]
+        except KeyError:
+            return False, None
+        if expire_at is not None and expire_at <= now:
+            del data[key]
+            return False, None
+        data.move_to_end(key)
+        return True, value
+
+    def _set(self, kind: str, values: T.Dict[T.Any, T.Optional[str]], now: float):
+        """
+        Set the values, the caller holds the lock.
+        """
+        data = self.data[kind]
+        ttl = self.ttl[kind]
+        for key, value in values.items():
+            t = ttl if value is not None else self.negative_ttl
+            data[key] = (value, None if t is None else now + t)
+            data.move_to_end(key)
+        if self.max_size is not None:
+            while len(data) > self.max_size:
+                data.popitem(last=False)
+
+    def get_many(
+        self,
+        kind: str,
+        keys: T.List[T.Any],
+    ) -> T.Tuple[T.Dict[T.Any, T.Optional[str]], T.List[T.Any]]:
+        data = self.data[kind]
+        now = self.clock()
+        hits, misses = dict(), list()
+        with self._lock:
+            for key in keys:
+                is_hit, value = self._get(data, key, now)
+                if is_hit:
+                    hits[key] = value
+                else:
+                    misses.append(key)
+            self.n_hit += len(hits)
+            self.n_miss += len(misses)
+        return hits, misses
+
+    def set_many(self, kind: str, values: T.Dict[T.Any, T.Optional[str]]):
+        with self._lock:
+            self._set(kind, values, self.clock())
+
+    def fetch_many(
+        self,
+        kind: str,
+        keys: T.List[T.Any],
+        fetch: T.Callable[[T.List[T.Any]], T.Dict[T.Any, str]],
+    ) -> T.Dict[T.Any, T.Optional[str]]:
+        data = self.data[kind]
+        in_flight = self._in_flight[kind]
+        values = dict()
+        owned = list()  # the keys this thread fetches
+        waits = list()  # the keys another thread is fetching
+        with self._lock:
+            now = self.clock()
+            for key in keys:
+                is_hit, value = self._get(data, key, now)
+                if is_hit:
+                    values[key] = value
+                elif key in in_flight:
+                    waits.append((key, in_flight[key]))
+                else:
+                    in_flight[key] = threading.Event()
+                    owned.append(key)
+            self.n_hit += len(values)
+            self.n_miss += len(owned)
+
+        if owned:
+            try:
+                result = fetch(owned)
+                new_values = {key: result.get(key) for key in owned}
+                values.update(new_values)
+                with self._lock:
+                    self._set(kind, new_values, self.clock())
+            finally:
+                with self._lock:
+                    for key in owned:
+                        in_flight.pop(key).set()
+
+        retry = list()
+        for key, event in waits:
+            event.wait()
+            with self._lock:
+                is_hit, value = self._get(data, key, self.clock())
+            if is_hit:
+                values[key] = value
+            else:  # the other lookup failed
+                retry.append(key)
+        if retry:
+            values.update(super().fetch_many(kind, retry, fetch))
+        return values
+
+    # --- persistence
+    def save(self, path: T.Optional[str] = None):
+        """
+        Save the fresh entries to a JSON file, atomically.
+        """
+        path = path or self.path
+        now = self.clock()
+        with self._lock:
+            dump = {
+                kind: [
+                    [list(key) if isinstance(key, tuple) else key, value, expire_at]
+                    for key, (value, expire_at) in self.data[kind].items()
+                    if expire_at is None or expire_at > now
+                ]
+                for kind in _kinds
+            }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(dump, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: T.Optional[str] = None):
+        """
+        Load the entries saved by :meth:`save`, the expired ones are skipped.
+        """
+        path = path or self.path
+        with open(path) as f:
+            dump = json.load(f)
+        now = self.clock()
+        with self._lock:
+            for kind in _kinds:
+                data = self.data[kind]
+                for key, value, expire_at in dump.get(kind, []):
+                    if expire_at is None or expire_at > now:
+                        if isinstance(key, list):
+                            key = tuple(key)
+                        data[key] = (value, expire_at)
+                if self.max_size is not None:
+                    while len(data) > self.max_size:
+                        data.popitem(last=False)
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+"""
+Slow document log, a compact report of each document that takes longer than
+a threshold to parse or render.
+
+Example::
+
+    from atlas_doc_parser.api import SlowLog, add_slow_log
+
+    slow_log = add_slow_log(SlowLog(threshold=0.5, output_dir="slow-docs"))
+    ...  # NodeDoc.from_dict(data).to_markdown() as usual
+    for report in slow_log.reports:
+        print(report.stage, report.duration, report.doc_hash, report.slow_types)
+
+A report has the hash, the size, the node type histogram and the max depth
+of the document, and the slowest node types, found by running the slow stage
+again with a ``sys.setprofile`` hook. The hook is per thread, so in a threaded
+batch the other threads are neither counted nor slowed down. With
+``output_dir``, the ADF of the document is saved as ``<doc_hash>.json`` to
+reproduce it.
+
+A fast document only costs two clock reads and a comparison, the report is
+only built for the slow ones. When no slow log is registered, the library
+only checks that the slow log list is empty.
+"""
+
+import typing as T
+import os
+import sys
+import time
+import collections
+import dataclasses
+
+from .base import T_DATA
+
+
+@dataclasses.dataclass
+class SlowDocReport:
+    """
+    The report of a slow document.
+
+    :param stage: ``parse`` or ``render``.
+    :param duration: the duration of the stage in seconds.
+    :param doc_hash: the first 16 hex digits of the sha256 of the canonical
+        JSON of the document.
+    :param n_byte: the utf-8 size of the compact JSON of the document.
+    :param n_node: the number of nodes, the root included.
+    :param max_depth: the max depth of the tree, the root is at depth 1.
+    :param type_counts: the number of nodes of each type.
+    :param slow_types: the node types with the most self time in the stage,
+        ``(type, seconds)``, the slowest first, empty if not profiled.
+    :param path: the file the document is saved to, None if not saved.
+    :param created_at: the unix time of the report.
+    """
+
+    stage: str = dataclasses.field()
+    duration: float = dataclasses.field()
+    doc_hash: str = dataclasses.field()
+    n_byte: int = dataclasses.field()
+    n_node: int = dataclasses.field()
+    max_depth: int = dataclasses.field()
+    type_counts: T.Dict[str, int] = dataclasses.field(default_factory=dict)
+    slow_types: T.List[T.Tuple[str, float]] = dataclasses.field(default_factory=list)
+    path: T.Optional[str] = dataclasses.field(default=None)
+    created_at: float = dataclasses.field(default=0.0)
+
+    def to_dict(self) -> T.Dict[str, T.Any]:
+        dct = dataclasses.asdict(self)
+        dct["slow_types"] = [list(t) for t in self.slow_types]
+        return dct
+
+
+class SlowLog:
+    """
+    Keep a report of each document that is slower than ``threshold``.
+
+    :param threshold: the threshold in seconds, for parsing and rendering.
+    :param output_dir: the directory to save the ADF of the slow documents
+        to, None to not save them.
+    :param max_report: the number of reports to keep, the oldest are dropped.
+    :param profile: run the slow stage again to find the slowest node types,
+        only the calls of the current thread are timed. It doubles the cost
+        of a slow document, and it is skipped when a
+        :class:`~atlas_doc_parser.profiler.Profiler` or another profile hook
+        of the thread is active.
+    :param n_slow_type: the number of node types in ``slow_types``.
+    :param callback: called with each new report, e.g. to log it.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 1.0,
+        output_dir: T.Optional[str] = None,
+        max_report: int = 100,
+        profile: bool = True,
+        n_slow_type: int = 5,
+        callback: T.Optional[T.Callable[[SlowDocReport], T.Any]] = None,
+    ):
+        self.threshold = threshold
+        self.output_dir = output_dir
+        self.profile = profile
+        self.n_slow_type = n_slow_type
+        self.callback = callback
+        self.reports: T.Deque[SlowDocReport] = collections.deque(maxlen=max_report)
+
+    def record(
+        self,
+        stage: str,
+        duration: float,
+        data: T_DATA,
+        rerun: T.Optional[T.Callable[[], T.Any]] = None,
+    ) -> SlowDocReport:
+        """
+        Build the report of a slow document and keep it.
+
+        :param data: the raw ADF data of the document.
+        :param rerun: run the slow stage again, for the profiler.
+        """
+        # imported on first use, only the slow documents need them
+        import json
+        import hashlib
+        from .stats import get_doc_stats
+
+        text = json.dumps(data, sort_keys=True, separators=(",", ":"))
+        b = text.encode("utf-8")
+        doc_hash = hashlib.sha256(b).hexdigest()[:16]
+        stats = get_doc_stats(data)
+        report = SlowDocReport(
+            stage=stage,
+            duration=duration,
+            doc_hash=doc_hash,
+            n_byte=len(b),
+            n_node=stats.n_node,
+            max_depth=stats.max_depth,
+            type_counts=stats.type_counts,
+            created_at=time.time(),
+        )
+        if self.profile and rerun is not None:
+            report.slow_types = self._get_slow_types(stage, rerun)
+        if self.output_dir is not None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, f"{doc_hash}.json")
+            with open(path, "wb") as f:
+                f.write(b)
+            report.path = path
+        self.reports.append(report)
+        if self.callback is not None:
+            self.callback(report)
+        return report
+
+    def _get_slow_types(
+        self,
+        stage: str,
+        rerun: T.Callable[[], T.Any],
+    ) -> T.List[T.Tuple[str, float]]:
+        from . import profiler
+
+        # the Profiler patches the classes, the rerun would be counted in it
+        if profiler._active_profiler is not None or sys.getprofile() is not None:
+            return []
+        self_times = _get_self_times(stage, rerun)
+        items = sorted(self_times.items(), key=lambda x: x[1], reverse=True)
+        return items[: self.n_slow_type]
+
+
+def _get_stage_codes(stage: str) -> T.Dict[T.Any, str]:
+    """
+    The code objects of the ``from_dict`` (``parse``) or the ``to_markdown``
+    (``render``) methods of the node classes, to the name of their first
+    argument.
+    """
+    from .model import _node_type_to_class_mapping
+
+    codes = dict()
+    for klass in _node_type_to_class_mapping.values():
+        if stage == "parse":
+            codes[klass.from_dict.__func__.__code__] = "cls"
+        else:
+            codes[klass.to_markdown.__code__] = "self"
+    return codes
+
+
+def _get_self_times(
+    stage: str,
+    rerun: T.Callable[[], T.Any],
+) -> T.Dict[str, float]:
+    """
+    Run ``rerun`` with a profile hook on the current thread only, the self
+    time in seconds of each node type in the stage. Nothing is patched, the
+    other threads are not affected. The tracing hooks are muted during the
+    rerun, its spans and its swallowed errors were already reported.
+    """
+    from .model import _node_type_to_class_mapping
+    from .tracing import _muted_var
+
+    codes = _get_stage_codes(stage)
+    class_to_type = {v: k for k, v in _node_type_to_class_mapping.items()}
+    perf_counter = time.perf_counter
+    self_times: T.Dict[str, float] = collections.defaultdict(float)
+    stack: T.List[list] = list()  # [type, frame, start, the time of the children]
+
+    def hook(frame, event, arg):
+        if event == "call":
+            name = codes.get(frame.f_code)
+            if name is not None:
+                obj = frame.f_locals.get(name)
+                if name == "cls":
+                    type_ = class_to_type.get(obj, getattr(obj, "__name__", "?"))
+                else:
+                    type_ = getattr(obj, "type", "?")
+                stack.append([type_, frame, perf_counter(), 0.0])
+        elif event == "return" and stack and stack[-1][1] is frame:
+            type_, _, start, child_time = stack.pop()
+            elapsed = perf_counter() - start
+            self_times[type_] += elapsed - child_time
+            if stack:
+                stack[-1][3] += elapsed
+
+    token = _muted_var.set(True)
+    sys.setprofile(hook)
+    try:
+        rerun()
+    except Exception:
+        pass
+    finally:
+        sys.setprofile(None)
+        _muted_var.reset(token)
+    return dict(self_times)
+
+
+# the registered slow logs, the list is only mutated in place, so the modules
+# can import it and check it with ``if _slow_logs:``
+_slow_logs: T.List[SlowLog] = list()
+
+
+def add_slow_log(slow_log: SlowLog) -> SlowLog:
+    if slow_log not in _slow_logs:
+        _slow_logs.append(slow_log)
+    return slow_log
+
+
+def remove_slow_log(slow_log: SlowLog):
+    if slow_log in _slow_logs:
+        _slow_logs.remove(slow_log)
+
+
+def clear_slow_logs():
+    _slow_logs.clear()
+
+
+def report_slow(
+    stage: str,
+    duration: float,
+    get_data: T.Callable[[], T_DATA],
+    rerun: T.Optional[T.Callable[[], T.Any]] = None,
+):
+    """
+    Record the document in the registered slow logs it is too slow for.
+    An error while building the report is ignored, the conversion itself
+    succeeded.
+
+    :param get_data: get the raw ADF data, only called for a slow document.
+    """
+    data = None
+    for slow_log in list(_slow_logs):
+        if duration >= slow_log.threshold:
+            try:
+                if data is None:
+                    data = get_data()
+                slow_log.record(stage, duration, data, rerun)
+            except Exception:
+                pass
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+"""
+Document statistics without rendering, for capacity planning and scheduling.
+
+The statistics are computed in one iterative pass, from the raw ADF data
+(nothing is parsed) or from a parsed node tree.
+
+Example::
+
+    from atlas_doc_parser.api import get_doc_stats, aggregate_doc_stats
+
+    stats = get_doc_stats(data)
+    print(stats.n_node, stats.max_depth, stats.est_markdown_size)
+
+    total = aggregate_doc_stats(data for data in corpus)
+    print(total.n_doc, total.text_bytes, total.max_n_node)
+"""
+
+import typing as T
+import dataclasses
+
+from .arg import NA
+from .base import T_DATA
+from .model import T_NODE
+
+
+@dataclasses.dataclass
+class NodeStats:
+    """
+    The statistics of one document, or of a corpus after :meth:`merge`.
+
+    :param n_doc: the number of documents.
+    :param n_node: the number of nodes, the root included.
+    :param type_counts: the number of nodes of each type.
+    :param max_depth: the max depth of the tree, the root is at depth 1.
+    :param n_char: the number of characters in the text nodes.
+    :param text_bytes: the utf-8 size of the text nodes.
+    :param n_table: the number of tables.
+    :param n_table_cell: the number of table cells, header cells included.
+    :param max_table_cell: the number of cells of the largest table.
+    :param max_list_depth: the max nesting level of the bullet, ordered and
+        task lists, 0 if there is no list.
+    :param est_markdown_size: the estimated number of characters of
+        ``to_markdown()``. It is a rough estimate, the text plus the
+        typical markup of each node and mark.
+    :param max_n_node: the ``n_node`` of the largest document.
+    """
+
+    n_doc: int = dataclasses.field(default=0)
+    n_node: int = dataclasses.field(default=0)
+    type_counts: T.Dict[str, int] = dataclasses.field(default_factory=dict)
+    max_depth: int = dataclasses.field(default=0)
+    n_char: int = dataclasses.field(default=0)
+    text_bytes: int = dataclasses.field(default=0)
+    n_table: int = dataclasses.field(default=0)
+    n_table_cell: int = dataclasses.field(default=0)
+    max_table_cell: int = dataclasses.field(default=0)
+    max_list_depth: int = dataclasses.field(default=0)
+    est_markdown_size: int = dataclasses.field(default=0)
+    max_n_node: int = dataclasses.field(default=0)
+
+    def merge(self, other: "NodeStats") -> "NodeStats":
+        """
+        Add the statistics of other documents in place, the counts are summed
+        and the ``max_*`` fields take the max.
+        """
+        self.n_doc += other.n_doc
+        self.n_node += other.n_node
+        counts = self.type_counts
+        for type_, count in other.type_counts.items():
+            counts[type_] = counts.get(type_, 0) + count
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.n_char += other.n_char
+        self.text_bytes += other.text_bytes
+        self.n_table += other.n_table
+        self.n_table_cell += other.n_table_cell
+        self.max_table_cell = max(self.max_table_cell, other.max_table_cell)
+        self.max_list_depth = max(self.max_list_depth, other.max_list_depth)
+        self.est_markdown_size += other.est_markdown_size
+        self.max_n_node = max(self.max_n_node, other.max_n_node)
+        return self
+
+
+def _as_dict(item: T.Any) -> T.Optional[dict]:
+    """
+    A raw dict is returned as it is, a node, mark or attrs object is
+    returned as its ``__dict__``, the missing fields have an ``NA`` value.
+    """
+    if item.__class__ is dict:
+        return item
+    if item is None or item.__class__ is NA:
+        return None
+    return item.__dict__
+
+
+def _get_str(dct: T.Optional[dict], key: str) -> str:
+    if dct is None:
+        return ""
+    value = dct.get(key)
+    if isinstance(value, str):
+        return value
+    return ""
+
+
+_list_types = {"bulletList", "orderedList", "taskList"}
+_cell_types = {"tableCell", "tableHeader"}
+
+# the markup that to_markdown() adds around a mark or a node, roughly
+_mark_overhead = {
+    "strong": 4,
+    "em": 2,
+    "code": 2,
+    "strike": 4,
+    "link": 4,
+}
+_node_overhead = {
+    "paragraph": 1,
+    "heading": 6,
+    "hardBreak": 1,
+    "codeBlock": 10,
+    "blockquote": 3,
+    "panel": 16,
+    "listItem": 3,
+    "taskItem": 6,
+    "tableRow": 3,
+    "tableCell": 7,
+    "tableHeader": 13,
+    "rule": 3,
+    "date": 10,
+    "status": 2,
+    "media": 60,
+}
+
+
+def get_doc_stats(node_or_data: T.Union[T_NODE, T_DATA]) -> NodeStats:
+    """
+    Compute the statistics of a document in one iterative pass.
+
+    :param node_or_data: the raw ADF data, or a parsed node.
+        The raw data is not parsed.
+    """
+    counts: T.Dict[str, int] = dict()
+    n_node = max_depth = n_char = text_bytes = 0
+    n_table = n_table_cell = max_table_cell = max_list_depth = est = 0
+    mark_overhead = _mark_overhead
+    node_overhead = _node_overhead
+    list_types = _list_types
+    cell_types = _cell_types
+
+    # (item, depth, list depth)
+    stack = [(node_or_data, 1, 0)]
+    while stack:
+        item, depth, list_depth = stack.pop()
+        dct = _as_dict(item)
+        if dct is None:
+            continue
+        type_ = dct.get("type")
+        n_node += 1
+        counts[type_] = counts.get(type_, 0) + 1
+        if depth > max_depth:
+            max_depth = depth
+        est += node_overhead.get(type_, 0)
+
+        if type_ == "text":
+            text = dct.get("text")
+            if isinstance(text, str):
+                size = len(text)
+                n_char += size
+                est += size
+                text_bytes += size if text.isascii() else len(text.encode("utf-8"))
+            marks = dct.get("marks")
+            if marks.__class__ is list:
+                for mark in marks:
+                    mark = _as_dict(mark)
+                    mark_type = mark.get("type")
+                    est += mark_overhead.get(mark_type, 0)
+                    if mark_type == "link":
+                        est += len(_get_str(_as_dict(mark.get("attrs")), "href"))
+        elif type_ in list_types:
+            list_depth += 1
+            if list_depth > max_list_depth:
+                max_list_depth = list_depth
+        elif (type_ == "listItem" or type_ == "taskItem") and list_depth > 1:
+            # the item line of a nested list is indented
+            est += 4 * (list_depth - 1)
+        elif type_ in cell_types:
+            n_table_cell += 1
+        elif type_ == "table":
+            n_table += 1
+            n_cell = 0
+            rows = dct.get("content")
+            if rows.__class__ is list:
+                for row in rows:
+                    cells = _as_dict(row).get("content")
+                    if cells.__class__ is list:
+                        n_cell += len(cells)
+            if n_cell > max_table_cell:
+                max_table_cell = n_cell
+        elif type_ in ("mention", "emoji", "status"):
+            est += len(_get_str(_as_dict(dct.get("attrs")), "text"))
+        elif type_ in ("inlineCard", "blockCard"):
+            est += 2 * len(_get_str(_as_dict(dct.get("attrs")), "url")) + 4
+        elif type_ == "heading":
+            level = (_as_dict(dct.get("attrs")) or {}).get("level")
+            if isinstance(level, int):
+                est += level
+
+        content = dct.get("content")
+        if content.__class__ is list:
+            depth += 1
+            stack.extend([(child, depth, list_depth) for child in content])
+
+    return NodeStats(
+        n_doc=1,
+        n_node=n_node,
+        type_counts=counts,
+        max_depth=max_depth,
+        n_char=n_char,
+        text_bytes=text_bytes,
+        n_table=n_table,
+        n_table_cell=n_table_cell,
+        max_table_cell=max_table_cell,
+        max_list_depth=max_list_depth,
+        est_markdown_size=est,
+        max_n_node=n_node,
+    )
+
+
+def aggregate_doc_stats(
+    items: T.Iterable[T.Union[T_NODE, T_DATA, NodeStats]],
+) -> NodeStats:
+    """
+    Aggregate the statistics of a corpus. The documents are consumed one by
+    one, so ``items`` can be a generator that loads them lazily.
+
+    :param items: the raw ADF data, the parsed nodes, or the already
+        computed :class:`NodeStats` of the documents.
+    """
+    total = NodeStats()
+    for item in items:
+        if not isinstance(item, NodeStats):
+            item = get_doc_stats(item)
+        total.merge(item)
+    return total
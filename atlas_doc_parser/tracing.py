@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tracing hooks, to feed the conversion stages of each document to a tracer.
+
+A hook gets a start and an end callback for each span. The library opens
+these spans:
+
+- ``parse``: :meth:`NodeDoc.from_dict() <atlas_doc_parser.model.NodeDoc.from_dict>`,
+  with ``n_block`` at the start, ``n_node`` (the parsed nodes) and
+  ``n_dropped`` (the nodes dropped because of an error or an unknown type)
+  at the end.
+- ``render``: :meth:`NodeDoc.to_markdown() <atlas_doc_parser.model.NodeDoc.to_markdown>`,
+  with ``n_char`` at the end.
+- ``resolve``: the batched lookups of :func:`~atlas_doc_parser.resolve.render_resolved`,
+  with ``n_ref`` at the start.
+- ``convert``, ``decode`` and ``write``: the per document stages of
+  :func:`~atlas_doc_parser.batch.convert_jsonl`, with ``index`` and
+  ``n_byte`` (the size of the JSON line), and ``n_error`` at the end.
+  The ``write`` span has the ``n_byte`` of the output line at the end.
+
+A hook also gets an :meth:`~BaseTraceHook.on_error` callback for each node
+error that ``ignore_error=True`` swallows, in the ``parse`` or the
+``render`` stage.
+
+When no hook is registered, the library only checks that the hook list is
+empty, once per document and stage, and once per swallowed error.
+
+Example, an OpenTelemetry adapter::
+
+    from opentelemetry import trace, context
+    from atlas_doc_parser.api import BaseTraceHook, add_trace_hook
+
+    tracer = trace.get_tracer("atlas_doc_parser")
+
+    class OtelHook(BaseTraceHook):
+        def start_span(self, name, attrs):
+            span = tracer.start_span(name, attributes=attrs)
+            token = context.attach(trace.set_span_in_context(span))
+            return span, token
+
+        def end_span(self, handle, name, attrs, error):
+            span, token = handle
+            context.detach(token)
+            span.set_attributes(attrs)
+            if error is not None:
+                span.record_exception(error)
+            span.end()
+
+    add_trace_hook(OtelHook())
+"""
+
+import typing as T
+import time
+import contextvars
+import dataclasses
+
+T_ATTRS = T.Dict[str, T.Any]
+
+
+class BaseTraceHook:
+    """
+    The base class of the tracing hooks, the default callbacks do nothing.
+    An exception raised by a callback is ignored, a broken tracer must not
+    break the conversion.
+    """
+
+    def start_span(self, name: str, attrs: T_ATTRS) -> T.Any:
+        """
+        Called when a span starts.
+
+        :param attrs: the attributes known at the start, the same dict is
+            given to :meth:`end_span` with the attributes added on the way.
+        :return: a handle given back to :meth:`end_span`.
+        """
+        return None
+
+    def end_span(
+        self,
+        handle: T.Any,
+        name: str,
+        attrs: T_ATTRS,
+        error: T.Optional[BaseException],
+    ):
+        """
+        Called when a span ends, also when it ends with an error.
+        """
+        pass
+
+    def on_error(
+        self,
+        stage: str,
+        node_type: T.Optional[str],
+        error: BaseException,
+    ):
+        """
+        Called when a node error is ignored because of ``ignore_error=True``.
+
+        :param stage: ``parse`` or ``render``.
+        :param node_type: the type of the node that is dropped, None if the
+            node data has no type.
+        """
+        pass
+
+
+@dataclasses.dataclass
+class SpanRecord:
+    """
+    A finished span recorded by :class:`RecordHook`.
+
+    :param start: the start time, from :func:`time.perf_counter`.
+    :param duration: the duration in seconds.
+    :param error: the exception that ended the span, or None.
+    """
+
+    name: str = dataclasses.field()
+    start: float = dataclasses.field()
+    duration: float = dataclasses.field()
+    attrs: T_ATTRS = dataclasses.field(default_factory=dict)
+    error: T.Optional[BaseException] = dataclasses.field(default=None)
+
+
+class RecordHook(BaseTraceHook):
+    """
+    A local hook that records the finished spans in :attr:`records`, for
+    tests and ad hoc timing.
+    """
+
+    def __init__(self):
+        self.records: T.List[SpanRecord] = list()
+
+    def start_span(self, name: str, attrs: T_ATTRS) -> float:
+        return time.perf_counter()
+
+    def end_span(
+        self,
+        handle: float,
+        name: str,
+        attrs: T_ATTRS,
+        error: T.Optional[BaseException],
+    ):
+        self.records.append(
+            SpanRecord(
+                name=name,
+                start=handle,
+                duration=time.perf_counter() - handle,
+                attrs=dict(attrs),
+                error=error,
+            )
+        )
+
+    def get_durations(self) -> T.Dict[str, float]:
+        """
+        Get the total duration per span name.
+        """
+        durations = dict()
+        for record in self.records:
+            durations[record.name] = durations.get(record.name, 0.0) + record.duration
+        return durations
+
+
+# the registered hooks, the list is only mutated in place, so the modules
+# can import it and check it with ``if _hooks:``
+_hooks: T.List[BaseTraceHook] = list()
+
+
+def add_trace_hook(hook: BaseTraceHook) -> BaseTraceHook:
+    if hook not in _hooks:
+        _hooks.append(hook)
+    return hook
+
+
+def remove_trace_hook(hook: BaseTraceHook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def clear_trace_hooks():
+    _hooks.clear()
+
+
+# set while the slow log runs a stage again to profile it, the spans and the
+# errors of the rerun are not given to the hooks, they were already reported
+_muted_var: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "atlas_doc_parser_tracing_muted", default=False
+)
+
+
+class Span:
+    """
+    A span of all the registered hooks, use it as a context manager.
+    Only create it when ``_hooks`` is not empty, see :func:`start_span`.
+    """
+
+    def __init__(self, name: str, attrs: T_ATTRS):
+        self.name = name
+        self.attrs = attrs
+        self._handles: T.List[T.Tuple[BaseTraceHook, T.Any]] = list()
+
+    def set(self, **attrs):
+        """
+        Add attributes, they are given to the end callbacks.
+        """
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        if _muted_var.get():
+            return self
+        for hook in list(_hooks):
+            try:
+                self._handles.append((hook, hook.start_span(self.name, self.attrs)))
+            except Exception:
+                pass
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for hook, handle in reversed(self._handles):
+            try:
+                hook.end_span(handle, self.name, self.attrs, exc_val)
+            except Exception:
+                pass
+        return False
+
+
+def report_error(
+    stage: str,
+    node_type: T.Optional[str],
+    error: BaseException,
+):
+    """
+    Call the :meth:`~BaseTraceHook.on_error` of the registered hooks.
+    """
+    if _muted_var.get():
+        return
+    for hook in list(_hooks):
+        try:
+            hook.on_error(stage, node_type, error)
+        except Exception:
+            pass
+
+
+class _NoopSpan:
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_noop_span = _NoopSpan()
+
+
+def start_span(name: str, **attrs) -> T.Union[Span, _NoopSpan]:
+    """
+    Open a span, a shared no-op span if no hook is registered::
+
+        with start_span("decode", n_byte=len(line)) as span:
+            data = json.loads(line)
+            span.set(n_block=len(data["content"]))
+    """
+    if _hooks and not _muted_var.get():
+        return Span(name, attrs)
+    return _noop_span
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+"""
+Iterative traversal of a parsed node tree.
+
+Example::
+
+    from atlas_doc_parser.api import NodeDoc, walk
+
+    doc = NodeDoc.from_dict(data)
+    for node in walk(doc):
+        print(node.type)
+
+    # don't go into tables, get the depth, parent and index of each node
+    for node, depth, parent, index in walk(
+        doc,
+        with_info=True,
+        prune=lambda node: node.type == "table",
+    ):
+        ...
+"""
+
+import typing as T
+import enum
+
+from .model import T_NODE
+
+
+class WalkOrderEnum(str, enum.Enum):
+    pre = "pre"
+    post = "post"
+
+
+T_WALK_INFO = T.Tuple["T_NODE", int, T.Optional["T_NODE"], T.Optional[int]]
+
+
+def _get_content(node: "T_NODE") -> T.Optional[list]:
+    content = node.__dict__.get("content")
+    if content.__class__ is list:
+        return content
+    return None
+
+
+def _walk_pre(
+    root: "T_NODE",
+    prune: T.Optional[T.Callable[["T_NODE"], bool]],
+) -> T.Iterator["T_NODE"]:
+    yield root
+    if prune is not None and prune(root):
+        return
+    content = _get_content(root)
+    if content is None:
+        return
+    stack = [iter(content)]
+    while stack:
+        for node in stack[-1]:
+            yield node
+            if prune is not None and prune(node):
+                continue
+            content = node.__dict__.get("content")
+            if content.__class__ is list and content:
+                stack.append(iter(content))
+                break
+        else:
+            stack.pop()
+
+
+def _walk_pre_with_info(
+    root: "T_NODE",
+    prune: T.Optional[T.Callable[["T_NODE"], bool]],
+) -> T.Iterator[T_WALK_INFO]:
+    yield root, 0, None, None
+    if prune is not None and prune(root):
+        return
+    content = _get_content(root)
+    if content is None:
+        return
+    # each stack frame is (parent, depth of the children, iterator of (index, child))
+    stack = [(root, 1, enumerate(content))]
+    while stack:
+        parent, depth, it = stack[-1]
+        for index, node in it:
+            yield node, depth, parent, index
+            if prune is not None and prune(node):
+                continue
+            content = node.__dict__.get("content")
+            if content.__class__ is list and content:
+                stack.append((node, depth + 1, enumerate(content)))
+                break
+        else:
+            stack.pop()
+
+
+def _walk_post(
+    root: "T_NODE",
+    prune: T.Optional[T.Callable[["T_NODE"], bool]],
+    with_info: bool,
+) -> T.Iterator[T.Union["T_NODE", T_WALK_INFO]]:
+    # each stack frame is (node, depth, parent, index, iterator of (index, child))
+    # the node is yielded when its children iterator is exhausted
+    if prune is not None and prune(root):
+        content = None
+    else:
+        content = _get_content(root)
+    stack = [(root, 0, None, None, enumerate(content or ()))]
+    while stack:
+        frame = stack[-1]
+        for index, node in frame[4]:
+            if prune is not None and prune(node):
+                content = None
+            else:
+                content = node.__dict__.get("content")
+            if content.__class__ is list and content:
+                stack.append((node, frame[1] + 1, frame[0], index, enumerate(content)))
+                break
+            if with_info:
+                yield node, frame[1] + 1, frame[0], index
+            else:
+                yield node
+        else:
+            stack.pop()
+            if with_info:
+                yield frame[:4]
+            else:
+                yield frame[0]
+
+
+def walk(
+    root: "T_NODE",
+    order: T.Union[str, WalkOrderEnum] = WalkOrderEnum.pre,
+    with_info: bool = False,
+    prune: T.Optional[T.Callable[["T_NODE"], bool]] = None,
+) -> T.Iterator[T.Union["T_NODE", T_WALK_INFO]]:
+    """
+    Iterate over all the nodes of the tree, the root node included, without
+    recursion and without building intermediate lists.
+
+    :param root: the root node, usually a ``NodeDoc``.
+    :param order: ``"pre"`` yields a node before its children,
+        ``"post"`` yields a node after its children.
+    :param with_info: if True, yield ``(node, depth, parent, index)`` tuples
+        instead of nodes. ``index`` is the position of the node in
+        ``parent.content``. The root node has depth 0, no parent and no index.
+    :param prune: an optional callback, the children of the node are skipped
+        if it returns True. The node itself is still yielded.
+    """
+    if WalkOrderEnum(order) is WalkOrderEnum.post:
+        return _walk_post(root, prune, with_info)
+    if with_info:
+        return _walk_pre_with_info(root, prune)
+    return _walk_pre(root, prune)
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+
+"""
+Local performance benchmarks. Not shipped with the package.
+"""
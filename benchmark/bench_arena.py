@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare the memory usage and the markdown render speed of the object model
+and the :class:`~atlas_doc_parser.arena.Arena`.
+
+Usage::
+
+    python -m benchmark.bench_arena
+"""
+
+import gc
+import tracemalloc
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.arena import Arena
+
+from .helper import make_large_doc_data, measure
+
+
+def retained_bytes(func) -> int:
+    """
+    Return the number of bytes still allocated by the object ``func()`` returns.
+    """
+    gc.collect()
+    tracemalloc.start()
+    obj = func()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def main(n_block: int = 2000):
+    data = make_large_doc_data(n_block)
+    doc = NodeDoc.from_dict(data)
+    arena = Arena.from_dict(data)
+    assert arena.to_markdown() == doc.to_markdown()
+
+    print(f"doc with {n_block} blocks, {len(arena)} nodes")
+    mem_doc = retained_bytes(lambda: NodeDoc.from_dict(data))
+    mem_arena = retained_bytes(lambda: Arena.from_dict(data))
+    print(f"memory   : object model {mem_doc:>10} bytes, arena {mem_arena:>10} bytes")
+
+    t_doc = measure(lambda: NodeDoc.from_dict(data), repeat=3)
+    t_arena = measure(lambda: Arena.from_dict(data), repeat=3)
+    print(f"build    : object model {t_doc:.4f}s, arena {t_arena:.4f}s")
+
+    t_doc = measure(lambda: doc.to_markdown())
+    t_arena = measure(lambda: arena.to_markdown())
+    print(f"markdown : object model {t_doc:.4f}s, arena {t_arena:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
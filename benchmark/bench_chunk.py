@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+"""
+Chunk a large doc: parse and render everything then split the markdown,
+versus streaming :func:`~atlas_doc_parser.chunk.iter_chunks` over the raw data.
+
+Usage::
+
+    python -m benchmark.bench_chunk
+"""
+
+import tracemalloc
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.chunk import iter_chunks
+
+from .helper import make_large_doc_data, measure
+
+
+def render_then_split(data, max_size):
+    md = NodeDoc.from_dict(data).to_markdown()
+    return [md[i : i + max_size] for i in range(0, len(md), max_size)]
+
+
+def stream(data, max_size):
+    n = 0
+    for _ in iter_chunks(data, max_size=max_size):
+        n += 1
+    return n
+
+
+def peak_memory(func) -> float:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1000000
+
+
+def main(n_block: int = 5000, max_size: int = 2000):
+    data = make_large_doc_data(n_block)
+    print(f"doc with {n_block} blocks, max_size = {max_size}")
+    t = measure(lambda: render_then_split(data, max_size), repeat=1)
+    m = peak_memory(lambda: render_then_split(data, max_size))
+    print(f"render then split      : {t:.4f}s, peak {m:.1f} MB")
+    t = measure(lambda: stream(data, max_size), repeat=1)
+    m = peak_memory(lambda: stream(data, max_size))
+    print(f"iter_chunks, raw data  : {t:.4f}s, peak {m:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+"""
+The throughput and the peak memory of streaming a generated corpus to JSONL.
+
+Usage::
+
+    python -m benchmark.bench_generator
+"""
+
+import os
+import time
+import tempfile
+import tracemalloc
+
+from atlas_doc_parser.generator import GeneratorConfig, write_jsonl
+
+
+def main(n_block: int = 50):
+    config = GeneratorConfig(n_block=n_block)
+    with tempfile.TemporaryDirectory() as dir_path:
+        path = os.path.join(dir_path, "corpus.jsonl")
+        for n_doc in [200, 800]:
+            start = time.perf_counter()
+            n_byte = write_jsonl(path, n_doc=n_doc, config=config)
+            elapsed = time.perf_counter() - start
+            # tracemalloc slows the run down, so it is measured separately
+            tracemalloc.start()
+            write_jsonl(path, n_doc=n_doc, config=config)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"{n_doc:>5} docs: {n_byte / 1024 / 1024:.1f} MiB in {elapsed:.2f}s, "
+                f"{n_byte / 1024 / 1024 / elapsed:.1f} MiB/s, "
+                f"peak memory {peak / 1024:.0f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
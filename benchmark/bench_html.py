@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare :func:`~atlas_doc_parser.html_renderer.to_html` with the
+ADF -> Markdown -> HTML path.
+
+The second path needs the `Markdown <https://pypi.org/project/Markdown/>`_
+package, it is skipped if not installed.
+
+Usage::
+
+    python -m benchmark.bench_html
+"""
+
+import html
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.walk import walk
+from atlas_doc_parser.html_renderer import to_html, escape_text
+
+from .helper import make_large_doc_data, measure
+
+
+def main(n_block: int = 2000):
+    doc = NodeDoc.from_dict(make_large_doc_data(n_block))
+    print(f"doc with {n_block} blocks")
+
+    t = measure(lambda: to_html(doc))
+    print(f"to_html                : {t:.4f}s")
+    try:
+        import markdown
+    except ImportError:  # pragma: no cover
+        print("markdown is not installed, skip the ADF -> Markdown -> HTML path")
+    else:
+        t1 = measure(lambda: markdown.markdown(doc.to_markdown()), repeat=1)
+        print(f"to_markdown + markdown : {t1:.4f}s, {t1 / t:.1f}x slower")
+
+    # the escaping alone, on the text of the doc
+    texts = [node.text for node in walk(doc) if node.type == "text"]
+    t1 = measure(lambda: [html.escape(s, quote=False) for s in texts])
+    t2 = measure(lambda: [escape_text(s) for s in texts])
+    print(f"html.escape, {len(texts)} texts: {t1:.4f}s")
+    print(f"escape_text, {len(texts)} texts: {t2:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
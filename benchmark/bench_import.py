@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""
+The import time of the package, each statement runs in a fresh interpreter.
+
+Usage::
+
+    python -m benchmark.bench_import
+
+The modules with the largest cumulative import time come from
+``python -X importtime``.
+"""
+
+import sys
+import statistics
+import subprocess
+
+statements = [
+    "import atlas_doc_parser.api",
+    "from atlas_doc_parser.api import NodeDoc",
+    "import atlas_doc_parser.model",
+]
+
+
+def get_wall_time(stmt: str, number: int = 15) -> float:
+    """
+    The median wall time in seconds of ``stmt`` in a fresh interpreter,
+    the interpreter startup excluded.
+    """
+    code = (
+        f"import time; t = time.perf_counter(); {stmt}; print(time.perf_counter() - t)"
+    )
+    times = list()
+    for _ in range(number):
+        res = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        times.append(float(res.stdout))
+    return statistics.median(times)
+
+
+def get_import_times(stmt: str) -> dict:
+    """
+    Run ``stmt`` with ``-X importtime``, the module name to the self and the
+    cumulative import time in microseconds.
+    """
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", stmt],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = dict()
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cum_us, name = line[len("import time:") :].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = (int(self_us), int(cum_us))
+    return times
+
+
+def main(top: int = 10):
+    for stmt in statements:
+        print(f"{get_wall_time(stmt) * 1000:7.1f} ms  {stmt}")
+    print()
+    # the modules imported lazily by the api are not reported by importtime
+    times = get_import_times("import atlas_doc_parser.api, atlas_doc_parser.model")
+    items = sorted(times.items(), key=lambda x: x[1][1], reverse=True)
+    print(f"{'module':<32} {'self ms':>8} {'cum ms':>8}")
+    for name, (self_us, cum_us) in items[:top]:
+        print(f"{name:<32} {self_us / 1000:>8.1f} {cum_us / 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare the :class:`~atlas_doc_parser.index.NodeIndex` lookups with a full
+scan of a large doc.
+
+Usage::
+
+    python -m benchmark.bench_index
+"""
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.walk import walk
+
+from .helper import make_large_doc_data, measure
+
+
+def scan_by_type(doc, type_):
+    return [node for node in walk(doc) if node.type == type_]
+
+
+def main(n_block: int = 3000, n_lookup: int = 100):
+    data = make_large_doc_data(n_block)
+    print(f"doc with {n_block} blocks, {n_lookup} lookups")
+    t = measure(lambda: NodeDoc.from_dict(data))
+    print(f"parse                  : {t:.4f}s")
+    t = measure(lambda: NodeDoc.from_dict(data, build_index=True))
+    print(f"parse, build index     : {t:.4f}s")
+
+    doc = NodeDoc.from_dict(data, build_index=True)
+    t = measure(lambda: [scan_by_type(doc, "heading") for _ in range(n_lookup)])
+    print(f"full scan by type      : {t:.4f}s")
+    t = measure(lambda: [doc.get_nodes_by_type("heading") for _ in range(n_lookup)])
+    print(f"index by type          : {t:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""
+The cost of checking the limits, and how fast a hostile document is rejected.
+
+Usage::
+
+    python -m benchmark.bench_limits
+"""
+
+from atlas_doc_parser.exc import LimitExceededError
+from atlas_doc_parser.limits import Limits
+from atlas_doc_parser.model import NodeDoc
+
+from .helper import make_large_doc_data, measure
+
+
+def make_hostile_data(n_text: int) -> dict:
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {
+                "type": "paragraph",
+                "content": [{"type": "text", "text": "x"}] * n_text,
+            }
+        ],
+    }
+
+
+def reject(data, limits):
+    try:
+        NodeDoc.from_dict(data, limits=limits)
+    except LimitExceededError:
+        pass
+
+
+def main(n_block: int = 2000):
+    data = make_large_doc_data(n_block)
+    limits = Limits()
+    print(f"doc with {n_block} blocks")
+    t = measure(lambda: NodeDoc.from_dict(data), repeat=3)
+    print(f"from_dict               : {t:.4f}s")
+    t = measure(lambda: limits.check_data(data))
+    print(f"check_data              : {t:.4f}s")
+
+    n_text = 2_000_000
+    hostile = make_hostile_data(n_text)
+    limits = Limits(max_node=100_000)
+    print(f"paragraph with {n_text} text nodes, max_node = {limits.max_node}")
+    t = measure(lambda: reject(hostile, limits), repeat=3)
+    print(f"rejected in             : {t:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+Produce markdown, plain text and statistics: three separate traversals
+versus one :func:`~atlas_doc_parser.multi_sink.render_multi` pass.
+
+The statistics pass of the three traversals is either the counting loop over
+:func:`~atlas_doc_parser.walk.walk` that a caller writes without this module,
+or a :class:`~atlas_doc_parser.multi_sink.StatsSink` alone.
+
+Usage::
+
+    python -m benchmark.bench_multi_sink
+"""
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.generator import GeneratorConfig, DocGenerator
+from atlas_doc_parser.walk import walk
+from atlas_doc_parser.multi_sink import (
+    DocStats,
+    render_multi,
+    MarkdownSink,
+    TextSink,
+    StatsSink,
+)
+
+from .helper import make_large_doc_data, measure
+
+
+def walk_stats(doc: NodeDoc) -> DocStats:
+    stats = DocStats()
+    counts = stats.type_counts
+    for node in walk(doc):
+        type_ = node.type
+        stats.n_node += 1
+        counts[type_] = counts.get(type_, 0) + 1
+        if type_ == "text":
+            stats.n_word += len(node.text.split())
+            stats.n_char += len(node.text)
+            if isinstance(node.marks, list):
+                for mark in node.marks:
+                    if mark.type == "link":
+                        stats.n_link += 1
+        elif type_ in ("inlineCard", "blockCard"):
+            stats.n_link += 1
+    return stats
+
+
+def three_passes_walk(docs):
+    return [(doc.to_markdown(), doc.to_text(), walk_stats(doc)) for doc in docs]
+
+
+def three_passes_sink(docs):
+    return [
+        (doc.to_markdown(), doc.to_text(), render_multi(doc, [StatsSink()])[0])
+        for doc in docs
+    ]
+
+
+def one_pass(docs):
+    return [
+        render_multi(doc, [MarkdownSink(), TextSink(), StatsSink()]) for doc in docs
+    ]
+
+
+def run(title, docs):
+    for doc in docs:
+        md, text, stats = one_pass([doc])[0]
+        assert md == doc.to_markdown()
+        assert text == doc.to_text()
+        assert stats == walk_stats(doc)
+    print(title)
+    t = measure(lambda: [doc.to_markdown() for doc in docs], repeat=20)
+    print(f"to_markdown only              : {t:.4f}s")
+    t = measure(lambda: three_passes_walk(docs), repeat=20)
+    print(f"three traversals, walk stats  : {t:.4f}s")
+    t = measure(lambda: three_passes_sink(docs), repeat=20)
+    print(f"three traversals, StatsSink   : {t:.4f}s")
+    t = measure(lambda: one_pass(docs), repeat=20)
+    print(f"render_multi, 3 sinks         : {t:.4f}s")
+
+
+def main(n_block: int = 5000, n_doc: int = 20):
+    config = GeneratorConfig(n_block=100)
+    docs = [NodeDoc.from_dict(data) for data in DocGenerator(config).iter_docs(n_doc)]
+    run(f"{n_doc} generated docs with {config.n_block} blocks", docs)
+    docs = [NodeDoc.from_dict(make_large_doc_data(n_block))]
+    run(f"doc with {n_block} blocks of the test cases", docs)
+
+
+if __name__ == "__main__":
+    main()
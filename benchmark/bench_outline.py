@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+"""
+Serve one section of a 10k-block page: render the whole doc versus
+:func:`~atlas_doc_parser.outline.render_section`.
+
+Usage::
+
+    python -m benchmark.bench_outline
+"""
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.outline import build_outline, render_section
+
+from .helper import make_large_doc_data, measure
+
+
+def main(n_block: int = 10000, n_section: int = 200):
+    data = make_large_doc_data(n_block)
+    # insert a heading every ``n_block // n_section`` blocks
+    step = n_block // n_section
+    for i in range(0, n_block, step):
+        data["content"][i] = {
+            "type": "heading",
+            "attrs": {"level": 1 + (i // step) % 3},
+            "content": [{"type": "text", "text": f"Section {i // step}"}],
+        }
+    outline = build_outline(data)
+    entry = outline.entries[len(outline.entries) // 2]
+    print(f"doc with {n_block} blocks, {len(outline.entries)} headings")
+    t = measure(lambda: NodeDoc.from_dict(data).to_markdown(), repeat=1)
+    print(f"parse and render all   : {t:.4f}s")
+    t = measure(lambda: build_outline(data))
+    print(f"build outline          : {t:.4f}s")
+    t = measure(lambda: render_section(data, entry, outline=outline))
+    print(f"render one section     : {t:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
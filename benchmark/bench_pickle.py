@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the pickle size and speed of a large :class:`~atlas_doc_parser.model.NodeDoc`.
+
+Usage::
+
+    python -m benchmark.bench_pickle
+"""
+
+import json
+import pickle
+
+from atlas_doc_parser.model import NodeDoc
+
+from .helper import make_large_doc_data, measure
+
+
+def main(n_block: int = 2000):
+    data = make_large_doc_data(n_block)
+    doc = NodeDoc.from_dict(data)
+
+    b = pickle.dumps(doc, protocol=pickle.HIGHEST_PROTOCOL)
+    assert pickle.loads(b) == doc
+    t_dumps = measure(lambda: pickle.dumps(doc, protocol=pickle.HIGHEST_PROTOCOL))
+    t_loads = measure(lambda: pickle.loads(b))
+
+    # reference: ship the raw ADF json and parse it on the other side
+    s = json.dumps(doc.to_dict())
+    t_json_dumps = measure(lambda: json.dumps(doc.to_dict()), repeat=3)
+    t_json_loads = measure(lambda: NodeDoc.from_dict(json.loads(s)), repeat=3)
+
+    print(f"doc with {n_block} blocks")
+    print(f"pickle: {len(b):>10} bytes, dumps {t_dumps:.4f}s, loads {t_loads:.4f}s")
+    print(
+        f"json  : {len(s):>10} bytes, dumps {t_json_dumps:.4f}s, loads {t_json_loads:.4f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+"""
+A 300 character preview: render the full document and slice, versus
+:func:`~atlas_doc_parser.preview.render_preview`.
+
+Usage::
+
+    python -m benchmark.bench_preview
+"""
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.preview import render_preview
+
+from .helper import make_large_doc_data, measure
+
+
+def main(n_block: int = 2000, max_chars: int = 300):
+    data = make_large_doc_data(n_block)
+    print(f"doc with {n_block} blocks, {max_chars} characters preview")
+    t = measure(lambda: NodeDoc.from_dict(data).to_markdown()[:max_chars], repeat=3)
+    print(f"from_dict + to_markdown + slice: {t:.4f}s")
+    t = measure(lambda: render_preview(data, max_chars=max_chars))
+    print(f"render_preview                 : {t:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
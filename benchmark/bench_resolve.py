@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""
+Resolve the mentions of a document one at a time versus in one batch,
+against a fake directory with a fixed latency per call, and the same ids
+across many documents with and without a shared cache.
+
+Usage::
+
+    python -m benchmark.bench_resolve
+"""
+
+import time
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.resolve import BaseResolver, render_resolved
+from atlas_doc_parser.resolve_cache import TTLResolveCache
+
+from .helper import measure
+
+LATENCY = 0.001  # seconds per call
+
+
+class SlowResolver(BaseResolver):
+    def __init__(self, batch: bool):
+        self.batch = batch
+
+    def resolve_mentions(self, ids):
+        if self.batch:
+            time.sleep(LATENCY)
+        else:
+            for _ in ids:
+                time.sleep(LATENCY)
+        return {id_: f"user {id_}" for id_ in ids}
+
+
+def make_doc(n_mention: int) -> NodeDoc:
+    return NodeDoc.from_dict(
+        {
+            "type": "doc",
+            "version": 1,
+            "content": [
+                {
+                    "type": "paragraph",
+                    "content": [
+                        {"type": "mention", "attrs": {"id": str(i)}},
+                        {"type": "text", "text": " says hi"},
+                    ],
+                }
+                for i in range(n_mention)
+            ],
+        }
+    )
+
+
+def main(n_mention: int = 200):
+    doc = make_doc(n_mention)
+    print(f"{n_mention} mentions, {LATENCY * 1000:.0f} ms per resolver call")
+    t = measure(lambda: render_resolved(doc, SlowResolver(batch=False)), repeat=3)
+    print(f"one call per mention: {t:.4f}s")
+    t = measure(lambda: render_resolved(doc, SlowResolver(batch=True)), repeat=3)
+    print(f"one batched call    : {t:.4f}s")
+
+    n_doc = 50
+    print(f"{n_doc} documents with the same {n_mention} mentions")
+    resolver = SlowResolver(batch=True)
+    t = measure(
+        lambda: [render_resolved(doc, resolver) for _ in range(n_doc)],
+        repeat=3,
+    )
+    print(f"no shared cache     : {t:.4f}s")
+    t = measure(
+        lambda: [
+            render_resolved(doc, resolver, cache=cache)
+            for cache in [TTLResolveCache()]
+            for _ in range(n_doc)
+        ],
+        repeat=3,
+    )
+    print(f"TTLResolveCache     : {t:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
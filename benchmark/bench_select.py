@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare :func:`~atlas_doc_parser.model.parse_node_selective` with a full
+``NodeDoc.from_dict`` followed by a filter.
+
+Usage::
+
+    python -m benchmark.bench_select
+"""
+
+from atlas_doc_parser.type_enum import TypeEnum
+from atlas_doc_parser.model import NodeDoc, parse_node_selective
+
+from .helper import make_large_doc_data, measure
+
+types = {TypeEnum.heading, TypeEnum.mention, TypeEnum.taskItem}
+
+
+def full_parse_then_filter(data):
+    doc = NodeDoc.from_dict(data)
+    nodes = list()
+    stack = [doc]
+    while stack:
+        node = stack.pop()
+        if node.type in {type_.value for type_ in types}:
+            nodes.append(node)
+        content = getattr(node, "content", None)
+        if isinstance(content, list):
+            stack.extend(reversed(content))
+    return nodes
+
+
+def main(n_block: int = 2000):
+    data = make_large_doc_data(n_block)
+    assert len(full_parse_then_filter(data)) == len(parse_node_selective(data, types))
+    t_full = measure(lambda: full_parse_then_filter(data), repeat=3)
+    t_select = measure(lambda: parse_node_selective(data, types), repeat=3)
+    t_prune = measure(
+        lambda: parse_node_selective(data, types, keep_ancestors=True), repeat=3
+    )
+    print(f"doc with {n_block} blocks")
+    print(f"full parse then filter     : {t_full:.4f}s")
+    print(f"selective parse            : {t_select:.4f}s")
+    print(f"selective parse, ancestors : {t_prune:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+"""
+Document statistics from the raw data, versus parsing the doc first.
+
+Usage::
+
+    python -m benchmark.bench_stats
+"""
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.stats import get_doc_stats
+
+from .helper import make_large_doc_data, measure
+
+
+def main(n_block: int = 2000):
+    data = make_large_doc_data(n_block)
+    doc = NodeDoc.from_dict(data)
+    print(f"doc with {n_block} blocks")
+    t = measure(lambda: NodeDoc.from_dict(data), repeat=3)
+    print(f"from_dict              : {t:.4f}s")
+    t = measure(lambda: doc.to_markdown())
+    print(f"to_markdown            : {t:.4f}s")
+    t = measure(lambda: get_doc_stats(data))
+    print(f"get_doc_stats, raw data: {t:.4f}s")
+    t = measure(lambda: get_doc_stats(doc))
+    print(f"get_doc_stats, NodeDoc : {t:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare ``to_text()`` with ``to_markdown()``, and with rendering markdown
+then stripping the syntax with regular expressions, on a large doc built
+from the test corpus.
+
+Usage::
+
+    python -m benchmark.bench_text
+"""
+
+import re
+
+from atlas_doc_parser.model import NodeDoc
+
+from .helper import make_large_doc_data, measure
+
+_md_syntax = [
+    (re.compile(r"^```.*$", re.M), ""),  # code fence
+    (re.compile(r"^\s*(?:[-*]|\d+\.)\s+(?:\[[ x]\]\s+)?", re.M), ""),  # list marker
+    (re.compile(r"^\s*#+\s+", re.M), ""),  # heading
+    (re.compile(r"^\s*>\s?", re.M), ""),  # quote
+    (re.compile(r"^\|(?:\s*---\s*\|)+$", re.M), ""),  # table separator
+    (re.compile(r"\s*\|\s*"), " "),  # table pipe
+    (re.compile(r"!?\[([^\]]*)\]\([^)]*\)"), r"\1"),  # link and image
+    (re.compile(r"(\*\*|~~|\*|`|<br>)"), ""),  # emphasis
+]
+
+
+def markdown_then_strip(doc: NodeDoc) -> str:
+    md = doc.to_markdown()
+    for pattern, repl in _md_syntax:
+        md = pattern.sub(repl, md)
+    return "\n".join(" ".join(line.split()) for line in md.splitlines() if line.strip())
+
+
+def main(n_block: int = 5000):
+    doc = NodeDoc.from_dict(make_large_doc_data(n_block))
+    print(f"doc with {n_block} blocks")
+    t0 = measure(lambda: markdown_then_strip(doc))
+    print(f"to_markdown then strip : {t0:.4f}s")
+    t1 = measure(lambda: doc.to_markdown())
+    print(f"to_markdown            : {t1:.4f}s")
+    t2 = measure(lambda: doc.to_text())
+    print(
+        f"to_text                : {t2:.4f}s, "
+        f"{t0 / t2:.1f}x faster than strip, {t1 / t2:.1f}x faster than to_markdown"
+    )
+    t3 = measure(lambda: sum(1 for _ in doc.iter_text()))
+    print(f"iter_text              : {t3:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
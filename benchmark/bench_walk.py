@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare :func:`~atlas_doc_parser.walk.walk` with a naive recursive traversal
+on a doc with more than 100k nodes.
+
+Usage::
+
+    python -m benchmark.bench_walk
+"""
+
+from atlas_doc_parser.arg import NA
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.walk import walk
+
+from .helper import make_large_doc_data, measure
+
+
+def walk_recursive(node, nodes):
+    nodes.append(node)
+    content = getattr(node, "content", NA())
+    if not isinstance(content, NA):
+        for child in content:
+            walk_recursive(child, nodes)
+    return nodes
+
+
+def count_walk(doc, **kwargs) -> int:
+    n = 0
+    for _ in walk(doc, **kwargs):
+        n += 1
+    return n
+
+
+def main(n_block: int = 9000):
+    doc = NodeDoc.from_dict(make_large_doc_data(n_block))
+    n_node = len(walk_recursive(doc, []))
+    assert count_walk(doc) == n_node
+    print(f"doc with {n_block} blocks, {n_node} nodes")
+    t = measure(lambda: walk_recursive(doc, []))
+    print(f"naive recursion        : {t:.4f}s")
+    t = measure(lambda: count_walk(doc))
+    print(f"walk, pre order        : {t:.4f}s")
+    t = measure(lambda: count_walk(doc, with_info=True))
+    print(f"walk, pre order, info  : {t:.4f}s")
+    t = measure(lambda: count_walk(doc, order="post"))
+    print(f"walk, post order       : {t:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""
+Shared utilities for the benchmark scripts.
+"""
+
+import typing as T
+import copy
+import timeit
+
+from atlas_doc_parser.tests.case import NodeCase, CaseEnum
+
+_block_types = {
+    "blockCard",
+    "blockquote",
+    "bulletList",
+    "codeBlock",
+    "expand",
+    "heading",
+    "mediaSingle",
+    "orderedList",
+    "panel",
+    "paragraph",
+    "rule",
+    "table",
+    "taskList",
+}
+
+
+def get_block_cases() -> T.List[NodeCase]:
+    """
+    Get all the test cases that can be used as a top level block of a doc.
+    """
+    return [
+        case
+        for case in vars(CaseEnum).values()
+        if isinstance(case, NodeCase) and case.data["type"] in _block_types
+    ]
+
+
+def make_large_doc_data(n_block: int = 1000) -> T.Dict[str, T.Any]:
+    """
+    Build a large ADF doc by cycling through the block level test cases.
+    """
+    cases = get_block_cases()
+    content = [copy.deepcopy(cases[i % len(cases)].data) for i in range(n_block)]
+    return {"type": "doc", "version": 1, "content": content}
+
+
+def measure(
+    func: T.Callable,
+    repeat: int = 5,
+    number: int = 1,
+) -> float:
+    """
+    Return the best elapsed seconds of one ``func()`` call.
+    """
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
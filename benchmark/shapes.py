@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+"""
+Generators of ADF documents with different shapes, to see how each code path
+scales. At ``scale=1`` a document has about 1,000 to 6,000 nodes, the size
+grows linearly with ``scale``.
+"""
+
+import typing as T
+
+from atlas_doc_parser.generator import GeneratorConfig, DocGenerator
+
+from .helper import make_large_doc_data
+
+T_DATA = T.Dict[str, T.Any]
+
+_words = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua"
+).split()
+
+
+def _make_sentence(i: int, n_word: int) -> str:
+    return " ".join([_words[(i + j) % len(_words)] for j in range(n_word)])
+
+
+def _make_text(text: str, marks: T.Optional[list] = None) -> T_DATA:
+    dct = {"type": "text", "text": text}
+    if marks:
+        dct["marks"] = marks
+    return dct
+
+
+def _make_para(*texts: T_DATA) -> T_DATA:
+    return {"type": "paragraph", "content": list(texts)}
+
+
+def _make_doc(content: T.List[T_DATA]) -> T_DATA:
+    return {"type": "doc", "version": 1, "content": content}
+
+
+def make_text_heavy(scale: int = 1) -> T_DATA:
+    """
+    A flat page of long paragraphs with a heading every 10 paragraphs.
+    """
+    content = list()
+    for i in range(500 * scale):
+        if i % 10 == 0:
+            content.append(
+                {
+                    "type": "heading",
+                    "attrs": {"level": 2},
+                    "content": [_make_text(f"Section {i // 10}")],
+                }
+            )
+        content.append(_make_para(_make_text(_make_sentence(i, 80))))
+    return _make_doc(content)
+
+
+def _make_list(depth: int, breadth: int, prefix: str) -> T_DATA:
+    items = list()
+    for i in range(breadth):
+        name = f"{prefix}.{i}" if prefix else str(i)
+        content = [_make_para(_make_text(f"item {name}"))]
+        if depth > 1:
+            content.append(_make_list(depth - 1, breadth, name))
+        items.append({"type": "listItem", "content": content})
+    return {"type": "bulletList", "content": items}
+
+
+def make_deep_list(scale: int = 1) -> T_DATA:
+    """
+    Nested bullet lists, 8 levels deep.
+    """
+    return _make_doc(
+        [_make_list(depth=8, breadth=2, prefix="") for _ in range(3 * scale)]
+    )
+
+
+def make_wide_table(scale: int = 1) -> T_DATA:
+    """
+    A table with a header row and 30 columns.
+    """
+    n_col = 30
+
+    def make_row(tag: str, i: int) -> T_DATA:
+        return {
+            "type": "tableRow",
+            "content": [
+                {"type": tag, "content": [_make_para(_make_text(f"r{i}c{j}"))]}
+                for j in range(n_col)
+            ],
+        }
+
+    rows = [make_row("tableHeader", 0)]
+    rows.extend([make_row("tableCell", i) for i in range(1, 60 * scale)])
+    return _make_doc([{"type": "table", "content": rows}])
+
+
+def make_panel_quote(scale: int = 1) -> T_DATA:
+    """
+    Panels and blockquotes, some of them nested.
+    """
+    content = list()
+    for i in range(300 * scale):
+        para = _make_para(_make_text(_make_sentence(i, 12)))
+        if i % 3 == 0:
+            content.append({"type": "blockquote", "content": [para, para]})
+        elif i % 3 == 1:
+            content.append(
+                {
+                    "type": "panel",
+                    "attrs": {"panelType": "info"},
+                    "content": [para, {"type": "blockquote", "content": [para]}],
+                }
+            )
+        else:
+            content.append(
+                {"type": "panel", "attrs": {"panelType": "warning"}, "content": [para]}
+            )
+    return _make_doc(content)
+
+
+_mark_sets = [
+    [{"type": "strong"}],
+    [{"type": "em"}],
+    [{"type": "code"}],
+    [{"type": "strike"}, {"type": "em"}],
+    [{"type": "link", "attrs": {"href": "https://example.com"}}],
+    [{"type": "strong"}, {"type": "link", "attrs": {"href": "https://example.com"}}],
+]
+
+
+def make_mark_dense(scale: int = 1) -> T_DATA:
+    """
+    Paragraphs of many short text nodes, almost all of them with marks.
+    """
+    content = list()
+    for i in range(150 * scale):
+        texts = list()
+        for j in range(20):
+            marks = _mark_sets[(i + j) % len(_mark_sets)] if j % 5 else None
+            texts.append(_make_text(_make_sentence(i + j, 2) + " ", marks))
+        content.append(_make_para(*texts))
+    return _make_doc(content)
+
+
+def make_mixed(scale: int = 1) -> T_DATA:
+    """
+    All the block level test cases, cycled.
+    """
+    return make_large_doc_data(500 * scale)
+
+
+def make_synthetic(scale: int = 1) -> T_DATA:
+    """
+    A seeded random document with every node and mark type.
+    """
+    config = GeneratorConfig(seed=0, n_block=100 * scale, max_depth=4)
+    return DocGenerator(config).make_doc()
+
+
+shapes: T.Dict[str, T.Callable[[int], T_DATA]] = {
+    "text_heavy": make_text_heavy,
+    "deep_list": make_deep_list,
+    "wide_table": make_wide_table,
+    "panel_quote": make_panel_quote,
+    "mark_dense": make_mark_dense,
+    "mixed": make_mixed,
+    "synthetic": make_synthetic,
+}
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+"""
+The benchmark suite: the time, the peak memory and the allocations of
+``from_dict``, ``to_dict`` and ``to_markdown`` for each document shape in
+:mod:`benchmark.shapes`.
+
+Usage::
+
+    # save a baseline
+    python -m benchmark.suite run -o baseline.json
+    # after a change
+    python -m benchmark.suite run -o current.json
+    python -m benchmark.suite compare baseline.json current.json
+
+``compare`` exits with status 1 if a metric is worse than the baseline by
+more than the threshold, so it can gate a CI job.
+"""
+
+import typing as T
+import gc
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+
+from atlas_doc_parser import __version__
+from atlas_doc_parser.model import NodeDoc
+
+from .helper import measure
+from .shapes import shapes
+
+# metric -> True if lower is better, the metrics not listed are informative
+_stages = ["from_dict", "to_dict", "to_markdown"]
+_metrics = {
+    f"{stage}_{metric}": True
+    for stage in _stages
+    for metric in ["s", "peak_kib", "n_alloc"]
+}
+
+
+def _count_nodes(data: dict) -> int:
+    n, stack = 0, [data]
+    while stack:
+        dct = stack.pop()
+        n += 1
+        stack.extend(dct.get("content") or [])
+    return n
+
+
+def _measure_memory(func: T.Callable) -> T.Tuple[float, int]:
+    """
+    :return: the peak memory of ``func()`` in KiB, and the number of memory
+        blocks that its result retains.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    n_alloc = sum([stat.count_diff for stat in after.compare_to(before, "filename")])
+    del result
+    return peak / 1024, n_alloc
+
+
+def run_shape(data: dict, repeat: int = 3) -> T.Dict[str, float]:
+    doc = NodeDoc.from_dict(data)
+    funcs = {
+        "from_dict": lambda: NodeDoc.from_dict(data),
+        "to_dict": lambda: doc.to_dict(),
+        "to_markdown": lambda: doc.to_markdown(),
+    }
+    metrics = {"n_node": _count_nodes(data)}
+    for stage in _stages:
+        metrics[f"{stage}_s"] = measure(funcs[stage], repeat=repeat)
+    for stage in _stages:
+        peak_kib, n_alloc = _measure_memory(funcs[stage])
+        metrics[f"{stage}_peak_kib"] = round(peak_kib, 1)
+        metrics[f"{stage}_n_alloc"] = n_alloc
+    return metrics
+
+
+def run(
+    scale: int = 1,
+    repeat: int = 3,
+    names: T.Optional[T.List[str]] = None,
+) -> dict:
+    results = dict()
+    for name, make in shapes.items():
+        if names and name not in names:
+            continue
+        results[name] = run_shape(make(scale), repeat=repeat)
+        print(f"{name:<12} {json.dumps(results[name])}", file=sys.stderr)
+    return {
+        "meta": {
+            "atlas_doc_parser": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "scale": scale,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    threshold: float = 0.2,
+) -> T.List[T.Tuple[str, str, float, float, float]]:
+    """
+    :return: the regressions, ``(shape, metric, baseline, current, ratio)``.
+    """
+    regressions = list()
+    for shape, base_metrics in baseline["results"].items():
+        metrics = current["results"].get(shape)
+        if metrics is None:
+            continue
+        for metric, lower_is_better in _metrics.items():
+            base, value = base_metrics.get(metric), metrics.get(metric)
+            if not base or value is None:
+                continue
+            ratio = value / base
+            flag = ratio > 1 + threshold if lower_is_better else ratio < 1 - threshold
+            print(
+                f"{shape:<12} {metric:<20} {base:>12.4f} {value:>12.4f} "
+                f"{ratio:>6.2f}x {'REGRESSION' if flag else ''}"
+            )
+            if flag:
+                regressions.append((shape, metric, base, value, ratio))
+    return regressions
+
+
+def main(args: T.Optional[T.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmark.suite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="run the suite")
+    run_parser.add_argument("-o", "--output", help="the JSON result file")
+    run_parser.add_argument("--scale", type=int, default=1)
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--shape", action="append", choices=list(shapes))
+    compare_parser = subparsers.add_parser("compare", help="compare two results")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="the tolerated relative slowdown, 0.2 means 20%%",
+    )
+    ns = parser.parse_args(args)
+
+    if ns.command == "run":
+        result = run(scale=ns.scale, repeat=ns.repeat, names=ns.shape)
+        s = json.dumps(result, indent=4)
+        if ns.output:
+            with open(ns.output, "w") as f:
+                f.write(s)
+        else:
+            print(s)
+        return 0
+    else:
+        with open(ns.baseline) as f:
+            baseline = json.load(f)
+        with open(ns.current) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, threshold=ns.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s)")
+            return 1
+        print("no regression")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ from atlas_doc_parser import api
 def test():
     _ = api
     _ = api.ParamError
+    _ = api.LimitExceededError
     _ = api.TypeEnum
     _ = api.BaseMark
     _ = api.T_MARK
@@ -82,6 +83,79 @@ def test():
     _ = api.NodeTaskList
     _ = api.NodeText
     _ = api.parse_node
+    _ = api.parse_node_selective
+    _ = api.Arena
+    _ = api.FactKindEnum
+    _ = api.LinkFact
+    _ = api.CardFact
+    _ = api.MentionFact
+    _ = api.MediaFact
+    _ = api.DateFact
+    _ = api.TaskFact
+    _ = api.ExtractResult
+    _ = api.extract
+    _ = api.WalkOrderEnum
+    _ = api.walk
+    _ = api.NodeIndex
+    _ = api.OutlineEntry
+    _ = api.Outline
+    _ = api.build_outline
+    _ = api.get_section
+    _ = api.render_section
+    _ = api.Chunk
+    _ = api.iter_chunks
+    _ = api.HtmlRenderer
+    _ = api.to_html
+    _ = api.iter_html
+    _ = api.BaseSink
+    _ = api.render_multi
+    _ = api.MarkdownSink
+    _ = api.TextSink
+    _ = api.StatsSink
+    _ = api.DocStats
+    _ = api.NodeStats
+    _ = api.get_doc_stats
+    _ = api.aggregate_doc_stats
+    _ = api.Limits
+    _ = api.render_preview
+    _ = api.Refs
+    _ = api.Resolved
+    _ = api.BaseResolver
+    _ = api.DictResolver
+    _ = api.ResolveCache
+    _ = api.collect_refs
+    _ = api.resolve_refs
+    _ = api.get_resolved
+    _ = api.use_resolved
+    _ = api.render_resolved
+    _ = api.TTLResolveCache
+    _ = api.GeneratorConfig
+    _ = api.DocGenerator
+    _ = api.write_jsonl
+    _ = api.TypeProfile
+    _ = api.Profiler
+    _ = api.ClassMemory
+    _ = api.MemoryReport
+    _ = api.get_tree_memory
+    _ = api.get_memory_report
+    _ = api.BaseTraceHook
+    _ = api.SpanRecord
+    _ = api.RecordHook
+    _ = api.add_trace_hook
+    _ = api.remove_trace_hook
+    _ = api.clear_trace_hooks
+    _ = api.start_span
+    _ = api.BatchResult
+    _ = api.convert_jsonl
+    _ = api.Counter
+    _ = api.Histogram
+    _ = api.MetricsHook
+    _ = api.start_metrics_server
+    _ = api.SlowDocReport
+    _ = api.SlowLog
+    _ = api.add_slow_log
+    _ = api.remove_slow_log
+    _ = api.clear_slow_logs
 
 
 if __name__ == "__main__":
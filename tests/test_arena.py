@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+from atlas_doc_parser.type_enum import TypeEnum
+from atlas_doc_parser.arena import Arena, NO_VALUE
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.tests.case import NodeCase, CaseEnum
+
+
+def iter_cases():
+    for case in vars(CaseEnum).values():
+        if isinstance(case, NodeCase):
+            yield case
+
+
+class TestArena:
+    def test_from_node(self):
+        for case in iter_cases():
+            arena = Arena.from_node(case.node)
+            assert arena.to_node() == case.node
+            assert arena.to_markdown() == case.node.to_markdown()
+
+    def test_from_dict(self):
+        for case in iter_cases():
+            arena = Arena.from_dict(case.data)
+            assert arena.to_node() == case.node
+            assert arena.to_markdown() == case.node.to_markdown()
+
+    def test_layout(self):
+        data = {
+            "type": "doc",
+            "version": 1,
+            "content": [
+                {
+                    "type": "paragraph",
+                    "content": [
+                        {"type": "text", "text": "Hello "},
+                        {
+                            "type": "text",
+                            "text": "world",
+                            "marks": [{"type": "strong"}, {"type": "unknown"}],
+                        },
+                    ],
+                },
+                {"type": "unknown"},
+                {"type": "heading", "attrs": {"level": 1}, "content": []},
+                {"type": "heading", "attrs": {"level": 1}, "content": []},
+            ],
+        }
+        arena = Arena.from_dict(data)
+        assert len(arena) == 6
+        assert [arena.type_of(i) for i in range(len(arena))] == [
+            "doc",
+            "paragraph",
+            "heading",
+            "heading",
+            "text",
+            "text",
+        ]
+        assert list(arena.parents) == [NO_VALUE, 0, 0, 0, 1, 1]
+        assert arena.children(0) == range(1, 4)
+        assert arena.children(1) == range(4, 6)
+        assert arena.children(2) == range(0)
+        assert arena.children(4) == range(0)
+        assert arena.child_start[4] == NO_VALUE
+        assert arena.text == "Hello world"
+        assert arena.text_of(4) == "Hello "
+        assert arena.text_of(5) == "world"
+        assert arena.text_of(0) is None
+        assert arena.attrs_of(1) is None
+        # identical attrs are stored only once
+        assert arena.attrs[2] == arena.attrs[3]
+        assert len(arena.attrs_list) == 1
+        assert list(arena.mark_types) == [list(TypeEnum).index(TypeEnum.strong)]
+        assert arena.to_dict()["content"][1] == data["content"][2]
+        assert arena.to_node() == NodeDoc.from_dict(data)
+
+    def test_empty_table_row(self):
+        def cell(type_, text):
+            return {
+                "type": type_,
+                "content": [
+                    {"type": "paragraph", "content": [{"type": "text", "text": text}]}
+                ],
+            }
+
+        empty_row = {"type": "tableRow", "content": []}
+        data = {
+            "type": "doc",
+            "version": 1,
+            "content": [
+                {
+                    "type": "table",
+                    "content": [
+                        empty_row,
+                        {
+                            "type": "tableRow",
+                            "content": [
+                                cell("tableHeader", "a"),
+                                cell("tableHeader", "b"),
+                            ],
+                        },
+                        empty_row,
+                        {
+                            "type": "tableRow",
+                            "content": [cell("tableCell", "1"), cell("tableCell", "2")],
+                        },
+                    ],
+                }
+            ],
+        }
+        for ignore_error in [False, True]:
+            md = NodeDoc.from_dict(data, ignore_error=ignore_error).to_markdown(
+                ignore_error=ignore_error
+            )
+            arena = Arena.from_dict(data)
+            assert arena.to_markdown(ignore_error=ignore_error) == md
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(__file__, "atlas_doc_parser.arena", preview=False)
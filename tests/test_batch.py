@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from atlas_doc_parser.batch import convert_jsonl
+from atlas_doc_parser.resolve import DictResolver
+from atlas_doc_parser.tracing import RecordHook, add_trace_hook, clear_trace_hooks
+
+doc = {
+    "type": "doc",
+    "version": 1,
+    "content": [
+        {
+            "type": "paragraph",
+            "content": [{"type": "mention", "attrs": {"id": "u1"}}],
+        }
+    ],
+}
+bad_doc = {"type": "doc", "content": [{"type": "panel"}]}
+
+
+def write_lines(path, datas):
+    path.write_text("\n".join([json.dumps(data) for data in datas]) + "\n\n")
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+
+
+def test_convert_jsonl(tmp_path):
+    input_path, output_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_lines(input_path, [doc, doc])
+    resolver = DictResolver(mentions={"u1": "Alice"})
+    result = convert_jsonl(str(input_path), str(output_path), resolver=resolver)
+    assert (result.n_doc, result.n_error) == (2, 0)
+    assert read_lines(output_path) == [
+        {"index": 0, "markdown": "@Alice\n"},
+        {"index": 1, "markdown": "@Alice\n"},
+    ]
+    # the second document hits the cache
+    assert resolver.calls == [("mention", ["u1"])]
+
+    write_lines(input_path, [bad_doc, doc])
+    with pytest.raises(Exception):
+        convert_jsonl(str(input_path), str(output_path))
+
+
+def test_convert_jsonl_ignore_error(tmp_path):
+    input_path, output_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    input_path.write_text(json.dumps(bad_doc) + "\n{not json\n")
+    hook = add_trace_hook(RecordHook())
+    try:
+        result = convert_jsonl(str(input_path), str(output_path), ignore_error=True)
+    finally:
+        clear_trace_hooks()
+    assert (result.n_doc, result.n_error) == (2, 1)
+    first, second = read_lines(output_path)
+    assert first == {"index": 0, "markdown": ""}
+    assert second["index"] == 1
+    assert second["error"].startswith("JSONDecodeError")
+
+    names = [record.name for record in hook.records]
+    assert names == [
+        "decode",
+        "parse",
+        "render",
+        "write",
+        "convert",
+        "decode",
+        "write",
+        "convert",
+    ]
+    assert hook.records[4].attrs["n_error"] == 0
+    assert hook.records[5].error is not None
+    assert hook.records[7].attrs["n_error"] == 1
+
+
+def test_convert_jsonl_n_byte(tmp_path):
+    input_path, output_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    data = {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {"type": "paragraph", "content": [{"type": "text", "text": "héllo 日本"}]}
+        ],
+    }
+    line = json.dumps(data, ensure_ascii=False) + "\n"
+    input_path.write_bytes(line.encode("utf-8"))
+    hook = add_trace_hook(RecordHook())
+    try:
+        convert_jsonl(str(input_path), str(output_path))
+    finally:
+        clear_trace_hooks()
+    assert read_lines(output_path) == [{"index": 0, "markdown": "héllo 日本\n"}]
+
+    # the utf-8 sizes, not the number of characters
+    records = {record.name: record for record in hook.records}
+    n_byte = len(line.encode("utf-8"))
+    assert n_byte > len(line)
+    assert records["convert"].attrs["n_byte"] == n_byte
+    assert records["decode"].attrs["n_byte"] == n_byte
+    assert records["write"].attrs["n_byte"] == len(output_path.read_bytes())
+    assert records["write"].attrs["n_byte"] > len(output_path.read_text("utf-8"))
+    # the write span doesn't hide the convert span
+    assert records["convert"].attrs["n_error"] == 0
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.batch",
+        preview=False,
+    )
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+
+import re
+import types
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.chunk import iter_chunks
+from atlas_doc_parser.tests.case import CaseEnum
+
+
+def heading(level, text):
+    return {
+        "type": "heading",
+        "attrs": {"level": level},
+        "content": [{"type": "text", "text": text}],
+    }
+
+
+def para(text):
+    return {"type": "paragraph", "content": [{"type": "text", "text": text}]}
+
+
+def code(n_line):
+    text = "\n".join(f"print({i})" for i in range(n_line))
+    return {
+        "type": "codeBlock",
+        "attrs": {"language": "python"},
+        "content": [{"type": "text", "text": text}],
+    }
+
+
+def table(n_row):
+    def cell(type_, text):
+        return {"type": type_, "attrs": {}, "content": [para(text)]}
+
+    rows = [
+        {
+            "type": "tableRow",
+            "content": [cell("tableHeader", "key"), cell("tableHeader", "value")],
+        }
+    ]
+    for i in range(n_row):
+        rows.append(
+            {
+                "type": "tableRow",
+                "content": [cell("tableCell", f"k{i}"), cell("tableCell", f"v{i}")],
+            }
+        )
+    return {"type": "table", "attrs": {}, "content": rows}
+
+
+def item(*content):
+    return {"type": "listItem", "content": list(content)}
+
+
+def make_container_doc_data():
+    n = 40
+    return {
+        "type": "doc",
+        "content": [
+            para("intro"),  # 0
+            {  # 1
+                "type": "bulletList",
+                "content": [
+                    item(
+                        para(f"bullet {i} " * 3),
+                        {
+                            "type": "bulletList",
+                            "content": [
+                                item(para(f"nested {i}.{j}")) for j in range(3)
+                            ],
+                        },
+                    )
+                    for i in range(n)
+                ],
+            },
+            {  # 2
+                "type": "orderedList",
+                "attrs": {"order": 3},
+                "content": [item(para(f"step {i} " * 3)) for i in range(n)],
+            },
+            {  # 3
+                "type": "blockquote",
+                "content": [para(f"quote {i} " * 3) for i in range(n)],
+            },
+            {  # 4
+                "type": "panel",
+                "attrs": {"panelType": "info"},
+                "content": [para(f"panel {i} " * 3) for i in range(n)],
+            },
+            {  # 5
+                "type": "expand",
+                "attrs": {"title": "more"},
+                "content": [para(f"expand {i} " * 3) for i in range(n)],
+            },
+            {  # 6
+                "type": "taskList",
+                "content": [
+                    {
+                        "type": "taskItem",
+                        "attrs": {"state": "TODO"},
+                        "content": [{"type": "text", "text": f"task {i} " * 3}],
+                    }
+                    for i in range(n)
+                ],
+            },
+        ],
+    }
+
+
+def make_doc_data():
+    return {
+        "type": "doc",
+        "content": [
+            para("intro " * 10),  # 0
+            heading(1, "A"),  # 1
+            para("a " * 20),  # 2
+            para("a " * 20),  # 3
+            heading(2, "A.1"),  # 4
+            code(5),  # 5
+            code(100),  # 6
+            heading(1, "B"),  # 7
+            heading(2, "B.1"),  # 8
+            table(3),  # 9
+            table(100),  # 10
+            para("end"),  # 11
+        ],
+    }
+
+
+def render(data, start, end):
+    doc = NodeDoc.from_dict({"type": "doc", "content": data["content"][start:end]})
+    return doc.to_markdown().strip()
+
+
+def test_iter_chunks():
+    data = make_doc_data()
+    assert isinstance(iter_chunks(data), types.GeneratorType)
+
+    max_size = 200
+    chunks = list(iter_chunks(data, max_size=max_size))
+    assert chunks == list(iter_chunks(NodeDoc.from_dict(data), max_size=max_size))
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+
+    # every block is covered, in order
+    covered = list()
+    for chunk in chunks:
+        assert chunk.size == len(chunk.text)
+        assert chunk.size <= max_size
+        if not chunk.is_partial:
+            assert chunk.text == render(data, chunk.start, chunk.end)
+        for ind in range(chunk.start, chunk.end):
+            if not covered or covered[-1] != ind:
+                covered.append(ind)
+    assert covered == list(range(len(data["content"])))
+
+    # heading boundaries and breadcrumb
+    first = {}
+    for chunk in chunks:
+        first.setdefault(chunk.start, chunk)
+    assert first[0].breadcrumb == []
+    assert first[1].breadcrumb == ["A"]
+    assert first[4].breadcrumb == ["A", "A.1"]
+    assert first[7].breadcrumb == ["B"]
+    assert first[7].end > 8  # "# B" and "## B.1" are kept together
+
+    # the small code block is not split, the large one is split by lines
+    code_chunks = [chunk for chunk in chunks if chunk.start == 6]
+    assert len(code_chunks) > 1
+    lines = list()
+    for chunk in code_chunks:
+        assert chunk.is_partial
+        assert chunk.breadcrumb == ["A", "A.1"]
+        assert chunk.text.startswith("```python\n")
+        assert chunk.text.endswith("\n```")
+        lines.extend(chunk.text.split("\n")[1:-1])
+    assert lines == [f"print({i})" for i in range(100)]
+
+    # the large table is split by rows, the header is repeated
+    table_chunks = [chunk for chunk in chunks if chunk.start == 10]
+    assert len(table_chunks) > 1
+    n_row = 0
+    for chunk in table_chunks:
+        rows = chunk.text.split("\n")
+        assert rows[:2] == ["| key<br> | value<br> |", "| --- | --- |"]
+        n_row += len([row for row in rows[2:] if row.startswith("| k")])
+    assert n_row == 100
+    assert table_chunks[-1].end == 12  # the last piece is packed with "end"
+
+
+def test_no_split():
+    data = make_doc_data()
+    chunks = list(iter_chunks(data, max_size=100000, split_on_heading=False))
+    assert len(chunks) == 1
+    assert chunks[0].text == render(data, 0, len(data["content"]))
+
+    chunks = list(iter_chunks(data, max_size=100000))
+    assert [(chunk.start, chunk.end) for chunk in chunks] == [
+        (0, 1),
+        (1, 4),
+        (4, 7),
+        (7, 12),
+    ]
+
+
+def test_empty_table_row():
+    empty_row = {"type": "tableRow", "content": []}
+    for ind in [0, 5]:
+        data = make_doc_data()
+        data["content"][10]["content"].insert(ind, empty_row)
+        doc = NodeDoc.from_dict(data, ignore_error=True)
+        for node_or_data in [data, doc]:
+            chunks = list(iter_chunks(node_or_data, max_size=200, ignore_error=True))
+            assert [chunk for chunk in chunks if chunk.start == 10]
+
+
+def test_split_containers():
+    data = make_container_doc_data()
+    max_size = 300
+    chunks = list(iter_chunks(data, max_size=max_size))
+    for chunk in chunks:
+        assert len(chunk.text) <= max_size
+        assert chunk.size == len(chunk.text)
+
+    def get_text(ind):
+        return "\n".join(chunk.text for chunk in chunks if chunk.start <= ind)
+
+    for ind in range(1, 7):
+        assert len([chunk for chunk in chunks if chunk.start == ind]) > 1
+        assert all(chunk.is_partial for chunk in chunks if chunk.start == ind)
+
+    # every list item is kept, with its nested list
+    text = get_text(1)
+    for i in range(40):
+        assert f"- {'bullet %s ' % i * 3}".strip() in text
+        assert f"    - nested {i}.2" in text
+
+    # the ordered list keeps its numbering
+    numbers = [
+        int(line.split(".")[0])
+        for chunk in chunks
+        if chunk.start == 2
+        for line in chunk.text.split("\n")
+        if re.match(r"\d+\. step", line)
+    ]
+    assert numbers == list(range(3, 43))
+
+    # the panel is repeated around each piece
+    for chunk in chunks:
+        if chunk.start == 4:
+            assert chunk.text.startswith("> **INFO**")
+    for i in range(40):
+        assert f"> panel {i} " in get_text(4)
+        assert f"[ ] task {i} " in get_text(6)
+
+
+def test_split_ignore_error():
+    data = make_container_doc_data()
+    # a block card without url fails to render
+    data["content"][1]["content"][0]["content"].append(
+        {"type": "blockCard", "attrs": {}}
+    )
+    chunks = list(iter_chunks(data, max_size=300, ignore_error=True))
+    assert len([chunk for chunk in chunks if chunk.start == 1]) > 1
+    assert "- bullet 0" in "\n".join(chunk.text for chunk in chunks)
+
+
+def test_size_func():
+    def n_word(text):
+        return len(text.split())
+
+    data = make_doc_data()
+    for chunk in iter_chunks(data, max_size=30, size_func=n_word):
+        assert chunk.size == n_word(chunk.text)
+        assert chunk.size <= 30 or chunk.end - chunk.start == 1
+
+
+def test_cases():
+    for case in vars(CaseEnum).values():
+        if getattr(case, "data", {}).get("type") == "doc":
+            md = case.node.to_markdown().strip()
+            text = "\n".join(
+                chunk.text for chunk in iter_chunks(case.data, max_size=10**9)
+            )
+            assert text.split() == md.split()
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(__file__, "atlas_doc_parser.chunk", preview=False)
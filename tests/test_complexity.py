@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+"""
+Complexity regression tests, parse, serialize and render have to scale
+linearly with the number of nodes, for wide, deep and nested quote documents.
+
+The main check counts the Python function calls (and generator resumes) with
+:func:`sys.setprofile`, it is deterministic, so the tolerance can be tight.
+It catches the per level ``copy.deepcopy``, ``dataclasses.asdict`` and
+``textwrap.indent`` of a subtree, they are all Python level recursions or
+loops. The wall clock check is a looser backup for the work done in C.
+
+The markdown of a deep document is not linear in the number of nodes, each
+line is indented once per level, so the render time is compared per output
+character. Nested quotes still copy the quoted lines once per level, in C,
+that is what the time tolerance allows for.
+"""
+
+import sys
+import time
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.stats import get_doc_stats
+from atlas_doc_parser.generator import GeneratorConfig, DocGenerator
+
+# the max growth of the cost per node when the size doubles
+CALL_TOLERANCE = 1.2
+# the max growth of the time per node when the size is 8 times larger
+TIME_TOLERANCE = 4.0
+
+
+def make_wide_doc(n: int) -> dict:
+    """
+    ``n`` top level blocks of every type, 2 levels of nesting.
+    """
+    config = GeneratorConfig(seed=0, n_block=n, max_depth=2, fan_out=2)
+    return DocGenerator(config).make_doc()
+
+
+def make_deep_doc(n: int) -> dict:
+    """
+    Bullet lists nested ``n`` levels deep.
+    """
+    node = None
+    for i in reversed(range(n)):
+        content = [
+            {"type": "paragraph", "content": [{"type": "text", "text": f"item {i}"}]}
+        ]
+        if node is not None:
+            content.append(node)
+        node = {
+            "type": "bulletList",
+            "content": [{"type": "listItem", "content": content}],
+        }
+    return {"type": "doc", "version": 1, "content": [node]}
+
+
+def make_nested_quote_doc(n: int) -> dict:
+    """
+    Blockquotes and panels nested ``n`` levels deep, with a paragraph at
+    each level.
+    """
+    node = None
+    for i in reversed(range(n)):
+        content = [
+            {"type": "paragraph", "content": [{"type": "text", "text": f"level {i}"}]}
+        ]
+        if node is not None:
+            content.append(node)
+        if i % 2:
+            node = {"type": "panel", "attrs": {"panelType": "info"}, "content": content}
+        else:
+            node = {"type": "blockquote", "content": content}
+    return {"type": "doc", "version": 1, "content": [node]}
+
+
+def count_calls(func) -> int:
+    """
+    Count the Python function calls made by ``func()``.
+    """
+    n_call = 0
+
+    def profile(frame, event, arg):
+        nonlocal n_call
+        if event == "call":
+            n_call += 1
+
+    old_profile = sys.getprofile()
+    sys.setprofile(profile)
+    try:
+        func()
+    finally:
+        sys.setprofile(old_profile)
+    return n_call
+
+
+def time_per_unit(func, n_unit: int, budget: int = 2000) -> float:
+    """
+    The best time of ``func()`` divided by the number of units (nodes or
+    characters), ``func`` is called enough times to process about ``budget``
+    units per round.
+    """
+    number = max(1, budget // n_unit)
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / number / n_unit
+
+
+def get_operations(data: dict) -> dict:
+    doc = NodeDoc.from_dict(data)
+    return {
+        "from_dict": lambda: NodeDoc.from_dict(data),
+        "to_dict": lambda: doc.to_dict(),
+        "to_markdown": lambda: doc.to_markdown(),
+    }
+
+
+def check_scaling(make_doc, n: int):
+    sizes = [n, 2 * n, 4 * n, 8 * n]
+    datas = [make_doc(size) for size in sizes]
+    n_nodes = [get_doc_stats(data).n_node for data in datas]
+    operations = [get_operations(data) for data in datas]
+
+    for name in operations[0]:
+        per_node = [
+            count_calls(ops[name]) / n_node for ops, n_node in zip(operations, n_nodes)
+        ]
+        for size, before, after in zip(sizes[1:], per_node, per_node[1:]):
+            assert after / before <= CALL_TOLERANCE, (
+                f"{make_doc.__name__}, {name}: the function calls per node grow "
+                f"from {before:.1f} to {after:.1f} at size {size}"
+            )
+
+        if name == "to_markdown":
+            units = [len(ops[name]()) for ops in operations]
+            budget = 20000
+        else:
+            units = n_nodes
+            budget = 2000
+        small = time_per_unit(operations[0][name], units[0], budget)
+        large = time_per_unit(operations[-1][name], units[-1], budget)
+        assert large / small <= TIME_TOLERANCE, (
+            f"{make_doc.__name__}, {name}: the time per unit grows "
+            f"{large / small:.1f} times at size {sizes[-1]}"
+        )
+
+
+def test_wide():
+    check_scaling(make_wide_doc, 14)
+
+
+def test_deep():
+    check_scaling(make_deep_doc, 12)
+
+
+def test_nested_quote():
+    check_scaling(make_nested_quote_doc, 12)
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.model",
+        preview=False,
+    )
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.extract import (
+    FactKindEnum,
+    LinkFact,
+    CardFact,
+    MentionFact,
+    MediaFact,
+    DateFact,
+    TaskFact,
+    extract,
+)
+
+data = {
+    "type": "doc",
+    "version": 1,
+    "content": [
+        {
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "Atlassian",
+                    "marks": [
+                        {"type": "strong"},
+                        {
+                            "type": "link",
+                            "attrs": {"href": "http://atlassian.com", "title": "A"},
+                        },
+                    ],
+                },
+                {"type": "mention", "attrs": {"id": "u1", "text": "@Alice"}},
+                {"type": "inlineCard", "attrs": {"url": "https://a.com"}},
+                {"type": "date", "attrs": {"timestamp": "1704067200000"}},
+            ],
+        },
+        {"type": "unknown", "content": [{"type": "mention", "attrs": {"id": "x"}}]},
+        {"type": "blockCard", "attrs": {"url": "https://b.com"}},
+        {
+            "type": "mediaSingle",
+            "attrs": {"layout": "center"},
+            "content": [
+                {
+                    "type": "media",
+                    "attrs": {"type": "file", "id": "m1", "collection": "c1"},
+                }
+            ],
+        },
+        {
+            "type": "taskList",
+            "attrs": {"localId": "l1"},
+            "content": [
+                {
+                    "type": "taskItem",
+                    "attrs": {"state": "DONE", "localId": "t1"},
+                    "content": [{"type": "text", "text": "Do this"}],
+                },
+            ],
+        },
+    ],
+}
+
+
+def test_extract():
+    expected_links = [
+        LinkFact(
+            path="/content/0/content/0/marks/1",
+            href="http://atlassian.com",
+            title="A",
+        )
+    ]
+    expected_cards = [
+        CardFact(path="/content/0/content/2", type="inlineCard", url="https://a.com"),
+        CardFact(path="/content/2", type="blockCard", url="https://b.com"),
+    ]
+    expected_mentions = [
+        MentionFact(path="/content/0/content/1", id="u1", text="@Alice")
+    ]
+    expected_media = [
+        MediaFact(
+            path="/content/3/content/0", id="m1", collection="c1", type="file", url=None
+        )
+    ]
+    expected_dates = [DateFact(path="/content/0/content/3", timestamp="1704067200000")]
+    expected_tasks = [
+        TaskFact(path="/content/4/content/0", state="DONE", local_id="t1")
+    ]
+
+    result = extract(data)
+    assert result.links == expected_links
+    assert result.cards == expected_cards
+    assert result.mentions == expected_mentions
+    assert result.media == expected_media
+    assert result.dates == expected_dates
+    assert result.tasks == expected_tasks
+
+    # the unknown node is dropped by the parser, so the paths shift by one
+    doc = NodeDoc.from_dict(data)
+    result = extract(doc)
+    assert result.links == expected_links
+    assert [fact.path for fact in result.cards] == [
+        "/content/0/content/2",
+        "/content/1",
+    ]
+    assert result.mentions == expected_mentions
+    assert result.media[0].path == "/content/2/content/0"
+    assert result.tasks[0].path == "/content/3/content/0"
+
+
+def test_extract_kinds():
+    result = extract(data, kinds=[FactKindEnum.mention, "task"])
+    assert len(result.mentions) == 1
+    assert len(result.tasks) == 1
+    assert result.links == []
+    assert result.cards == []
+    assert result.media == []
+    assert result.dates == []
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(__file__, "atlas_doc_parser.extract", preview=False)
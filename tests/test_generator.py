@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+from atlas_doc_parser.model import (
+    NodeDoc,
+    _node_type_to_class_mapping,
+    _mark_type_to_class_mapping,
+)
+from atlas_doc_parser.stats import get_doc_stats
+from atlas_doc_parser.generator import GeneratorConfig, DocGenerator, write_jsonl
+
+
+def _get_mark_types(dct: dict, types: set) -> set:
+    for mark in dct.get("marks", []):
+        types.add(mark["type"])
+    for child in dct.get("content", []):
+        _get_mark_types(child, types)
+    return types
+
+
+class TestDocGenerator:
+    def test_coverage(self):
+        data = DocGenerator(GeneratorConfig(n_block=28)).make_doc()
+        stats = get_doc_stats(data)
+        assert set(stats.type_counts) == set(_node_type_to_class_mapping)
+        assert _get_mark_types(data, set()) == set(_mark_type_to_class_mapping)
+
+        doc = NodeDoc.from_dict(data)
+        assert doc.to_dict() == data
+        assert doc.to_markdown()
+
+    def test_seed(self):
+        config = GeneratorConfig(seed=1, n_block=20)
+        assert DocGenerator(config).make_doc() == DocGenerator(config).make_doc()
+        other = DocGenerator(GeneratorConfig(seed=2, n_block=20)).make_doc()
+        assert DocGenerator(config).make_doc() != other
+
+    def test_shape(self):
+        config = GeneratorConfig(
+            n_block=14,
+            max_depth=1,
+            fan_out=2,
+            table_rows=5,
+            table_cols=7,
+            mark_density=0,
+        )
+        data = DocGenerator(config).make_doc()
+        stats = get_doc_stats(data)
+        assert len(data["content"]) == 14
+        assert stats.max_list_depth == 1
+        assert stats.max_table_cell == 35
+        assert _get_mark_types(data, set()) == set()
+
+        config = GeneratorConfig(n_block=14, max_depth=5, mark_density=1)
+        deep = get_doc_stats(DocGenerator(config).make_doc())
+        assert deep.max_depth > stats.max_depth
+
+
+def test_write_jsonl(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    config = GeneratorConfig(n_block=5)
+    n_byte = write_jsonl(str(path), n_doc=3, config=config)
+    assert path.stat().st_size == n_byte
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+    assert [json.loads(line) for line in lines] == list(
+        DocGenerator(config).iter_docs(3)
+    )
+    for line in lines:
+        NodeDoc.from_dict(json.loads(line)).to_markdown()
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.generator",
+        preview=False,
+    )
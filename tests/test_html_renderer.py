@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from atlas_doc_parser.model import (
+    BaseNode,
+    NodeDoc,
+    NodeParagraph,
+    NodeText,
+    MarkLink,
+    MarkLinkAttrs,
+)
+from atlas_doc_parser.html_renderer import (
+    escape_text,
+    escape_attr,
+    safe_url,
+    to_html,
+    iter_html,
+)
+from atlas_doc_parser.tests.case import NodeCase, CaseEnum
+
+
+def test_escape():
+    assert escape_text("<a & b>\"'") == "&lt;a &amp; b&gt;\"'"
+    assert escape_attr("<a & b>\"'") == "&lt;a &amp; b&gt;&quot;&#x27;"
+    assert safe_url("https://example.com") == "https://example.com"
+    assert safe_url("/relative/path?a=b:c") == "/relative/path?a=b:c"
+    assert safe_url(" JavaScript:alert(1)") == "#"
+    assert safe_url("data:text/html,abc") == "#"
+    assert safe_url("mailto:a@b.com") == "mailto:a@b.com"
+    assert safe_url("ftp://example.com") == "#"
+    assert safe_url("#anchor") == "#anchor"
+
+
+# the browsers drop the tabs, the newlines and the leading C0 controls before
+# reading the scheme
+unsafe_urls = [
+    "java\tscript:alert(1)",
+    "java\nscript:alert(1)",
+    "java\rscript:alert(1)",
+    "\x01javascript:alert(1)",
+    "\x00 \x1fjavascript:alert(1)",
+    " \tjava\nscript\t:alert(1)",
+    "vbscript:msgbox(1)",
+]
+
+
+@pytest.mark.parametrize("url", unsafe_urls)
+def test_safe_url_bypass(url: str):
+    assert safe_url(url) == "#"
+
+    def para(*content):
+        return {"type": "paragraph", "content": list(content)}
+
+    doc = NodeDoc.from_dict(
+        {
+            "type": "doc",
+            "content": [
+                para(
+                    {
+                        "type": "text",
+                        "text": "click",
+                        "marks": [{"type": "link", "attrs": {"href": url}}],
+                    },
+                    {"type": "inlineCard", "attrs": {"url": url}},
+                ),
+                {"type": "blockCard", "attrs": {"url": url}},
+                {
+                    "type": "mediaSingle",
+                    "attrs": {"layout": "center"},
+                    "content": [
+                        {"type": "media", "attrs": {"type": "external", "url": url}}
+                    ],
+                },
+            ],
+        }
+    )
+    html = to_html(doc)
+    assert html.count('href="#"') == 3
+    assert html.count('src="#"') == 1
+    assert "script:" not in html.replace(escape_text(url), "")
+
+
+def test_all_cases():
+    for case in vars(CaseEnum).values():
+        if isinstance(case, NodeCase):
+            html = to_html(case.node)
+            assert html.count("<p>") == html.count("</p>")
+            assert html.count("<li") == html.count("</li>")
+
+
+def test_to_html():
+    doc = NodeDoc.from_dict(
+        {
+            "type": "doc",
+            "content": [
+                {
+                    "type": "heading",
+                    "attrs": {"level": 2, "localId": "h"},
+                    "content": [{"type": "text", "text": "a < b"}],
+                },
+                {
+                    "type": "paragraph",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": "click",
+                            "marks": [
+                                {"type": "strong"},
+                                {
+                                    "type": "link",
+                                    "attrs": {"href": "javascript:alert(1)"},
+                                },
+                            ],
+                        },
+                        {"type": "hardBreak"},
+                        {
+                            "type": "status",
+                            "attrs": {"text": "IN PROGRESS", "color": "blue"},
+                        },
+                        {
+                            "type": "text",
+                            "text": "red",
+                            "marks": [
+                                {
+                                    "type": "textColor",
+                                    "attrs": {"color": "red;x:url(a)"},
+                                }
+                            ],
+                        },
+                    ],
+                },
+                {
+                    "type": "panel",
+                    "attrs": {"panelType": "note"},
+                    "content": [{"type": "paragraph", "content": []}],
+                },
+                {
+                    "type": "codeBlock",
+                    "attrs": {"language": "html"},
+                    "content": [{"type": "text", "text": "<b>&</b>"}],
+                },
+            ],
+        }
+    )
+    html = to_html(doc)
+    assert html == (
+        '<h2 id="h">a &lt; b</h2>'
+        '<p><strong><a href="#">click</a></strong><br>'
+        '<span class="adf-status adf-status-blue">IN PROGRESS</span>red</p>'
+        '<div class="adf-panel adf-panel-note"><p></p></div>'
+        '<pre><code class="language-html">&lt;b&gt;&amp;&lt;/b&gt;</code></pre>'
+    )
+    blocks = list(iter_html(doc))
+    assert len(blocks) == 4
+    assert "".join(blocks) == html
+    assert list(iter_html(doc.content[0])) == [blocks[0]]
+
+
+def test_link_title():
+    node = NodeText(
+        text="x",
+        marks=[MarkLink(attrs=MarkLinkAttrs(href="https://a.com", title='"t"'))],
+    )
+    assert to_html(node) == '<a href="https://a.com" title="&quot;t&quot;">x</a>'
+
+
+def test_ignore_error():
+    doc = NodeDoc(
+        content=[
+            NodeParagraph(content=[NodeText(text="a"), BaseNode(type="unknown")]),
+            BaseNode(type="unknown"),
+            NodeParagraph(content=[NodeText(text="b")]),
+        ]
+    )
+    with pytest.raises(NotImplementedError):
+        to_html(doc)
+    with pytest.raises(NotImplementedError):
+        list(iter_html(doc))
+    assert to_html(doc, ignore_error=True) == "<p>a</p><p>b</p>"
+    assert list(iter_html(doc, ignore_error=True)) == ["<p>a</p>", "<p>b</p>"]
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(__file__, "atlas_doc_parser.html_renderer", preview=False)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""
+Import time regression tests, the modules that a statement imports in a fresh
+interpreter are checked, not the time, it is deterministic and it catches an
+eager import of a module that is not needed. See ``benchmark/bench_import.py``
+for the time, from ``python -X importtime``.
+"""
+
+import typing as T
+import sys
+import subprocess
+
+import pytest
+
+from atlas_doc_parser import api
+
+
+def get_imported_modules(stmt: str) -> T.Set[str]:
+    """
+    The modules that ``stmt`` imports, in a fresh interpreter, the modules
+    imported by the interpreter startup excluded.
+    """
+    code = (
+        "import sys; before = set(sys.modules); "
+        f"{stmt}; print(' '.join(set(sys.modules) - before))"
+    )
+    res = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(res.stdout.split())
+
+
+def test_import_api():
+    modules = get_imported_modules("import atlas_doc_parser.api")
+    package_modules = {name for name in modules if name.startswith("atlas_doc_parser")}
+    assert package_modules == {
+        "atlas_doc_parser",
+        "atlas_doc_parser._version",
+        "atlas_doc_parser.api",
+    }
+    assert "dataclasses" not in modules
+
+
+@pytest.mark.parametrize(
+    "stmt",
+    [
+        "from atlas_doc_parser.api import NodeDoc",
+        "import atlas_doc_parser.model",
+    ],
+)
+def test_import_model(stmt: str):
+    modules = get_imported_modules(stmt)
+    assert "atlas_doc_parser.model" in modules
+    # only needed by the optional features, imported on first use
+    for name in [
+        "textwrap",
+        "datetime",
+        "hashlib",
+        "json",
+        "http.server",
+        "tracemalloc",
+        "random",
+        "argparse",
+        "atlas_doc_parser.profiler",
+        "atlas_doc_parser.metrics",
+        "atlas_doc_parser.generator",
+        "atlas_doc_parser.arena",
+    ]:
+        assert name not in modules, name
+
+
+def test_lazy_api():
+    assert set(dir(api)) >= set(api.__all__)
+    assert api.NodeDoc is api.__dict__["NodeDoc"]
+    with pytest.raises(AttributeError):
+        _ = api.NotAName
+
+
+def test_type_checking_imports():
+    """
+    The ``TYPE_CHECKING`` imports of the api match the lazy names.
+    """
+    import ast
+
+    with open(api.__file__, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = dict()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.level == 1:
+            for alias in node.names:
+                names[alias.name] = f".{node.module}"
+    assert names == api._name_to_module
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.api",
+        preview=False,
+    )
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+
+from atlas_doc_parser.type_enum import TypeEnum
+from atlas_doc_parser.model import NodeDoc, NodeParagraph, NodeText
+from atlas_doc_parser.walk import walk
+from atlas_doc_parser.tests.case import NodeCase, CaseEnum
+
+
+def make_doc_data():
+    return {
+        "type": "doc",
+        "content": [
+            {
+                "type": "heading",
+                "attrs": {"level": 1, "localId": "h1"},
+                "content": [{"type": "text", "text": "Title"}],
+            },
+            {
+                "type": "paragraph",
+                "attrs": {"localId": "p1"},
+                "content": [{"type": "text", "text": "hello"}],
+            },
+            {
+                "type": "taskList",
+                "attrs": {"localId": "tl"},
+                "content": [
+                    {
+                        "type": "taskItem",
+                        "attrs": {"state": "TODO", "localId": "t1"},
+                        "content": [{"type": "text", "text": "a"}],
+                    },
+                    {
+                        "type": "taskItem",
+                        "attrs": {"state": "DONE", "localId": "t2"},
+                        "content": [{"type": "text", "text": "b"}],
+                    },
+                ],
+            },
+            {
+                "type": "heading",
+                "attrs": {"level": 2, "localId": "h2"},
+                "content": [{"type": "text", "text": "Section"}],
+            },
+        ],
+    }
+
+
+def get_expected(doc, type_):
+    return [node for node in walk(doc) if node.type == type_]
+
+
+def test_build_index_same_as_lazy():
+    for case in vars(CaseEnum).values():
+        if isinstance(case, NodeCase) and case.data["type"] == "doc":
+            doc1 = NodeDoc.from_dict(case.data, build_index=True)
+            doc2 = NodeDoc.from_dict(case.data)
+            assert doc1 == doc2
+            for node in walk(doc1):
+                expected = get_expected(doc1, node.type)
+                assert doc1.get_nodes_by_type(node.type) == expected
+                assert doc2.get_nodes_by_type(node.type) == expected
+
+
+def test_lookup():
+    doc = NodeDoc.from_dict(make_doc_data(), build_index=True)
+    assert doc._index.is_valid is True
+
+    headings = doc.get_nodes_by_type("heading")
+    assert [h.attrs.localId for h in headings] == ["h1", "h2"]
+    assert [n.text for n in doc.get_nodes_by_type("text")] == [
+        "Title",
+        "hello",
+        "a",
+        "b",
+        "Section",
+    ]
+    assert doc.get_nodes_by_type("table") == []
+    assert doc.get_nodes_by_type(TypeEnum.heading) == headings
+    assert doc._index.get_nodes_by_type(TypeEnum.heading) == headings
+
+    node = doc.get_node_by_local_id("t2")
+    assert node is doc.content[2].content[1]
+    assert doc.get_node_path(node) == "/content/2/content/1"
+    assert doc.get_node_path(doc) == ""
+    assert doc.get_node_by_local_id("not-exists") is None
+    assert doc.get_node_path(NodeText(text="x")) is None
+
+
+def test_mutation():
+    doc = NodeDoc.from_dict(make_doc_data(), build_index=True)
+    t2 = doc.get_node_by_local_id("t2")
+
+    # removal is detected
+    del doc.content[1]
+    assert doc.get_node_path(t2) == "/content/1/content/1"
+    assert doc.get_node_by_local_id("p1") is None
+    assert len(doc.get_nodes_by_type("text")) == 4
+
+    # a localId change is detected when the old localId is looked up
+    t2.attrs.localId = "t3"
+    assert doc.get_node_by_local_id("t2") is None
+    assert doc.get_node_by_local_id("t3") is t2
+
+    # but the new localId is not found until invalidate_index
+    t2.attrs.localId = "t4"
+    assert doc.get_node_by_local_id("t4") is None
+    doc.invalidate_index()
+    assert doc.get_node_by_local_id("t4") is t2
+    assert doc.get_node_by_local_id("t3") is None
+
+    # an added node needs invalidate_index
+    para = NodeParagraph(content=[NodeText(text="new")])
+    doc.content.insert(0, para)
+    doc.invalidate_index()
+    assert doc.get_node_path(para) == "/content/0"
+    assert doc.get_node_path(t2) == "/content/2/content/1"
+    assert doc.get_nodes_by_type("paragraph") == [para]
+
+    # so does a node that replaces another one
+    heading = NodeDoc.from_dict(make_doc_data()).content[0]
+    doc.content[0] = heading
+    assert len(doc.get_nodes_by_type("heading")) == 2
+    doc.invalidate_index()
+    assert doc.get_nodes_by_type("heading") == [heading, doc.content[1], doc.content[3]]
+    assert doc.get_nodes_by_type("paragraph") == []
+
+
+def test_ignore_error():
+    data = make_doc_data()
+    data["content"].append(
+        {
+            "type": "paragraph",
+            "content": [
+                {"type": "text", "text": "kept"},
+                {"type": "mention", "attrs": {}},
+            ],
+        }
+    )
+    doc = NodeDoc.from_dict(data, ignore_error=True, build_index=True)
+    assert doc._index.is_valid is False
+    assert doc.get_nodes_by_type("text")[-1].text == "kept"
+    assert doc.get_nodes_by_type("mention") == []
+
+
+def test_pickle():
+    doc = NodeDoc.from_dict(make_doc_data(), build_index=True)
+    doc1 = pickle.loads(pickle.dumps(doc))
+    assert doc1 == doc
+    assert doc1._index.is_valid is False
+    node = doc1.get_node_by_local_id("t1")
+    assert doc1.get_node_path(node) == "/content/2/content/0"
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(__file__, "atlas_doc_parser.index", preview=False)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from atlas_doc_parser.exc import LimitExceededError
+from atlas_doc_parser.limits import Limits
+from atlas_doc_parser.model import NodeDoc
+
+
+def make_para(text: str) -> dict:
+    return {"type": "paragraph", "content": [{"type": "text", "text": text}]}
+
+
+def make_doc(*blocks) -> dict:
+    return {"type": "doc", "version": 1, "content": list(blocks)}
+
+
+def make_deep_list(depth: int) -> dict:
+    node = make_para("leaf")
+    for _ in range(depth):
+        node = {
+            "type": "bulletList",
+            "content": [{"type": "listItem", "content": [node]}],
+        }
+    return node
+
+
+def test_max_depth():
+    data = make_doc(make_deep_list(10))  # depth 23
+    NodeDoc.from_dict(data, limits=Limits(max_depth=23))
+    with pytest.raises(LimitExceededError) as e:
+        NodeDoc.from_dict(data, limits=Limits(max_depth=10))
+    assert e.value.name == "max_depth"
+    assert e.value.limit == 10
+
+    doc = NodeDoc.from_dict(data, ignore_error=True, limits=Limits(max_depth=10))
+    md = doc.to_markdown()
+    assert "leaf" not in md
+    # the raw data is not modified
+    NodeDoc.from_dict(data, limits=Limits(max_depth=23))
+
+
+def test_max_node():
+    data = make_doc(*[make_para(str(i)) for i in range(10)])  # 21 nodes
+    NodeDoc.from_dict(data, limits=Limits(max_node=21))
+    with pytest.raises(LimitExceededError) as e:
+        NodeDoc.from_dict(data, limits=Limits(max_node=20))
+    assert e.value.name == "max_node"
+
+    # the first nodes in document order are kept
+    doc = NodeDoc.from_dict(data, ignore_error=True, limits=Limits(max_node=6))
+    assert doc.to_markdown() == "0\n\n1\n\n"
+
+
+def test_max_text_bytes():
+    data = make_doc(make_para("héllo"), make_para("world"))  # 6 + 5 bytes
+    NodeDoc.from_dict(data, limits=Limits(max_text_bytes=11))
+    with pytest.raises(LimitExceededError) as e:
+        NodeDoc.from_dict(data, limits=Limits(max_text_bytes=10))
+    assert e.value.name == "max_text_bytes"
+    assert e.value.value == 11
+
+    doc = NodeDoc.from_dict(data, ignore_error=True, limits=Limits(max_text_bytes=9))
+    assert doc.to_markdown() == "héllo\n\nwor\n"
+    # a multi-byte character is not cut in the middle
+    doc = NodeDoc.from_dict(data, ignore_error=True, limits=Limits(max_text_bytes=2))
+    assert doc.content[0].content[0].text == "h"
+
+
+def test_max_output_size():
+    doc = NodeDoc.from_dict(make_doc(*[make_para("a" * 10) for _ in range(100)]))
+    limits = Limits(max_output_size=1000)
+    assert doc.to_markdown(limits=Limits(max_output_size=2000)) == doc.to_markdown()
+    with pytest.raises(LimitExceededError) as e:
+        doc.to_markdown(limits=limits)
+    assert e.value.name == "max_output_size"
+    assert len(doc.to_markdown(ignore_error=True, limits=limits)) == 1000
+
+
+def test_default_limits():
+    data = make_doc(make_deep_list(100))
+    with pytest.raises(LimitExceededError):
+        NodeDoc.from_dict(data, limits=Limits())
+    assert Limits().check_output("abc") == "abc"
+
+
+def test_non_dict_content():
+    data = make_doc("garbage", make_para("hello"), 1, None)
+    expected = NodeDoc.from_dict(data, ignore_error=True).to_markdown()
+    assert "hello" in expected
+    doc = NodeDoc.from_dict(data, ignore_error=True, limits=Limits())
+    assert doc.to_markdown() == expected
+    # the parser reports the bad child, the same way as without limits
+    with pytest.raises(Exception) as e1:
+        NodeDoc.from_dict(data)
+    with pytest.raises(Exception) as e2:
+        NodeDoc.from_dict(data, limits=Limits())
+    assert e1.type is e2.type
+    assert Limits().check_data(data) is data
+    assert Limits().check_data(data, truncate=True)["content"] == [make_para("hello")]
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.limits",
+        preview=False,
+    )
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import json
+import sys
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.memory import (
+    ClassMemory,
+    get_tree_memory,
+    get_memory_report,
+)
+from atlas_doc_parser.generator import GeneratorConfig, DocGenerator
+from atlas_doc_parser.cli import main
+
+data = {
+    "type": "doc",
+    "version": 1,
+    "content": [
+        {
+            "type": "paragraph",
+            "content": [
+                {"type": "text", "text": "hello "},
+                {"type": "text", "text": "world", "marks": [{"type": "strong"}]},
+            ],
+        }
+    ],
+}
+
+
+def test_get_tree_memory():
+    doc = NodeDoc.from_dict(data)
+    classes = get_tree_memory(doc)
+    assert {name: c.n_instance for name, c in classes.items()} == {
+        "NodeDoc": 1,
+        "NodeParagraph": 1,
+        "NodeText": 2,
+        "MarkStrong": 1,
+    }
+    text = classes["NodeText"]
+    assert text.shallow_size == 2 * (
+        sys.getsizeof(doc.content[0].content[0])
+        + sys.getsizeof(doc.content[0].content[0].__dict__)
+    )
+    # the text strings and the marks list are owned by the text nodes
+    assert text.deep_size > text.shallow_size + sys.getsizeof("hello ")
+
+    # an object is counted once
+    seen = set()
+    get_tree_memory(doc, seen)
+    assert get_tree_memory(doc, seen) == {}
+
+    memory = ClassMemory(name="NodeText", n_instance=1, shallow_size=2, deep_size=3)
+    memory.merge(memory)
+    assert (memory.n_instance, memory.shallow_size, memory.deep_size) == (2, 4, 6)
+
+
+def test_get_memory_report():
+    report = get_memory_report(data)
+    assert report.n_doc == 1
+    assert report.tree_size == sum([c.deep_size for c in report.classes.values()])
+    assert report.max_tree_size == report.tree_size
+    assert report.data_size > 0
+    assert report.arena_size > 0
+    assert report.parse_peak > 0
+    assert report.render_peak > 0
+
+    docs = list(DocGenerator(GeneratorConfig(n_block=14)).iter_docs(3))
+    report = get_memory_report(iter(docs), measure_peak=False, measure_arena=False)
+    assert report.n_doc == 3
+    assert report.max_tree_size < report.tree_size
+    assert report.parse_peak == 0 and report.arena_size == 0
+    top = report.get_top(3)
+    assert len(top) == 3
+    assert top[0].deep_size >= top[1].deep_size >= top[2].deep_size
+    assert report.classes["NodeTable"].n_instance == 3
+
+    dct = json.loads(report.to_json())
+    assert dct["n_doc"] == 3
+    assert dct["classes"][0]["name"] == top[0].name
+    table = report.to_table(limit=3)
+    assert top[0].name in table
+    assert "arena" not in table
+
+
+def test_cli(tmp_path, capsys):
+    path = tmp_path / "corpus.jsonl"
+    path.write_text(json.dumps(data) + "\n" + json.dumps(data) + "\n")
+    assert main(["memory", str(path), "--limit", "2"]) == 0
+    assert "documents       : 2" in capsys.readouterr().out
+    assert main(["memory", str(path), "--json", "--no-arena"]) == 0
+    assert json.loads(capsys.readouterr().out)["arena_size"] == 0
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.memory",
+        preview=False,
+    )
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+import urllib.request
+import urllib.error
+
+import pytest
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.batch import convert_jsonl
+from atlas_doc_parser.tracing import add_trace_hook, clear_trace_hooks
+from atlas_doc_parser.metrics import (
+    Counter,
+    Histogram,
+    MetricsHook,
+    start_metrics_server,
+)
+
+data = {
+    "type": "doc",
+    "version": 1,
+    "content": [
+        {"type": "paragraph", "content": [{"type": "text", "text": "héllo"}]},
+        # a broken node, the attrs are not a dict
+        {"type": "panel", "attrs": "oops", "content": []},
+        {"type": "rule"},
+    ],
+}
+
+
+@pytest.fixture
+def hook():
+    hook = add_trace_hook(MetricsHook())
+    yield hook
+    clear_trace_hooks()
+
+
+def test_counter():
+    counter = Counter("n_total", 'the "n"\nvalue', label_names=("stage",))
+    counter.inc(labels=("parse",))
+    counter.inc(2, labels=("parse",))
+    counter.inc(labels=('a"b',))
+    assert counter.get(("parse",)) == 3
+    assert counter.get(("render",)) == 0
+    assert counter.to_prometheus().splitlines() == [
+        '# HELP n_total the "n"\\nvalue',
+        "# TYPE n_total counter",
+        'n_total{stage="a\\"b"} 1',
+        'n_total{stage="parse"} 3',
+    ]
+
+
+def test_counter_threads():
+    counter = Counter("n_total", "n")
+
+    def work():
+        for _ in range(1000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.get() == 8000
+    assert len(counter._shards) == 8
+
+
+def test_histogram():
+    histogram = Histogram("t_seconds", "t", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    assert histogram.collect()[()] == ([2, 3, 4], 2.65, 4)
+    assert histogram.to_prometheus().splitlines() == [
+        "# HELP t_seconds t",
+        "# TYPE t_seconds histogram",
+        't_seconds_bucket{le="0.1"} 2',
+        't_seconds_bucket{le="1.0"} 3',
+        't_seconds_bucket{le="+Inf"} 4',
+        "t_seconds_sum 2.65",
+        "t_seconds_count 4",
+    ]
+
+
+def test_hook(hook):
+    doc = NodeDoc.from_dict(data, ignore_error=True)
+    md = doc.to_markdown()
+    assert hook.documents_converted.get() == 1
+    assert hook.output_chars.get() == len(md)
+    assert hook.node_errors.collect() == {("parse", "panel"): 1}
+    durations = hook.stage_duration.collect()
+    assert durations[("parse",)][2] == 1
+    assert durations[("render",)][2] == 1
+
+    with pytest.raises(Exception):
+        NodeDoc.from_dict(data)
+    assert hook.errors.get(("parse",)) == 1
+
+    text = hook.to_prometheus()
+    assert "atlas_doc_documents_converted_total 1\n" in text
+    assert 'atlas_doc_node_errors_total{stage="parse",node_type="panel"} 1\n' in text
+    assert 'atlas_doc_stage_duration_seconds_count{stage="parse"} 2\n' in text
+
+
+def test_hook_batch(hook, tmp_path):
+    input_path = tmp_path / "docs.jsonl"
+    output_path = tmp_path / "docs.md.jsonl"
+    lines = [json.dumps(data), "[]"]
+    input_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    convert_jsonl(str(input_path), str(output_path), ignore_error=True)
+    assert hook.documents_converted.get() == 1
+    assert hook.input_bytes.get() == sum([len(line) + 1 for line in lines])
+    assert hook.output_bytes.get() == len(output_path.read_bytes())
+    assert hook.errors.get(("convert",)) == 1
+    assert hook.stage_duration.collect()[("convert",)][2] == 2
+
+
+def test_hook_batch_non_ascii(hook, tmp_path):
+    input_path = tmp_path / "docs.jsonl"
+    output_path = tmp_path / "docs.md.jsonl"
+    # the text is not escaped, it is utf-8 in the file
+    lines = [json.dumps(data, ensure_ascii=False), "[]"]
+    content = "\n".join(lines) + "\n"
+    input_path.write_bytes(content.encode("utf-8"))
+    convert_jsonl(str(input_path), str(output_path), ignore_error=True)
+    n_input_byte = len(content.encode("utf-8"))
+    assert n_input_byte > len(content)
+    assert hook.input_bytes.get() == n_input_byte
+    output = output_path.read_bytes()
+    assert len(output) > len(output.decode("utf-8"))
+    assert hook.output_bytes.get() == len(output)
+    assert "atlas_doc_input_bytes_total {}\n".format(n_input_byte) in (
+        hook.to_prometheus()
+    )
+
+
+def test_no_hook():
+    hook = MetricsHook()
+    NodeDoc.from_dict(data, ignore_error=True).to_markdown()
+    assert hook.documents_converted.get() == 0
+    assert hook.node_errors.collect() == {}
+
+
+def test_start_metrics_server(hook):
+    NodeDoc.from_dict(data, ignore_error=True).to_markdown()
+    server = start_metrics_server(hook, port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}"
+        with urllib.request.urlopen(f"{url}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            body = response.read().decode("utf-8")
+        assert body == hook.to_prometheus()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{url}/other")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.metrics",
+        preview=False,
+    )
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
+import pickle
+
 import pytest
 
+from atlas_doc_parser.arg import NA
 from atlas_doc_parser.exc import ParamError
 from atlas_doc_parser.model import (
     MarkBackGroundColor,
@@ -44,7 +47,9 @@ from atlas_doc_parser.model import (
     NodeTaskList,
     NodeText,
     parse_node,
+    parse_node_selective,
 )
+from atlas_doc_parser.type_enum import TypeEnum
 from atlas_doc_parser.tests import check_seder
 from atlas_doc_parser.tests.case import NodeCase, CaseEnum
 
@@ -519,6 +524,212 @@ class TestNodeText:
         CaseEnum.text_node_with_url_hyperlink.test()
 
 
+class TestParseNodeSelective:
+    data = {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {
+                "type": "heading",
+                "attrs": {"level": 1},
+                "content": [{"type": "text", "text": "Title"}],
+            },
+            {
+                "type": "paragraph",
+                "content": [
+                    {"type": "text", "text": "Hello "},
+                    {"type": "mention", "attrs": {"id": "u1", "text": "@Alice"}},
+                    {
+                        "type": "text",
+                        "text": "link",
+                        "marks": [{"type": "link", "attrs": {"href": "https://a.com"}}],
+                    },
+                ],
+            },
+            {"type": "unknown", "content": [{"type": "mention", "attrs": {"id": "x"}}]},
+            {
+                "type": "bulletList",
+                "content": [
+                    {
+                        "type": "listItem",
+                        "content": [
+                            {
+                                "type": "paragraph",
+                                "content": [
+                                    {"type": "mention", "attrs": {"id": "u2"}},
+                                ],
+                            }
+                        ],
+                    }
+                ],
+            },
+        ],
+    }
+
+    def test_flat(self):
+        nodes = parse_node_selective(self.data, {TypeEnum.mention, "heading"})
+        assert [node.type for node in nodes] == ["heading", "mention", "mention"]
+        assert nodes[0].to_markdown().strip() == "# Title"
+        assert [node.attrs.id for node in nodes[1:]] == ["u1", "u2"]
+
+        # nested selected nodes are the same objects as in the parent subtree
+        nodes = parse_node_selective(self.data, {TypeEnum.paragraph, "mention"})
+        assert [node.type for node in nodes] == [
+            "paragraph",
+            "mention",
+            "paragraph",
+            "mention",
+        ]
+        assert nodes[1] is nodes[0].content[1]
+
+        # mark type selects the nodes carrying the mark
+        nodes = parse_node_selective(self.data, {TypeEnum.link})
+        assert len(nodes) == 1
+        assert nodes[0].to_markdown() == "[link](https://a.com)"
+
+        assert parse_node_selective(self.data, {TypeEnum.table}) == []
+
+    def test_keep_ancestors(self):
+        doc = parse_node_selective(self.data, {TypeEnum.mention}, keep_ancestors=True)
+        assert isinstance(doc, NodeDoc)
+        assert [node.type for node in doc.content] == ["paragraph", "bulletList"]
+        assert doc.content[0].content == [
+            NodeMention.from_dict(
+                {"type": "mention", "attrs": {"id": "u1", "text": "@Alice"}}
+            )
+        ]
+        assert doc.to_markdown().strip() == "@Alice\n\n- @Unknown"
+
+        assert (
+            parse_node_selective(self.data, {TypeEnum.table}, keep_ancestors=True)
+            is None
+        )
+
+    def test_ignore_error(self):
+        data = {
+            "type": "doc",
+            "content": [
+                {"type": "mention", "attrs": {}},
+                {"type": "mention", "attrs": {"id": "u1"}},
+            ],
+        }
+        with pytest.raises(ParamError):
+            parse_node_selective(data, {TypeEnum.mention})
+        nodes = parse_node_selective(data, {TypeEnum.mention}, ignore_error=True)
+        assert len(nodes) == 1
+        doc = parse_node_selective(
+            data, {TypeEnum.mention}, keep_ancestors=True, ignore_error=True
+        )
+        assert len(doc.content) == 1
+
+
+class TestPickle:
+    def test_pickle_round_trip(self):
+        for case in vars(CaseEnum).values():
+            if isinstance(case, NodeCase):
+                node = pickle.loads(pickle.dumps(case.node))
+                assert node == case.node
+                assert node.to_markdown() == case.node.to_markdown()
+
+    def test_na_and_type_are_shared(self):
+        node = NodeParagraph.from_dict(
+            {
+                "type": "paragraph",
+                "content": [
+                    {"type": "text", "text": "a"},
+                    {"type": "text", "text": "b"},
+                ],
+            }
+        )
+        text1, text2 = node.content
+        assert text1.marks is text2.marks
+        assert isinstance(text1.marks, NA)
+        assert text1.type is text2.type
+
+
+class TestToText:
+    def test_to_text(self):
+        doc = NodeDoc.from_dict(
+            {
+                "type": "doc",
+                "content": [
+                    {
+                        "type": "heading",
+                        "attrs": {"level": 1},
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": "Big",
+                                "marks": [{"type": "strong"}],
+                            },
+                            {"type": "text", "text": "  Title\t"},
+                        ],
+                    },
+                    {
+                        "type": "bulletList",
+                        "content": [
+                            {
+                                "type": "listItem",
+                                "content": [
+                                    {
+                                        "type": "paragraph",
+                                        "content": [
+                                            {"type": "text", "text": "hi "},
+                                            {
+                                                "type": "mention",
+                                                "attrs": {"id": "1", "text": "@Alice"},
+                                            },
+                                            {"type": "hardBreak"},
+                                            {
+                                                "type": "status",
+                                                "attrs": {"text": "DONE"},
+                                            },
+                                        ],
+                                    }
+                                ],
+                            }
+                        ],
+                    },
+                    {"type": "rule"},
+                    {"type": "paragraph", "content": []},
+                    {
+                        "type": "table",
+                        "content": [
+                            {
+                                "type": "tableRow",
+                                "content": [
+                                    {
+                                        "type": "tableCell",
+                                        "content": [
+                                            {
+                                                "type": "paragraph",
+                                                "content": [
+                                                    {"type": "text", "text": "a|b"}
+                                                ],
+                                            }
+                                        ],
+                                    },
+                                ],
+                            }
+                        ],
+                    },
+                ],
+            }
+        )
+        assert list(doc.iter_text()) == ["Big Title", "hi @Alice DONE", "a|b"]
+        assert doc.to_text() == "Big Title\nhi @Alice DONE\na|b"
+        assert doc.to_text(sep=" ") == "Big Title hi @Alice DONE a|b"
+        assert doc.content[0].content[0].to_text() == "Big"
+
+    def test_all_cases(self):
+        for case in vars(CaseEnum).values():
+            if isinstance(case, NodeCase):
+                text = case.node.to_text()
+                assert text == "\n".join(case.node.iter_text())
+                assert "**" not in text
+                assert "| --- |" not in text
+
+
 if __name__ == "__main__":
     from atlas_doc_parser.tests import run_cov_test
 
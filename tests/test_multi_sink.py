@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from atlas_doc_parser.model import NodeDoc, NodeMedia, NodeBlockCard
+from atlas_doc_parser.generator import GeneratorConfig, DocGenerator
+from atlas_doc_parser.resolve import Resolved, use_resolved
+from atlas_doc_parser.tracing import BaseTraceHook, add_trace_hook, clear_trace_hooks
+from atlas_doc_parser.multi_sink import (
+    BaseSink,
+    render_multi,
+    MarkdownSink,
+    TextSink,
+    StatsSink,
+)
+from atlas_doc_parser.tests.case import NodeCase, CaseEnum
+
+
+def make_doc(*blocks) -> NodeDoc:
+    return NodeDoc.from_dict({"type": "doc", "version": 1, "content": list(blocks)})
+
+
+def test_all_cases():
+    for case in vars(CaseEnum).values():
+        if isinstance(case, NodeCase):
+            node = case.node
+            md, text = render_multi(node, [MarkdownSink(), TextSink()])
+            assert md == node.to_markdown()
+            assert text == node.to_text()
+
+
+def test_generated_docs():
+    config = GeneratorConfig(n_block=40)
+    for data in DocGenerator(config).iter_docs(5):
+        doc = NodeDoc.from_dict(data)
+        md, text = render_multi(doc, [MarkdownSink(), TextSink(sep=" ")])
+        assert md == doc.to_markdown()
+        assert text == doc.to_text(sep=" ")
+
+
+def make_media(id_: str) -> dict:
+    return {"type": "media", "attrs": {"type": "file", "id": id_, "collection": "c"}}
+
+
+def test_media_group():
+    doc = make_doc({"type": "mediaGroup", "content": [make_media("m1")]})
+    (md,) = render_multi(doc, [MarkdownSink()])
+    assert md == doc.to_markdown() == ""
+    # the media that can't be rendered are skipped
+    doc.content[0].content.append(NodeMedia.from_dict(make_media("m2")))
+    with use_resolved(Resolved(media={("m1", "c"): "https://cdn/m1.png"})):
+        (md,) = render_multi(doc, [MarkdownSink()])
+        assert md == doc.to_markdown() == "![](https://cdn/m1.png)"
+
+
+def test_invalid_tree():
+    item = {
+        "type": "listItem",
+        "content": [
+            {"type": "paragraph", "content": [{"type": "text", "text": "a "}]},
+            {"type": "rule"},
+        ],
+    }
+    # a list only renders its list items, even a broken paragraph
+    doc = make_doc(
+        {
+            "type": "bulletList",
+            "content": [
+                item,
+                {
+                    "type": "paragraph",
+                    "content": [{"type": "emoji", "attrs": {"shortName": ":x:"}}],
+                },
+                {"type": "bulletList", "content": [item]},
+            ],
+        }
+    )
+    (md,) = render_multi(doc, [MarkdownSink()])
+    assert md == doc.to_markdown()
+
+    doc = make_doc({"type": "taskList", "content": [item["content"][0]]})
+    with pytest.raises(TypeError):
+        doc.to_markdown()
+    with pytest.raises(TypeError):
+        render_multi(doc, [MarkdownSink()])
+
+
+def test_stats():
+    doc = make_doc(
+        {
+            "type": "paragraph",
+            "content": [
+                {"type": "text", "text": "hello big "},
+                {"type": "inlineCard", "attrs": {"url": "https://c.com"}},
+                {
+                    "type": "text",
+                    "text": "world",
+                    "marks": [{"type": "link", "attrs": {"href": "https://a.com"}}],
+                },
+            ],
+        },
+        {"type": "blockCard", "attrs": {"url": "https://b.com"}},
+    )
+    (stats,) = render_multi(doc, [StatsSink()])
+    assert stats.n_node == 6
+    assert stats.n_word == 3
+    assert stats.n_char == 15
+    assert stats.n_link == 3
+    assert stats.type_counts == {
+        "doc": 1,
+        "paragraph": 1,
+        "text": 2,
+        "inlineCard": 1,
+        "blockCard": 1,
+    }
+
+    # a leaf root
+    (stats,) = render_multi(doc.content[0].content[2], [StatsSink()])
+    assert (stats.n_node, stats.n_word, stats.n_link) == (1, 1, 1)
+
+
+class EventSink(BaseSink):
+    def __init__(self):
+        self.events = list()
+
+    def enter(self, node):
+        self.events.append(("enter", node.type))
+
+    def leave(self, node):
+        self.events.append(("leave", node.type))
+
+    def leaf(self, node):
+        self.events.append(("leaf", node.type))
+
+    def result(self):
+        return self.events
+
+
+class InlineSink(EventSink):
+    def inline(self, node):
+        self.events.append(("inline", node.type))
+
+
+def test_custom_sink():
+    node = CaseEnum.bullet_list_with_single_plain_text_item.node
+    events, inline_events, md = render_multi(
+        node, [EventSink(), InlineSink(), MarkdownSink()]
+    )
+    # the inline nodes are sent to leaf by default
+    assert events == [
+        ("enter", "bulletList"),
+        ("enter", "listItem"),
+        ("enter", "paragraph"),
+        ("leaf", "text"),
+        ("leave", "paragraph"),
+        ("leave", "listItem"),
+        ("leave", "bulletList"),
+    ]
+    assert inline_events == [
+        ("enter", "bulletList"),
+        ("enter", "listItem"),
+        ("inline", "paragraph"),
+        ("leave", "listItem"),
+        ("leave", "bulletList"),
+    ]
+    assert md == node.to_markdown()
+
+    node = CaseEnum.paragraph_with_simple_text.node
+    events, text = render_multi(node, [InlineSink(), TextSink()])
+    assert events == [("inline", "paragraph")]
+    assert text == node.to_text()
+
+    node = node.content[0]
+    events, md, text = render_multi(node, [InlineSink(), MarkdownSink(), TextSink()])
+    assert events == [("leaf", "text")]
+    assert md == node.to_markdown()
+    assert text == node.to_text()
+
+    # the default methods do nothing
+    assert BaseSink().inline(CaseEnum.paragraph_with_simple_text.node) is None
+
+
+class ErrorHook(BaseTraceHook):
+    def __init__(self):
+        self.errors = list()
+
+    def on_error(self, stage, node_type, error):
+        self.errors.append((stage, node_type))
+
+
+def test_ignore_error():
+    doc = make_doc(
+        {"type": "paragraph", "content": [{"type": "text", "text": "a"}]},
+        {
+            "type": "bulletList",
+            "content": [
+                {
+                    "type": "listItem",
+                    "content": [
+                        {
+                            "type": "paragraph",
+                            "content": [{"type": "text", "text": "b"}],
+                        }
+                    ],
+                },
+                {
+                    "type": "listItem",
+                    "content": [
+                        {
+                            "type": "paragraph",
+                            "content": [{"type": "text", "text": "c"}],
+                        }
+                    ],
+                },
+            ],
+        },
+        {"type": "rule"},
+    )
+    # a mark that fails to render, deep in the second block
+    doc.content[1].content[0].content[0].content[0].marks = [None]
+    with pytest.raises(AttributeError):
+        doc.to_markdown()
+    with pytest.raises(AttributeError):
+        render_multi(doc, [MarkdownSink()])
+    # the whole block is skipped and reported, the same as to_markdown
+    hook = add_trace_hook(ErrorHook())
+    try:
+        expected = doc.to_markdown(ignore_error=True)
+        (md,) = render_multi(doc, [MarkdownSink(ignore_error=True)])
+        assert md == expected == "a\n\n---"
+        assert hook.errors == [("render", "bulletList")] * 2
+
+        # a leaf block that fails
+        doc.content[2] = NodeBlockCard.from_dict({"type": "blockCard", "attrs": {}})
+        (md,) = render_multi(doc, [MarkdownSink(ignore_error=True)])
+        assert md == doc.to_markdown(ignore_error=True) == "a\n"
+    finally:
+        clear_trace_hooks()
+
+    # a top level paragraph that fails
+    doc = make_doc(
+        {"type": "paragraph", "content": [{"type": "text", "text": "a"}]},
+        {"type": "paragraph", "content": [{"type": "text", "text": "b"}]},
+    )
+    doc.content[1].content[0].marks = [None]
+    (md,) = render_multi(doc, [MarkdownSink(ignore_error=True)])
+    assert md == doc.to_markdown(ignore_error=True) == "a\n"
+
+    # not a doc, the error is raised
+    with pytest.raises(AttributeError):
+        render_multi(doc.content[1], [MarkdownSink(ignore_error=True)])
+
+    # a text getter that fails
+    doc = make_doc(
+        {
+            "type": "paragraph",
+            "content": [
+                {"type": "text", "text": "a"},
+                {"type": "mention", "attrs": {"id": "u1", "text": "@Alice"}},
+            ],
+        },
+    )
+    doc.content[0].content[1].attrs = None
+    with pytest.raises(AttributeError):
+        render_multi(doc, [TextSink()])
+    (text,) = render_multi(doc, [TextSink(ignore_error=True)])
+    assert text == doc.to_text(ignore_error=True) == "a"
+    mention = doc.content[0].content[1]
+    with pytest.raises(AttributeError):
+        render_multi(mention, [TextSink()])
+    (text,) = render_multi(mention, [TextSink(ignore_error=True)])
+    assert text == mention.to_text(ignore_error=True) == ""
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.multi_sink",
+        preview=False,
+    )
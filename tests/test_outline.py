@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.outline import build_outline, get_section, render_section
+
+
+def heading(level, text, local_id=None):
+    attrs = {"level": level}
+    if local_id:
+        attrs["localId"] = local_id
+    return {
+        "type": "heading",
+        "attrs": attrs,
+        "content": [{"type": "text", "text": text, "marks": [{"type": "strong"}]}],
+    }
+
+
+def para(text):
+    return {"type": "paragraph", "content": [{"type": "text", "text": text}]}
+
+
+def make_doc_data():
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            para("intro"),  # 0
+            heading(1, "A", "a"),  # 1
+            para("a body"),  # 2
+            heading(2, "A.1"),  # 3
+            para("a.1 body"),  # 4
+            heading(3, "A.1.1"),  # 5
+            heading(2, "A.2"),  # 6
+            para("a.2 body"),  # 7
+            heading(1, "B"),  # 8
+            para("b body"),  # 9
+        ],
+    }
+
+
+def test_build_outline():
+    data = make_doc_data()
+    for node_or_data in [data, NodeDoc.from_dict(data)]:
+        outline = build_outline(node_or_data)
+        assert outline.n_block == 10
+        assert [
+            (e.level, e.text, e.start, e.end, e.parent) for e in outline.entries
+        ] == [
+            (1, "A", 1, 8, None),
+            (2, "A.1", 3, 6, 0),
+            (3, "A.1.1", 5, 6, 1),
+            (2, "A.2", 6, 8, 0),
+            (1, "B", 8, 10, None),
+        ]
+        assert outline.find(local_id="a").text == "A"
+        assert outline.find(text="A.2").index == 3
+        assert outline.find(text="C") is None
+        a = outline.entries[0]
+        assert [e.text for e in outline.get_children(a)] == ["A.1", "A.2"]
+        assert outline.get_body_end(a) == 3
+        assert outline.get_body_end(outline.entries[-1]) == 10
+
+    assert build_outline({"type": "doc", "content": []}).entries == []
+
+
+def test_render_section():
+    data = make_doc_data()
+    doc = NodeDoc.from_dict(data)
+    outline = build_outline(data)
+    for heading_, include_subsections, start, end in [
+        ("A", True, 1, 8),
+        ("A", False, 1, 3),
+        (1, True, 3, 6),
+        (outline.entries[4], True, 8, 10),
+    ]:
+        expected = NodeDoc.from_dict(
+            {"type": "doc", "content": data["content"][start:end]}
+        ).to_markdown()
+        for node_or_data in [data, doc]:
+            md = render_section(
+                node_or_data,
+                heading_,
+                outline=outline,
+                include_subsections=include_subsections,
+            )
+            assert md == expected
+
+    assert "a.1 body" in render_section(data, "A")
+    assert "a.1 body" not in render_section(data, "A", include_subsections=False)
+    with pytest.raises(KeyError):
+        render_section(data, "C")
+
+
+def test_only_parse_section():
+    data = make_doc_data()
+    # this block can't be parsed, it is not in section B
+    data["content"][2] = {"type": "mention", "attrs": {}}
+    with pytest.raises(Exception):
+        NodeDoc.from_dict(data)
+    section = get_section(data, "B")
+    assert len(section.content) == 2
+    assert section.to_markdown().strip().endswith("b body")
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(__file__, "atlas_doc_parser.outline", preview=False)
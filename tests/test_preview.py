@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.preview import render_preview
+
+
+def make_para(text: str) -> dict:
+    return {"type": "paragraph", "content": [{"type": "text", "text": text}]}
+
+
+def make_doc(*blocks) -> dict:
+    return {"type": "doc", "version": 1, "content": list(blocks)}
+
+
+def make_row(tag: str, i) -> dict:
+    return {
+        "type": "tableRow",
+        "content": [{"type": tag, "content": [make_para(f"c{i}")]}],
+    }
+
+
+def test_short_doc():
+    data = make_doc(make_para("a"), make_para("b"))
+    assert render_preview(data) == "a\n\nb"
+    assert render_preview(NodeDoc.from_dict(data)) == "a\n\nb"
+    assert render_preview(data, max_blocks=1) == "a\n\n…"
+    assert render_preview(data, max_blocks=1, marker="[more]") == "a\n\n[more]"
+
+
+def test_long_paragraph():
+    data = make_doc(make_para("word " * 100_000))
+    preview = render_preview(data, max_chars=30)
+    assert preview == "word word word word word…"
+    assert render_preview(NodeDoc.from_dict(data), max_chars=30) == preview
+
+
+def test_list():
+    data = make_doc(
+        {
+            "type": "bulletList",
+            "content": [
+                {"type": "listItem", "content": [make_para(f"item {i}")]}
+                for i in range(10_000)
+            ],
+        }
+    )
+    preview = render_preview(data, max_chars=30)
+    assert preview == "- item 0\n- item 1\n- item 2\n\n…"
+
+
+def test_code_block():
+    code = "\n".join([f"print({i})" for i in range(10_000)])
+    data = make_doc(
+        make_para("Intro"),
+        {
+            "type": "codeBlock",
+            "attrs": {"language": "python"},
+            "content": [{"type": "text", "text": code}],
+        },
+    )
+    preview = render_preview(data, max_chars=50)
+    assert preview == "Intro\n\n```python\nprint(0)\nprint(1)\nprint(2)\n```\n\n…"
+
+
+def test_table():
+    data = make_doc(
+        {
+            "type": "table",
+            "content": [make_row("tableHeader", "h")]
+            + [make_row("tableCell", i) for i in range(10_000)],
+        }
+    )
+    preview = render_preview(data, max_chars=40)
+    assert preview == "| ch<br> |\n| --- |\n| c0<br> |\n\n…"
+    # the header does not fit
+    assert render_preview(data, max_chars=10) == "…"
+
+
+def test_ignore_error():
+    data = make_doc({"type": "mention", "attrs": {}}, make_para("a"))
+    with pytest.raises(Exception):
+        render_preview(data)
+    assert render_preview(data, ignore_error=True) == "a"
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.preview",
+        preview=False,
+    )
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from atlas_doc_parser.model import NodeDoc, NodeText, NodeTable
+from atlas_doc_parser.profiler import Profiler
+from atlas_doc_parser.generator import GeneratorConfig, DocGenerator
+from atlas_doc_parser.cli import main
+
+data = DocGenerator(GeneratorConfig(n_block=14)).make_doc()
+
+
+class TestProfiler:
+    def test(self):
+        md = NodeDoc.from_dict(data).to_markdown()
+        to_markdown = NodeText.__dict__["to_markdown"]
+        with Profiler() as prof:
+            assert NodeDoc.from_dict(data).to_markdown() == md
+            assert NodeText.__dict__["to_markdown"] is not to_markdown
+
+        # the original methods are back
+        assert NodeText.__dict__["to_markdown"] is to_markdown
+        assert "from_dict" not in NodeTable.__dict__
+
+        parse = {p.type: p for p in prof.get_profiles("parse")}
+        render = {p.type: p for p in prof.get_profiles("render")}
+        assert parse["doc"].n_call == 1
+        assert parse["table"].n_call == 1
+        assert parse["tableRow"].n_call == 4
+        assert render["doc"].n_byte == len(md.encode("utf-8"))
+        # the doc time includes all the others
+        assert parse["doc"].cum_time >= parse["paragraph"].cum_time
+        total_self = sum([p.self_time for p in parse.values()])
+        assert total_self == pytest.approx(parse["doc"].cum_time, rel=0.01)
+
+        # recursive calls are counted once in the cumulative time
+        nested = {
+            "type": "bulletList",
+            "content": [
+                {
+                    "type": "listItem",
+                    "content": [
+                        {
+                            "type": "bulletList",
+                            "content": [{"type": "listItem", "content": []}],
+                        }
+                    ],
+                }
+            ],
+        }
+        with Profiler() as prof:
+            NodeDoc.from_dict({"type": "doc", "content": [nested]})
+        profile = prof.profiles["parse"]["bulletList"]
+        assert profile.n_call == 2
+        assert profile.cum_time < prof.profiles["parse"]["doc"].cum_time
+
+        dct = prof.to_dict(sort_by="n_call")
+        assert dct["parse"][0]["type"] == "bulletList"
+        assert json.loads(prof.to_json()) == prof.to_dict()
+        lines = prof.to_table(limit=1).splitlines()
+        assert lines[0] == "--- parse"
+        assert lines[2].split()[0] in ("bulletList", "listItem", "doc")
+        assert lines[3] == "--- render"
+
+    def test_one_at_a_time(self):
+        with Profiler():
+            with pytest.raises(RuntimeError):
+                Profiler().start()
+        with Profiler():
+            pass
+
+    def test_error(self):
+        with pytest.raises(Exception):
+            with Profiler() as prof:
+                NodeDoc.from_dict({"type": "doc", "content": [{"type": "panel"}]})
+        assert "from_dict" not in NodeTable.__dict__
+        assert prof.profiles["parse"]["panel"].n_call == 1
+
+
+def test_cli(tmp_path, capsys):
+    path = tmp_path / "doc.json"
+    path.write_text(json.dumps(data))
+    assert main(["profile", str(path), "--repeat", "2", "--limit", "3"]) == 0
+    out = capsys.readouterr().out
+    assert "--- parse" in out and "--- render" in out
+    assert main(["profile", str(path), "--json"]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert {p["type"] for p in result["parse"]} >= {"doc", "table", "text"}
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.profiler",
+        preview=False,
+    )
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.resolve import (
+    Refs,
+    Resolved,
+    BaseResolver,
+    DictResolver,
+    ResolveCache,
+    collect_refs,
+    resolve_refs,
+    get_resolved,
+    use_resolved,
+    render_resolved,
+)
+
+
+def make_doc(*blocks) -> NodeDoc:
+    return NodeDoc.from_dict({"type": "doc", "version": 1, "content": list(blocks)})
+
+
+def make_mention(id_: str) -> dict:
+    return {"type": "mention", "attrs": {"id": id_}}
+
+
+def make_media(id_: str) -> dict:
+    return {
+        "type": "media",
+        "attrs": {"type": "file", "id": id_, "collection": "c"},
+    }
+
+
+doc = make_doc(
+    {
+        "type": "paragraph",
+        "content": [
+            make_mention("u1"),
+            {"type": "text", "text": " and "},
+            make_mention("u2"),
+            {"type": "text", "text": " and "},
+            make_mention("u1"),
+            {"type": "text", "text": " see "},
+            {"type": "inlineCard", "attrs": {"url": "https://a.com/1"}},
+        ],
+    },
+    {
+        "type": "mediaSingle",
+        "attrs": {"layout": "center"},
+        "content": [make_media("m1")],
+    },
+    {"type": "mediaGroup", "content": [make_media("m2"), make_media("m3")]},
+    {"type": "blockCard", "attrs": {"url": "https://a.com/2"}},
+)
+
+
+def new_resolver() -> DictResolver:
+    return DictResolver(
+        mentions={"u1": "Alice", "u2": "@Bob"},
+        media={("m1", "c"): "https://cdn/m1.png", ("m2", "c"): "https://cdn/m2.png"},
+        cards={"https://a.com/1": "Page 1"},
+    )
+
+
+def test_collect_refs():
+    refs = collect_refs(doc)
+    assert refs == Refs(
+        mention_ids=["u1", "u2"],
+        media_keys=[("m1", "c"), ("m2", "c"), ("m3", "c")],
+        card_urls=["https://a.com/1", "https://a.com/2"],
+    )
+
+
+def test_render_resolved():
+    resolver = new_resolver()
+    md = render_resolved(doc, resolver, ignore_error=True)
+    assert md == (
+        "@Alice and @Bob and @Alice see [Page 1](https://a.com/1)\n"
+        "\n"
+        "![](https://cdn/m1.png)\n"
+        "![](https://cdn/m2.png)\n"
+        "\n"
+        "[https://a.com/2](https://a.com/2)\n"
+    )
+    # one call per kind
+    assert [kind for kind, _ in resolver.calls] == ["mention", "media", "card"]
+    # the context is reset after rendering
+    assert get_resolved() is None
+    assert doc.content[0].to_markdown().startswith("@Unknown")
+
+
+def test_cache():
+    resolver = new_resolver()
+    cache = ResolveCache()
+    refs = collect_refs(doc)
+    resolved = resolve_refs(refs, resolver, cache=cache)
+    assert resolved.media[("m3", "c")] is None
+    assert len(resolver.calls) == 3
+
+    # all the keys, including the unresolved ones, are cached
+    assert resolve_refs(refs, resolver, cache=cache) == resolved
+    assert len(resolver.calls) == 3
+
+    # only the new keys are asked
+    other = make_doc(
+        {"type": "paragraph", "content": [make_mention("u1"), make_mention("u3")]}
+    )
+    render_resolved(other, resolver, cache=cache)
+    assert resolver.calls[-1] == ("mention", ["u3"])
+
+
+def test_base_resolver():
+    md = render_resolved(doc, BaseResolver(), ignore_error=True)
+    assert md.startswith("@Unknown and @Unknown")
+
+
+def test_use_resolved_in_threads():
+    results = dict()
+
+    def render(name: str):
+        resolved = Resolved(mentions={"u1": name})
+        with use_resolved(resolved):
+            results[name] = doc.content[0].content[0].to_markdown()
+
+    threads = [threading.Thread(target=render, args=(f"n{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {f"n{i}": f"@n{i}" for i in range(8)}
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.resolve",
+        preview=False,
+    )
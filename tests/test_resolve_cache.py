@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+
+import pytest
+
+from atlas_doc_parser.resolve import DictResolver, render_resolved
+from atlas_doc_parser.resolve_cache import TTLResolveCache
+from atlas_doc_parser.model import NodeDoc
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def fetch_upper(keys):
+    return {key: key.upper() for key in keys if not key.startswith("x")}
+
+
+def test_ttl_and_negative_cache():
+    clock = Clock()
+    cache = TTLResolveCache(
+        ttl={"mention": 100}, negative_ttl=10, max_size=None, clock=clock
+    )
+    calls = list()
+
+    def fetch(keys):
+        calls.append(keys)
+        return fetch_upper(keys)
+
+    assert cache.fetch_many("mention", ["a", "x"], fetch) == {"a": "A", "x": None}
+    assert cache.fetch_many("mention", ["a", "x"], fetch) == {"a": "A", "x": None}
+    assert calls == [["a", "x"]]
+    assert cache.n_hit == 2
+
+    # the negative entry expires first
+    clock.now += 50
+    cache.fetch_many("mention", ["a", "x"], fetch)
+    assert calls[-1] == ["x"]
+    clock.now += 100
+    cache.fetch_many("mention", ["a", "x"], fetch)
+    assert calls[-1] == ["a", "x"]
+
+    # no ttl for the cards
+    cache.set_many("card", {"u": "title"})
+    clock.now += 10**9
+    assert cache.get_many("card", ["u"]) == ({"u": "title"}, [])
+
+
+def test_lru():
+    cache = TTLResolveCache(max_size=2)
+    cache.set_many("mention", {"a": "A", "b": "B"})
+    cache.get_many("mention", ["a"])  # b is the least recently used
+    cache.set_many("mention", {"c": "C"})
+    assert cache.get_many("mention", ["a", "b", "c"]) == (
+        {"a": "A", "c": "C"},
+        ["b"],
+    )
+
+
+def test_single_flight():
+    cache = TTLResolveCache()
+    calls = list()
+    started = threading.Event()
+
+    def slow_fetch(keys):
+        calls.append(keys)
+        started.set()
+        time.sleep(0.05)
+        return fetch_upper(keys)
+
+    results = list()
+
+    def lookup():
+        results.append(cache.fetch_many("mention", ["a", "b"], slow_fetch))
+
+    first = threading.Thread(target=lookup)
+    first.start()
+    started.wait()
+    others = [threading.Thread(target=lookup) for _ in range(4)]
+    for thread in others:
+        thread.start()
+    for thread in [first] + others:
+        thread.join()
+    assert calls == [["a", "b"]]
+    assert results == [{"a": "A", "b": "B"}] * 5
+
+
+def test_single_flight_failure():
+    cache = TTLResolveCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failed_fetch(keys):
+        started.set()
+        release.wait()
+        raise RuntimeError("boom")
+
+    def failed_lookup():
+        with pytest.raises(RuntimeError):
+            cache.fetch_many("mention", ["a"], failed_fetch)
+
+    first = threading.Thread(target=failed_lookup)
+    first.start()
+    started.wait()
+    results = list()
+    second = threading.Thread(
+        target=lambda: results.append(cache.fetch_many("mention", ["a"], fetch_upper))
+    )
+    second.start()
+    release.set()
+    first.join()
+    second.join()
+    # the waiting thread fetches the key itself
+    assert results == [{"a": "A"}]
+
+
+def test_persistence(tmp_path):
+    path = str(tmp_path / "cache.json")
+    clock = Clock()
+    cache = TTLResolveCache(ttl=100, path=path, clock=clock)
+    cache.set_many("mention", {"a": "A"})
+    cache.set_many("media", {("m1", "c"): "https://cdn/m1"})
+    cache.set_many("card", {"u": None})
+    cache.save()
+
+    loaded = TTLResolveCache(path=path, clock=clock)
+    assert loaded.get_many("mention", ["a"]) == ({"a": "A"}, [])
+    assert loaded.get_many("media", [("m1", "c")]) == (
+        {("m1", "c"): "https://cdn/m1"},
+        [],
+    )
+    assert loaded.get_many("card", ["u"]) == ({"u": None}, [])
+
+    # the expired entries are not loaded
+    clock.now += 200
+    loaded = TTLResolveCache(path=path, clock=clock)
+    assert loaded.get_many("mention", ["a"]) == ({}, ["a"])
+
+
+def test_render_resolved():
+    doc = NodeDoc.from_dict(
+        {
+            "type": "doc",
+            "version": 1,
+            "content": [
+                {
+                    "type": "paragraph",
+                    "content": [{"type": "mention", "attrs": {"id": "u1"}}],
+                }
+            ],
+        }
+    )
+    resolver = DictResolver(mentions={"u1": "Alice"})
+    cache = TTLResolveCache()
+    for _ in range(3):
+        assert render_resolved(doc, resolver, cache=cache) == "@Alice\n"
+    assert len(resolver.calls) == 1
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.resolve_cache",
+        preview=False,
+    )
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+
+import pytest
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.profiler import Profiler
+from atlas_doc_parser.metrics import MetricsHook
+from atlas_doc_parser.tracing import RecordHook, add_trace_hook, clear_trace_hooks
+from atlas_doc_parser.slowlog import (
+    SlowLog,
+    add_slow_log,
+    remove_slow_log,
+    clear_slow_logs,
+    report_slow,
+    _slow_logs,
+)
+
+data = {
+    "type": "doc",
+    "version": 1,
+    "content": [
+        {
+            "type": "bulletList",
+            "content": [
+                {
+                    "type": "listItem",
+                    "content": [
+                        {
+                            "type": "paragraph",
+                            "content": [{"type": "text", "text": "item"}],
+                        }
+                    ],
+                }
+            ],
+        },
+        {"type": "paragraph", "content": [{"type": "text", "text": "hello"}]},
+    ],
+}
+
+
+@pytest.fixture
+def clean():
+    yield
+    clear_slow_logs()
+    clear_trace_hooks()
+
+
+def test_fast(clean):
+    slow_log = add_slow_log(SlowLog(threshold=60))
+    doc = NodeDoc.from_dict(data)
+    doc.to_markdown()
+    assert len(slow_log.reports) == 0
+
+
+def test_slow(clean, tmp_path):
+    reports = list()
+    slow_log = add_slow_log(
+        SlowLog(threshold=0, output_dir=str(tmp_path), callback=reports.append)
+    )
+    assert add_slow_log(slow_log) is slow_log
+    assert len(_slow_logs) == 1
+
+    doc = NodeDoc.from_dict(data)
+    md = doc.to_markdown()
+    assert md == NodeDoc.from_dict(data).to_markdown()
+    remove_slow_log(slow_log)
+    assert _slow_logs == []
+
+    assert [r.stage for r in slow_log.reports] == ["parse", "render"] * 2
+    assert reports == list(slow_log.reports)
+    parse, render = slow_log.reports[0], slow_log.reports[1]
+    assert parse.doc_hash == render.doc_hash
+    assert len(parse.doc_hash) == 16
+    assert parse.n_node == 7
+    assert parse.max_depth == 5
+    assert parse.type_counts["paragraph"] == 2
+    assert {t for t, _ in parse.slow_types} <= set(parse.type_counts)
+    assert "paragraph" in dict(render.slow_types)
+    assert json.loads(json.dumps(parse.to_dict()))["stage"] == "parse"
+
+    # the saved document reproduces the markdown
+    with open(parse.path, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert parse.n_byte == len(json.dumps(saved, separators=(",", ":")))
+    assert NodeDoc.from_dict(saved).to_markdown() == md
+
+
+def test_with_hook_and_profiler(clean):
+    hook = add_trace_hook(RecordHook())
+    slow_log = add_slow_log(SlowLog(threshold=0, max_report=1))
+    with Profiler() as prof:
+        NodeDoc.from_dict(data).to_markdown()
+    # the profiled rerun is not traced
+    assert [r.name for r in hook.records] == ["parse", "render"]
+    # the profiler is busy, the slow types are skipped
+    assert len(slow_log.reports) == 1
+    assert slow_log.reports[0].stage == "render"
+    assert slow_log.reports[0].slow_types == []
+    assert prof.profiles["parse"]["paragraph"].n_call == 2
+
+
+def test_threads(clean):
+    """
+    The slow types of a document only count the calls of its own thread.
+    """
+    para = {"type": "paragraph", "content": [{"type": "text", "text": "hello"}]}
+    para_data = {"type": "doc", "version": 1, "content": [para] * 20}
+    slow_log = add_slow_log(SlowLog(threshold=0, max_report=10000))
+    stop = threading.Event()
+
+    def convert_lists():
+        while not stop.is_set():
+            NodeDoc.from_dict(data).to_markdown()
+
+    thread = threading.Thread(target=convert_lists)
+    thread.start()
+    try:
+        for _ in range(20):
+            NodeDoc.from_dict(para_data).to_markdown()
+    finally:
+        stop.set()
+        thread.join()
+
+    reports = [r for r in slow_log.reports if "bulletList" not in r.type_counts]
+    assert len(reports) == 40
+    for report in reports:
+        assert report.slow_types
+        assert {t for t, _ in report.slow_types} <= {"doc", "paragraph", "text"}
+
+
+def test_report_error(clean):
+    def get_data():
+        raise ValueError
+
+    slow_log = add_slow_log(SlowLog(threshold=0, profile=False))
+    report_slow("parse", 1.0, get_data)
+    assert len(slow_log.reports) == 0
+
+
+def test_rerun_muted(clean):
+    # the rerun of the profiler doesn't report its spans and errors again
+    hook = add_trace_hook(MetricsHook())
+    slow_log = add_slow_log(SlowLog(threshold=0))
+    broken = {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {"type": "paragraph", "content": [{"type": "text", "text": "hi"}]},
+            {"type": "panel", "attrs": "oops", "content": []},
+        ],
+    }
+    NodeDoc.from_dict(broken, ignore_error=True).to_markdown()
+    assert len(slow_log.reports) == 2
+    assert hook.node_errors.collect() == {("parse", "panel"): 1}
+    assert hook.documents_converted.get() == 1
+    durations = hook.stage_duration.collect()
+    assert durations[("parse",)][2] == 1
+    assert durations[("render",)][2] == 1
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.slowlog",
+        preview=False,
+    )
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.stats import NodeStats, get_doc_stats, aggregate_doc_stats
+from atlas_doc_parser.tests.case import NodeCase, CaseEnum
+
+data = {
+    "type": "doc",
+    "version": 1,
+    "content": [
+        {
+            "type": "paragraph",
+            "content": [
+                {"type": "text", "text": "héllo "},
+                {
+                    "type": "text",
+                    "text": "world",
+                    "marks": [
+                        {"type": "strong"},
+                        {"type": "link", "attrs": {"href": "https://a.com"}},
+                    ],
+                },
+            ],
+        },
+        {
+            "type": "bulletList",
+            "content": [
+                {
+                    "type": "listItem",
+                    "content": [
+                        {
+                            "type": "bulletList",
+                            "content": [
+                                {
+                                    "type": "listItem",
+                                    "content": [
+                                        {
+                                            "type": "paragraph",
+                                            "content": [{"type": "text", "text": "a"}],
+                                        }
+                                    ],
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ],
+        },
+        {
+            "type": "table",
+            "content": [
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {"type": "tableHeader", "content": []},
+                        {"type": "tableHeader", "content": []},
+                    ],
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {"type": "tableCell", "content": []},
+                        {"type": "tableCell", "content": []},
+                    ],
+                },
+            ],
+        },
+    ],
+}
+
+
+def test_get_doc_stats():
+    stats = get_doc_stats(data)
+    assert stats.n_doc == 1
+    assert stats.n_node == 17
+    assert stats.type_counts["text"] == 3
+    assert stats.type_counts["listItem"] == 2
+    assert stats.max_depth == 7
+    assert stats.n_char == 12
+    assert stats.text_bytes == 13
+    assert stats.n_table == 1
+    assert stats.n_table_cell == 4
+    assert stats.max_table_cell == 4
+    assert stats.max_list_depth == 2
+    assert stats.max_n_node == 17
+
+    # the raw data and the parsed doc give the same statistics
+    assert get_doc_stats(NodeDoc.from_dict(data)) == stats
+
+
+def test_all_cases():
+    for case in vars(CaseEnum).values():
+        if isinstance(case, NodeCase):
+            stats = get_doc_stats(case.data)
+            assert get_doc_stats(case.node) == stats
+            assert stats.n_node >= 1
+
+
+def test_est_markdown_size():
+    doc = NodeDoc.from_dict(data)
+    size = len(doc.to_markdown())
+    est = get_doc_stats(data).est_markdown_size
+    assert 0.5 * size <= est <= 1.5 * size
+
+
+def test_aggregate_doc_stats():
+    stats = get_doc_stats(data)
+    total = aggregate_doc_stats([data, NodeDoc.from_dict(data), stats])
+    assert total.n_doc == 3
+    assert total.n_node == 3 * stats.n_node
+    assert total.type_counts["text"] == 9
+    assert total.max_depth == stats.max_depth
+    assert total.max_n_node == stats.n_node
+    assert aggregate_doc_stats([]) == NodeStats()
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.stats",
+        preview=False,
+    )
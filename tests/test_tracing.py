@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.resolve import DictResolver, render_resolved
+from atlas_doc_parser.tracing import (
+    BaseTraceHook,
+    RecordHook,
+    Span,
+    start_span,
+    add_trace_hook,
+    remove_trace_hook,
+    clear_trace_hooks,
+    _hooks,
+    _noop_span,
+    _muted_var,
+)
+
+data = {
+    "type": "doc",
+    "version": 1,
+    "content": [
+        {
+            "type": "paragraph",
+            "content": [
+                {"type": "text", "text": "hi "},
+                {"type": "mention", "attrs": {"id": "u1"}},
+                {"type": "unknown"},
+            ],
+        },
+        {"type": "rule"},
+    ],
+}
+
+
+class BrokenHook(BaseTraceHook):
+    def start_span(self, name, attrs):
+        raise ValueError
+
+    def end_span(self, handle, name, attrs, error):
+        raise ValueError
+
+
+@pytest.fixture
+def hook():
+    hook = add_trace_hook(RecordHook())
+    yield hook
+    clear_trace_hooks()
+
+
+def test_no_hook():
+    assert _hooks == []
+    assert start_span("parse") is _noop_span
+    with start_span("parse", n_block=1) as span:
+        span.set(n_node=1)
+    doc = NodeDoc.from_dict(data)
+    assert doc.to_markdown()
+
+
+def test_parse_and_render(hook):
+    assert start_span("parse").__class__ is Span
+    doc = NodeDoc.from_dict(data, ignore_error=True)
+    md = doc.to_markdown()
+    parse, render = hook.records
+    assert parse.name == "parse"
+    assert parse.attrs == {"n_block": 2, "n_node": 5, "n_dropped": 1}
+    assert parse.error is None
+    assert render.name == "render"
+    assert render.attrs == {"n_char": len(md)}
+    assert set(hook.get_durations()) == {"parse", "render"}
+
+    render_resolved(doc, DictResolver(mentions={"u1": "Alice"}))
+    assert [r.name for r in hook.records[2:]] == ["resolve", "render"]
+    assert hook.records[2].attrs == {"n_ref": 1}
+
+
+def test_error(hook):
+    with pytest.raises(Exception):
+        NodeDoc.from_dict({"type": "doc", "content": [{"type": "panel"}]})
+    (record,) = hook.records
+    assert record.name == "parse"
+    assert record.error is not None
+    assert record.attrs == {"n_block": 1}
+
+
+def test_hooks(hook):
+    broken = add_trace_hook(BrokenHook())
+    add_trace_hook(broken)
+    assert len(_hooks) == 2
+    # a broken hook doesn't break the conversion nor the other hooks
+    NodeDoc.from_dict(data).to_markdown()
+    assert len(hook.records) == 2
+
+    remove_trace_hook(broken)
+    remove_trace_hook(broken)
+    assert _hooks == [hook]
+
+    base = add_trace_hook(BaseTraceHook())
+    with start_span("decode", n_byte=10) as span:
+        span.set(n_block=1)
+    assert base.start_span("decode", {}) is None
+    assert hook.records[-1].attrs == {"n_byte": 10, "n_block": 1}
+
+
+def test_muted(hook):
+    token = _muted_var.set(True)
+    try:
+        assert start_span("decode", n_byte=10) is _noop_span
+        with Span("parse", {}):
+            pass
+    finally:
+        _muted_var.reset(token)
+    assert len(hook.records) == 0
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "atlas_doc_parser.tracing",
+        preview=False,
+    )
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from atlas_doc_parser.arg import NA
+from atlas_doc_parser.model import NodeDoc
+from atlas_doc_parser.walk import walk
+from atlas_doc_parser.tests.case import NodeCase, CaseEnum
+
+
+def walk_recursive(node, order, depth=0, parent=None, index=None, prune=None):
+    if order == "pre":
+        yield node, depth, parent, index
+    if prune is None or not prune(node):
+        content = getattr(node, "content", NA())
+        if not isinstance(content, NA):
+            for ind, child in enumerate(content):
+                yield from walk_recursive(child, order, depth + 1, node, ind, prune)
+    if order == "post":
+        yield node, depth, parent, index
+
+
+def iter_cases():
+    for case in vars(CaseEnum).values():
+        if isinstance(case, NodeCase):
+            yield case
+
+
+@pytest.mark.parametrize("order", ["pre", "post"])
+def test_walk(order):
+    for case in iter_cases():
+        node = case.node
+        expected = list(walk_recursive(node, order))
+        assert list(walk(node, order=order, with_info=True)) == expected
+        nodes = list(walk(node, order=order))
+        assert len(nodes) == len(expected)
+        assert all(a is b[0] for a, b in zip(nodes, expected))
+
+
+@pytest.mark.parametrize("order", ["pre", "post"])
+def test_walk_prune(order):
+    def prune(node):
+        return node.type in ("listItem", "tableRow", "paragraph")
+
+    for case in iter_cases():
+        node = case.node
+        expected = list(walk_recursive(node, order, prune=prune))
+        assert list(walk(node, order=order, with_info=True, prune=prune)) == expected
+        nodes = list(walk(node, order=order, prune=prune))
+        assert all(a is b[0] for a, b in zip(nodes, expected))
+
+
+def test_walk_info():
+    doc = NodeDoc.from_dict(
+        {
+            "type": "doc",
+            "content": [
+                {"type": "paragraph", "content": [{"type": "text", "text": "a"}]},
+                {"type": "rule"},
+            ],
+        }
+    )
+    paragraph, rule = doc.content
+    text = paragraph.content[0]
+    assert list(walk(doc, with_info=True)) == [
+        (doc, 0, None, None),
+        (paragraph, 1, doc, 0),
+        (text, 2, paragraph, 0),
+        (rule, 1, doc, 1),
+    ]
+    assert list(walk(doc, order="post")) == [text, paragraph, rule, doc]
+    assert list(walk(doc, prune=lambda node: True)) == [doc]
+    assert list(walk(doc, order="post", prune=lambda node: True)) == [doc]
+
+
+if __name__ == "__main__":
+    from atlas_doc_parser.tests import run_cov_test
+
+    run_cov_test(__file__, "atlas_doc_parser.walk", preview=False)